@@ -14,11 +14,72 @@ You should have received a copy of the Modified BSD-3 License along with this
 program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
 """
 
+import importlib
+import sys
+
+# Pure Python modules, imported eagerly.
+from .cache import CacheInfo, LRUCache
+from .devices import DEVICES, Device, DeviceDatabase
 from .energy_ddr import EnergyDDR
 from .energy_lpddr import EnergyLPDDR
-from .termination import TermResistance, Termination
-from .timing import Timing
-from .voltage_domain import IDDs, VoltageDomain
+from .timing import Timing, TimingNS, timing_cache_info, timing_from_ns
+from .voltage_domain import IDDs, IDDsTable, VoltageDomain
 
-__version__ = '0.4.0'
+# Attributes of the modules using NumPy, imported on first access, so that
+# importing the package does not import NumPy.
+_LAZY_MODULES = {
+    'address': ['AddressMapping', 'RowBufferCounter', 'count_accesses'],
+    'bandwidth': ['access_power', 'max_access_rate'],
+    'compiled_energy': ['COUNTERS', 'CompiledEnergy'],
+    'counter_log': ['RECORD_DTYPE', 'CounterLog', 'CounterLogWriter'],
+    'memory_system': ['MemorySystem'],
+    'monte_carlo': ['LogNormal', 'MonteCarlo', 'Normal', 'OnlineStats',
+                    'Uniform'],
+    'odt': ['ODTConfig', 'optimize_odt', 'pareto_odt'],
+    'sensitivity': ['EnergySensitivity', 'termination_gradients'],
+    'series': ['PowerSeries', 'power_series', 'trace_power_series'],
+    'shared': ['SharedArray'],
+    'shard': ['ShardCounters', 'parallel_count', 'parallel_energy'],
+    'sweep': ['Sweep', 'evaluate_ddr', 'evaluate_lpddr',
+              'evaluate_termination'],
+    'term_store': ['TerminationStore'],
+    'termination': ['TermResistance', 'TermResistanceTable', 'Termination',
+                    'TerminationBatch'],
+    'trace': ['COMMANDS', 'TraceCounter', 'count_commands', 'count_trace',
+              'parse_trace', 'read_trace', 'window_counters'],
+    }
+_LAZY_ATTRS = {attr: module for module, attrs in _LAZY_MODULES.items()
+               for attr in attrs}
+
+# Star import gets the lazy attributes through `__getattr__`.
+__all__ = ['CacheInfo', 'LRUCache',
+           'DEVICES', 'Device', 'DeviceDatabase',
+           'EnergyDDR', 'EnergyLPDDR',
+           'Timing', 'TimingNS', 'timing_cache_info', 'timing_from_ns',
+           'IDDs', 'IDDsTable', 'VoltageDomain'] + sorted(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    try:
+        module = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError('module {!r} has no attribute {!r}'
+                             .format(__name__, name))
+    mod = importlib.import_module('.' + module, __name__)
+    # Bind all attributes of the module. Exported names must not collide with
+    # submodule names, which the import system binds on submodule import.
+    for attr in _LAZY_MODULES[module]:
+        globals()[attr] = getattr(mod, attr)
+    return globals()[name]
 
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
+
+if sys.version_info < (3, 7):
+    # No module __getattr__ support.
+    for _name in _LAZY_ATTRS:
+        globals()[_name] = __getattr__(_name)
+
+__version__ = '0.4.0'
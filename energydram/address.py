@@ -0,0 +1,216 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+import numpy as np
+
+from .compiled_energy import COUNTERS
+
+# Address fields, from the outermost.
+_FIELDS = ('channel', 'rank', 'bank', 'row')
+
+_POLICIES = ('open', 'closed')
+
+
+class AddressMapping(object):
+    '''
+    Mapping of physical addresses to the DRAM channel, rank, bank, and row, as
+    bit fields. Each field is given as a tuple of (lowest bit, number of
+    bits), and a field of 0 bits is always 0. The fields must not overlap.
+    '''
+
+    def __init__(self, row, bank, rank=(0, 0), channel=(0, 0)):
+        used = 0
+        for name, val in zip(_FIELDS, (channel, rank, bank, row)):
+            try:
+                low, bits = val
+            except (TypeError, ValueError):
+                raise TypeError('{}: given {} has invalid type.'
+                                .format(self.__class__.__name__, name))
+            if not isinstance(low, int) or not isinstance(bits, int):
+                raise TypeError('{}: given {} has invalid type.'
+                                .format(self.__class__.__name__, name))
+            if low < 0 or bits < 0 or low + bits > 63:
+                raise ValueError('{}: given {} is invalid.'
+                                 .format(self.__class__.__name__, name))
+            mask = ((1 << bits) - 1) << low
+            if used & mask:
+                raise ValueError('{}: given {} overlaps other fields.'
+                                 .format(self.__class__.__name__, name))
+            used |= mask
+        self.channel = tuple(channel)
+        self.rank = tuple(rank)
+        self.bank = tuple(bank)
+        self.row = tuple(row)
+
+    @property
+    def shape(self):
+        ''' Numbers of channels, ranks per channel, and banks per rank. '''
+        return tuple(1 << getattr(self, name)[1] for name in _FIELDS[:3])
+
+    def field(self, name, addresses):
+        ''' Extract the field `name` of an array of addresses. '''
+        if name not in _FIELDS:
+            raise ValueError('{}: given field {} is invalid.'
+                             .format(self.__class__.__name__, name))
+        low, bits = getattr(self, name)
+        addresses = np.asarray(addresses, dtype=np.uint64)
+        return ((addresses >> np.uint64(low))
+                & np.uint64((1 << bits) - 1)).astype(np.int64)
+
+    def decode(self, addresses):
+        '''
+        Decode an array of addresses into the tuple of arrays of the channels,
+        ranks, banks, and rows.
+        '''
+        return tuple(self.field(name, addresses) for name in _FIELDS)
+
+    def bank_index(self, addresses):
+        '''
+        Flat bank index of an array of addresses, in C order over `shape`.
+        '''
+        chancnt, rankcnt, bankcnt = self.shape
+        channel, rank, bank = [self.field(name, addresses)
+                               for name in _FIELDS[:3]]
+        return (channel * rankcnt + rank) * bankcnt + bank
+
+
+class RowBufferCounter(object):
+    '''
+    Count row-buffer hits and misses of a stream of accesses, per bank of the
+    `AddressMapping`.
+
+    With the 'open' page policy, a row stays open after an access until an
+    access to another row of the same bank, so an access is a hit if it is to
+    the open row. With the 'closed' page policy, the bank is precharged after
+    each access, so every access is a miss. All banks are initially
+    precharged. Each miss activates a row.
+
+    `hits`, `misses`, `reads`, and `writes` are arrays of the mapping shape,
+    i.e., (channels, ranks, banks).
+    '''
+
+    def __init__(self, mapping, policy='open'):
+        if not isinstance(mapping, AddressMapping):
+            raise TypeError('{}: given mapping has invalid type.'
+                            .format(self.__class__.__name__))
+        if policy not in _POLICIES:
+            raise ValueError('{}: given policy is invalid.'
+                             .format(self.__class__.__name__))
+        self.mapping = mapping
+        self.policy = policy
+        shape = mapping.shape
+        # Open row of each bank, -1 if precharged.
+        self.open_rows = np.full(int(np.prod(shape)), -1, dtype=np.int64)
+        self.hits = np.zeros(shape, dtype=np.int64)
+        self.misses = np.zeros(shape, dtype=np.int64)
+        self.reads = np.zeros(shape, dtype=np.int64)
+        self.writes = np.zeros(shape, dtype=np.int64)
+
+    def update(self, addresses, is_write=False):
+        '''
+        Consume an array of access addresses in order. `is_write` is a scalar
+        or a boolean array of whether each access is a write.
+        '''
+        addresses = np.asarray(addresses, dtype=np.uint64)
+        try:
+            is_write = np.broadcast_to(np.asarray(is_write, dtype=bool),
+                                       addresses.shape).ravel()
+        except ValueError:
+            raise ValueError('{}: given is_write does not match the shape of '
+                             'addresses.'.format(self.__class__.__name__))
+        addresses = addresses.ravel()
+        if not addresses.size:
+            return self
+        banks = self.mapping.bank_index(addresses)
+        bankcnt = len(self.open_rows)
+
+        def _count(mask=None):
+            return np.bincount(banks if mask is None else banks[mask],
+                               minlength=bankcnt).reshape(self.hits.shape)
+
+        accesses = _count()
+        writes = _count(is_write)
+        self.writes += writes
+        self.reads += accesses - writes
+
+        if self.policy == 'closed':
+            self.misses += accesses
+            return self
+
+        # Group the accesses by bank, keeping their order within each bank. A
+        # stable sort of small integers is a linear-time radix sort.
+        keys = banks.astype(np.uint16) if bankcnt <= 1 << 16 else banks
+        order = np.argsort(keys, kind='stable')
+        banks = banks[order]
+        rows = self.mapping.field('row', addresses[order])
+
+        first = np.empty(len(banks), dtype=bool)
+        first[0] = True
+        first[1:] = banks[1:] != banks[:-1]
+        prev_rows = np.empty_like(rows)
+        prev_rows[1:] = rows[:-1]
+        prev_rows[first] = self.open_rows[banks[first]]
+        hit = rows == prev_rows
+
+        hits = np.bincount(banks[hit], minlength=bankcnt) \
+                .reshape(self.hits.shape)
+        self.hits += hits
+        self.misses += accesses - hits
+
+        # The last access of each bank leaves its row open.
+        last = np.empty_like(first)
+        last[:-1] = first[1:]
+        last[-1] = True
+        self.open_rows[banks[last]] = rows[last]
+        return self
+
+    def counters(self):
+        '''
+        Get the counters of each rank, as an array of shape (channels, ranks,
+        number of counters) whose last dimension indexes the counters in
+        `COUNTERS`, e.g., for `MemorySystem.rank_energy`. Only `num_act`,
+        `num_rd`, and `num_wr` are counted; others are 0.
+        '''
+        counters = np.zeros(self.hits.shape[:2] + (len(COUNTERS),),
+                            dtype=np.int64)
+        counters[..., COUNTERS.index('num_act')] = self.misses.sum(axis=-1)
+        counters[..., COUNTERS.index('num_rd')] = self.reads.sum(axis=-1)
+        counters[..., COUNTERS.index('num_wr')] = self.writes.sum(axis=-1)
+        return counters
+
+
+def count_accesses(mapping, addresses, is_write=False, policy='open',
+                   chunksize=1 << 24):
+    '''
+    Count the row-buffer hits and misses of arrays of access addresses and
+    whether each is a write, in chunks of `chunksize` accesses to bound the
+    memory. Return the `RowBufferCounter`.
+    '''
+    if chunksize <= 0:
+        raise ValueError('count_accesses: given chunksize is invalid.')
+    addresses = np.asarray(addresses)
+    try:
+        is_write = np.broadcast_to(np.asarray(is_write, dtype=bool),
+                                   addresses.shape).ravel()
+    except ValueError:
+        raise ValueError('count_accesses: given is_write does not match the '
+                         'shape of addresses.')
+    addresses = addresses.ravel()
+    counter = RowBufferCounter(mapping, policy=policy)
+    for begin in range(0, max(len(addresses), 1), chunksize):
+        end = begin + chunksize
+        counter.update(addresses[begin:end], is_write[begin:end])
+    return counter
@@ -0,0 +1,111 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+import numpy as np
+
+from .compiled_energy import COUNTERS
+from .memory_system import MemorySystem
+
+
+def _linear_power(func, model, rd_ratio, hit_rate, pdn_ratio, open_ratio):
+    '''
+    Split the power of the model `EnergyDDR`, `EnergyLPDDR`, or `MemorySystem`
+    into the static power, the energy per access, and the maximum access rate
+    of the data bus.
+    '''
+    ratios = []
+    for name, val in [('rd_ratio', rd_ratio), ('hit_rate', hit_rate),
+                      ('pdn_ratio', pdn_ratio), ('open_ratio', open_ratio)]:
+        val = np.asarray(val, dtype=float)
+        # Also reject NaN.
+        if not np.all((val >= 0) & (val <= 1)):
+            raise ValueError('{}: given {} is invalid.'.format(func, name))
+        ratios.append(val)
+    rd_ratio, hit_rate, pdn_ratio, open_ratio = ratios
+
+    if isinstance(model, MemorySystem):
+        coef = model.coef
+        rankcnt = model.chancnt * model.ranks_per_channel
+        buscnt = model.chancnt
+        energy = model.energy
+    else:
+        coef = model.compile().coef
+        rankcnt = 1
+        buscnt = 1
+        energy = model
+    vdom = energy.vdoms[0]
+    coef = dict(zip(COUNTERS, np.moveaxis(coef, -1, 0)))
+
+    # Background and refresh power of each rank, per cycle.
+    background = (1. - open_ratio) * (
+        pdn_ratio * coef['cycles_bankpre_ckelo']
+        + (1. - pdn_ratio) * coef['cycles_bankpre_ckehi']) \
+            + open_ratio * (
+                pdn_ratio * coef['cycles_bankact_ckelo']
+                + (1. - pdn_ratio) * coef['cycles_bankact_ckehi'])
+    refresh = coef['num_ref'] / energy.timing.REFI
+    static = (background + refresh) * rankcnt / vdom.tck
+
+    # Each row miss activates a row.
+    access = rd_ratio * coef['num_rd'] + (1. - rd_ratio) * coef['num_wr'] \
+            + (1. - hit_rate) * coef['num_act']
+
+    max_rate = buscnt / (np.asarray(vdom.burstcycles * vdom.tck, dtype=float))
+    return static, access, max_rate
+
+
+def access_power(model, rate, rd_ratio=0.5, hit_rate=0., pdn_ratio=0.,
+                 open_ratio=0.):
+    '''
+    Average power of the model `EnergyDDR`, `EnergyLPDDR`, or `MemorySystem`,
+    at the access `rate`.
+
+    `rd_ratio` is the fraction of reads among the accesses, `hit_rate` the
+    fraction of row-buffer hits, which do not activate a row, `pdn_ratio` the
+    fraction of time in power-down, and `open_ratio` the fraction of time with
+    any open bank. Refresh is issued every REFI cycles. All arguments can be
+    arrays, which are broadcast with the leading shape of the coefficients.
+
+    For `MemorySystem`, the accesses are over all ranks, and the static power
+    of all ranks is included.
+
+    The power unit is the energy unit over the `tck` unit, e.g., mW for energy
+    in pJ and `tck` in ns. The access rate is the number of read and write
+    bursts per `tck` unit, e.g., per ns.
+    '''
+    static, access, _ = _linear_power('access_power', model, rd_ratio,
+                                      hit_rate, pdn_ratio, open_ratio)
+    return static + np.asarray(rate) * access
+
+
+def max_access_rate(model, budget, rd_ratio=0.5, hit_rate=0., pdn_ratio=0.,
+                    open_ratio=0.):
+    '''
+    Maximum access rate of the model `EnergyDDR`, `EnergyLPDDR`, or
+    `MemorySystem`, within the power `budget`, see `access_power`.
+
+    The power is linear in the access rate, so the rate is solved in closed
+    form, and clipped to the data bus bandwidth of one burst every
+    `burstcycles` cycles per channel. The rate is 0 if the budget is below the
+    static power.
+    '''
+    static, access, max_rate = _linear_power('max_access_rate', model,
+                                             rd_ratio, hit_rate, pdn_ratio,
+                                             open_ratio)
+    headroom = np.asarray(budget, dtype=float) - static
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rate = np.where(access > 0, headroom / access, np.inf)
+    return np.clip(np.where(headroom > 0, rate, 0.), 0., max_rate)
@@ -0,0 +1,90 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+from collections import namedtuple, OrderedDict
+
+'''
+Cache statistics.
+'''
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class LRUCache(object):
+    '''
+    Bounded least-recently-used cache.
+
+    Use `construct` to memoize model construction, e.g.,
+    `cache.construct(Termination, vdd, rankcnt, resistance, level='high')`.
+    The cached objects are shared by all hits, so should not be modified.
+    '''
+
+    def __init__(self, maxsize=128):
+        if not isinstance(maxsize, int):
+            raise TypeError('{}: given maxsize has invalid type.'
+                            .format(self.__class__.__name__))
+        if maxsize <= 0:
+            raise ValueError('{}: given maxsize is invalid.'
+                             .format(self.__class__.__name__))
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key, func):
+        '''
+        Get the value of `key`. On a miss, call `func` with no argument to get
+        the value, and evict the least recently used entry if full.
+        '''
+        try:
+            value = self._data.pop(key)
+        except KeyError:
+            self.misses += 1
+            value = func()
+            if len(self._data) >= self.maxsize:
+                self._data.popitem(last=False)
+        else:
+            self.hits += 1
+        self._data[key] = value
+        return value
+
+    def construct(self, cls, *args, **kwargs):
+        '''
+        Construct `cls` with the given arguments, or get the cached object
+        constructed with the same arguments. All arguments must be hashable.
+        Arguments of different types are cached separately, e.g., a tuple and
+        a `TermResistance` of the same values.
+        '''
+        items = tuple(sorted(kwargs.items()))
+        key = (cls, args, tuple(type(arg) for arg in args), items,
+               tuple(type(val) for _, val in items))
+        return self.get(key, lambda: cls(*args, **kwargs))
+
+    def info(self):
+        ''' Get the cache statistics. '''
+        return CacheInfo(hits=self.hits, misses=self.misses,
+                         maxsize=self.maxsize, currsize=len(self._data))
+
+    def clear(self):
+        ''' Clear the cache and its statistics. '''
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
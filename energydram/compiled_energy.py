@@ -0,0 +1,100 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+import numpy as np
+
+'''
+Counters of the linear energy model, in the order of the coefficients.
+'''
+COUNTERS = [
+    'cycles_bankpre_ckelo',
+    'cycles_bankpre_ckehi',
+    'cycles_bankact_ckelo',
+    'cycles_bankact_ckehi',
+    'num_act',
+    'num_rd',
+    'num_wr',
+    'num_ref',
+    ]
+
+
+class CompiledEnergy(object):
+    '''
+    Linear energy model with the voltage domains folded into per-counter
+    energy coefficients.
+
+    `coef_matrix` has one row per voltage domain and one column per counter in
+    `COUNTERS`; `coef` is its sum over the voltage domains. If `tck` or the
+    `Timing` values are arrays, e.g., over the frequencies, their broadcast
+    shape is prepended to the coefficients, and to the evaluated energies.
+    '''
+
+    def __init__(self, vdoms, timing):
+        if not vdoms:
+            raise ValueError('{}: given vdoms is empty.'
+                             .format(self.__class__.__name__))
+        coefs = np.broadcast_arrays(*[
+            np.asarray(val, dtype=float) for vdom in vdoms
+            for val in vdom.energy_coefficients(timing)])
+        coefs = np.stack(coefs, axis=-1)
+        self.coef_matrix = coefs.reshape(coefs.shape[:-1]
+                                         + (len(vdoms), len(COUNTERS)))
+        self.coef = self.coef_matrix.sum(axis=-2)
+
+    @staticmethod
+    def stack_counters(**kwargs):
+        '''
+        Stack the given counters, by their names in `COUNTERS`, into an array
+        whose last dimension indexes the counters. Scalar and array counters
+        are broadcast; missing counters are 0.
+        '''
+        for name in kwargs:
+            if name not in COUNTERS:
+                raise ValueError('CompiledEnergy: given counter {} is invalid.'
+                                 .format(name))
+        values = np.broadcast_arrays(*[np.asarray(kwargs.get(name, 0))
+                                       for name in COUNTERS])
+        return np.stack(values, axis=-1)
+
+    def energy(self, counters):
+        '''
+        Total energy. `counters` is an array whose last dimension indexes the
+        counters in `COUNTERS`. The result has the shape of the coefficient
+        leading dimensions, e.g., frequencies, followed by the counter leading
+        dimensions.
+        '''
+        counters = self._check_counters(counters)
+        return np.tensordot(self.coef, counters, axes=([-1], [-1]))
+
+    def domain_energy(self, counters):
+        '''
+        Energy of each voltage domain. The last dimension of the result indexes
+        the voltage domains.
+        '''
+        counters = self._check_counters(counters)
+        energy = np.tensordot(self.coef_matrix, counters, axes=([-1], [-1]))
+        # Move the voltage domain dimension last.
+        fdim = self.coef_matrix.ndim - 2
+        return energy.transpose(list(range(fdim))
+                                + list(range(fdim + 1, energy.ndim))
+                                + [fdim])
+
+    def _check_counters(self, counters):
+        counters = np.asarray(counters)
+        if counters.shape[-1:] != (len(COUNTERS),):
+            raise ValueError('{}: given counters have invalid shape {}.'
+                             .format(self.__class__.__name__, counters.shape))
+        return counters
@@ -0,0 +1,168 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+import json
+import os
+import struct
+import numpy as np
+
+from .compiled_energy import COUNTERS
+
+# Binary counter log format:
+# - 8-byte magic.
+# - Format version and header length, as little-endian uint32.
+# - Header, as UTF-8 JSON, padded with spaces to align the records.
+# - Records, one per epoch, with a little-endian int64 field per counter in the
+#   order of COUNTERS.
+_MAGIC = b'EDRAMCL\0'
+_VERSION = 1
+_PREAMBLE = struct.Struct('<8sII')
+_ALIGN = 64
+
+'''
+Record dtype of the binary counter log.
+'''
+RECORD_DTYPE = np.dtype([(name, '<i8') for name in COUNTERS])
+
+
+def _read_preamble(fh, path):
+    preamble = fh.read(_PREAMBLE.size)
+    if len(preamble) < _PREAMBLE.size:
+        raise ValueError('counter log {}: file is truncated.'.format(path))
+    magic, version, hdrlen = _PREAMBLE.unpack(preamble)
+    if magic != _MAGIC:
+        raise ValueError('counter log {}: invalid file format.'.format(path))
+    if version != _VERSION:
+        raise ValueError('counter log {}: unsupported version {}.'
+                         .format(path, version))
+    header = json.loads(fh.read(hdrlen).decode('utf-8'))
+    return header, _PREAMBLE.size + hdrlen
+
+
+class CounterLogWriter(object):
+    '''
+    Write per-epoch counters incrementally into a binary counter log.
+
+    `header` is a JSON-serializable dict, e.g., of the device parameters. With
+    `append`, records are appended to the existing log at `path`, and its
+    header is kept.
+    '''
+
+    def __init__(self, path, header=None, append=False):
+        self.path = path
+        if append and os.path.exists(path):
+            with open(path, 'rb') as fh:
+                self.header, offset = _read_preamble(fh, path)
+            self._fh = open(path, 'r+b')
+            # Drop any partial record.
+            size = os.path.getsize(path)
+            self._fh.truncate(size - (size - offset) % RECORD_DTYPE.itemsize)
+            self._fh.seek(0, os.SEEK_END)
+            return
+
+        self.header = dict(header or {})
+        hdr = json.dumps(self.header, sort_keys=True).encode('utf-8')
+        hdr += b' ' * (-(_PREAMBLE.size + len(hdr)) % _ALIGN)
+        self._fh = open(path, 'wb')
+        self._fh.write(_PREAMBLE.pack(_MAGIC, _VERSION, len(hdr)))
+        self._fh.write(hdr)
+
+    def append(self, counters=None, **kwargs):
+        '''
+        Append records, from a dict or keyword arguments of counters by their
+        names in `COUNTERS`, each a scalar or an array over the epochs. Missing
+        counters are 0.
+        '''
+        counters = dict(counters or {}, **kwargs)
+        for name in counters:
+            if name not in COUNTERS:
+                raise ValueError('{}: given counter {} is invalid.'
+                                 .format(self.__class__.__name__, name))
+        values = np.broadcast_arrays(*[np.atleast_1d(counters.get(name, 0))
+                                       for name in COUNTERS])
+        if values[0].ndim != 1:
+            raise ValueError('{}: given counters have invalid shape.'
+                             .format(self.__class__.__name__))
+        records = np.empty(len(values[0]), dtype=RECORD_DTYPE)
+        for name, val in zip(COUNTERS, values):
+            records[name] = val
+        self._fh.write(records.tobytes())
+
+    def flush(self):
+        ''' Flush the written records to the file. '''
+        self._fh.flush()
+
+    def close(self):
+        ''' Close the file. '''
+        self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class CounterLog(object):
+    '''
+    Read a binary counter log, with the records memory-mapped without copies.
+
+    `header` is the header dict, and `records` is the structured array of the
+    records. Each counter, e.g., `log['num_rd']`, is a view of the array over
+    the epochs. `matrix` is a view with the epochs on the first dimension and
+    the counters on the second, as taken by `CompiledEnergy`.
+    '''
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as fh:
+            self.header, offset = _read_preamble(fh, path)
+        # Ignore any partial record being written.
+        cnt = (os.path.getsize(path) - offset) // RECORD_DTYPE.itemsize
+        if cnt:
+            self.records = np.memmap(path, dtype=RECORD_DTYPE, mode='r',
+                                     offset=offset, shape=(cnt,))
+        else:
+            self.records = np.zeros(0, dtype=RECORD_DTYPE)
+
+    @property
+    def matrix(self):
+        ''' Counters as a 2D array of epochs by counters. '''
+        return self.records.view('<i8').reshape(len(self.records),
+                                                len(COUNTERS))
+
+    def counters(self):
+        ''' Get the counters as a dict of arrays. '''
+        return {name: self.records[name] for name in COUNTERS}
+
+    def energy(self, model, chunksize=1 << 20):
+        '''
+        Per-epoch total energy of the model `EnergyDDR` or `EnergyLPDDR`,
+        evaluated in chunks of `chunksize` epochs to bound the memory use.
+        '''
+        compiled = model.compile()
+        matrix = self.matrix
+        result = np.empty(len(matrix))
+        for beg in range(0, len(matrix), chunksize):
+            result[beg:beg + chunksize] = compiled.energy(
+                matrix[beg:beg + chunksize])
+        return result
+
+    def __getitem__(self, name):
+        return self.records[name]
+
+    def __len__(self):
+        return len(self.records)
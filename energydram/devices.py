@@ -0,0 +1,160 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+from collections import namedtuple
+import json
+import os
+
+from .energy_ddr import EnergyDDR
+from .energy_lpddr import EnergyLPDDR
+from .timing import TimingNS, timing_from_ns
+from .voltage_domain import IDDs
+
+'''
+Device preset. `domains` is the tuple of (vdd, `IDDs`) of the voltage
+domains, in the order of the energy model arguments, e.g., VDD and VPP for
+DDR4, and VDD1, VDD2, and VDDCA/VDDQ for LPDDR.
+'''
+Device = namedtuple('Device', ['name', 'standard', 'density', 'width',
+                               'speed', 'tck', 'timing_ns', 'domains'])
+
+# Supported standards, as (whether LPDDR, generation).
+_STANDARDS = {
+    'DDR2': (False, 2),
+    'DDR3': (False, 3),
+    'DDR3L': (False, 3),
+    'DDR4': (False, 4),
+    'LPDDR2': (True, 2),
+    'LPDDR3': (True, 3),
+    'LPDDR4': (True, 4),
+    }
+
+_DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             'data', 'devices.json')
+
+
+class DeviceDatabase(object):
+    '''
+    Database of device presets, keyed by (standard, density in Gb, width,
+    speed in MT/s), e.g., ('DDR3', 2, 8, 1600).
+
+    The database file is a JSON file, defaulting to the packaged one. It is
+    loaded and indexed on the first access.
+    '''
+
+    def __init__(self, path=None):
+        self.path = path if path is not None else _DEFAULT_PATH
+        self._index = None
+
+    def _devices(self):
+        if self._index is None:
+            with open(self.path, 'r') as fh:
+                data = json.load(fh)
+            index = {}
+            for entry in data['devices']:
+                dev = Device(
+                    name=entry['name'], standard=entry['standard'],
+                    density=entry['density'], width=entry['width'],
+                    speed=entry['speed'], tck=entry['tck'],
+                    timing_ns=TimingNS(**entry['timing_ns']),
+                    domains=tuple((dom['vdd'], IDDs(**dom['idds']))
+                                  for dom in entry['domains']))
+                if dev.standard not in _STANDARDS:
+                    raise ValueError('{}: given standard {} is invalid.'
+                                     .format(self.__class__.__name__,
+                                             dev.standard))
+                key = (dev.standard, dev.density, dev.width, dev.speed)
+                if key in index:
+                    raise ValueError('{}: duplicate device {}.'
+                                     .format(self.__class__.__name__, key))
+                index[key] = dev
+            self._index = index
+        return self._index
+
+    def get(self, standard, density, width, speed):
+        ''' Get the `Device` of the given key. '''
+        try:
+            return self._devices()[(standard, density, width, speed)]
+        except KeyError:
+            raise KeyError('{}: no device {}.'
+                           .format(self.__class__.__name__,
+                                   (standard, density, width, speed)))
+
+    def model(self, standard, density, width, speed, chipcnt=1, tck=None):
+        '''
+        Build the `EnergyDDR` or `EnergyLPDDR` of the given device, with
+        `chipcnt` chips. `tck` defaults to the device speed, and the timing is
+        converted to cycles of `tck`, see `timing.timing_from_ns`.
+        '''
+        dev = self.get(standard, density, width, speed)
+        if tck is None:
+            tck = dev.tck
+        timing = timing_from_ns(dev.timing_ns, tck)
+        lpddr, ddr = _STANDARDS[dev.standard]
+        if lpddr:
+            args = [val for dom in dev.domains for val in dom]
+            return EnergyLPDDR(tck, timing, *args, chipcnt=chipcnt, ddr=ddr)
+        (vdd, idds), vpp_ipps = dev.domains[0], dev.domains[1:]
+        vpp, ipps = vpp_ipps[0] if vpp_ipps else (None, None)
+        return EnergyDDR(tck, timing, vdd, idds, chipcnt, ddr=ddr,
+                         vpp=vpp, ipps=ipps)
+
+    def keys(self):
+        ''' Get the sorted list of device keys. '''
+        return sorted(self._devices())
+
+    def as_arrays(self, standard=None):
+        '''
+        Get the devices, optionally of only the given standard, as arrays for
+        evaluating all devices at once.
+
+        Return a dict of the list of keys `key`, the arrays `tck`, `vdd` and
+        each IDD value over the devices and the voltage domains, and each
+        timing value in ns over the devices. Missing voltage domains are NaN.
+        '''
+        import numpy as np
+        keys = [key for key in self.keys()
+                if standard is None or key[0] == standard]
+        devs = [self._devices()[key] for key in keys]
+        domcnt = max([len(dev.domains) for dev in devs] or [0])
+
+        def _domain_values(func):
+            return np.array([[func(dev.domains[idx]) if idx < len(dev.domains)
+                              else np.nan for idx in range(domcnt)]
+                             for dev in devs], dtype=float).reshape(-1, domcnt)
+
+        arrays = {'key': keys,
+                  'tck': np.array([dev.tck for dev in devs], dtype=float),
+                  'vdd': _domain_values(lambda dom: dom[0])}
+        for name in IDDs._fields:
+            arrays[name] = _domain_values(
+                lambda dom, name=name: getattr(dom[1], name))
+        for name in TimingNS._fields:
+            arrays[name] = np.array([getattr(dev.timing_ns, name)
+                                     for dev in devs], dtype=float)
+        return arrays
+
+    def __len__(self):
+        return len(self._devices())
+
+    def __contains__(self, key):
+        return tuple(key) in self._devices()
+
+
+'''
+Database of the packaged device presets.
+'''
+DEVICES = DeviceDatabase()
@@ -21,8 +21,15 @@ from .voltage_domain import VoltageDomain
 class EnergyDDR(object):
     '''
     Calculate energy for DDR2, DDR3(L).
+
+    The energy methods accept scalar or NumPy array counters, see
+    `VoltageDomain`. The energies of all voltage domains are summed
+    elementwise. `tck` and the `Timing` values can be arrays over the
+    frequencies, broadcast against the counters, see `VoltageDomain`.
     '''
 
+    __slots__ = ('type', 'timing', 'vdoms')
+
     def __init__(self, tck, timing, vdd, idds, chipcnt, ddr=3,
                  vpp=None, ipps=None):
         if ddr == 2:
@@ -96,6 +103,15 @@ class EnergyDDR(object):
         return sum(vdom.refresh_energy(self.timing, num_ref=num_ref)
                    for vdom in self.vdoms)
 
+    def compile(self):
+        '''
+        Compile into a linear model of per-counter energy coefficients, see
+        `CompiledEnergy`.
+        '''
+        # Imported here, so that NumPy is only imported when used.
+        from .compiled_energy import CompiledEnergy
+        return CompiledEnergy(self.vdoms, self.timing)
+
     @property
     def vdd_domain(self):
         ''' VDD voltage domain. '''
@@ -21,8 +21,15 @@ from .voltage_domain import VoltageDomain
 class EnergyLPDDR(object):
     '''
     Calculate energy for LPDDR2, LPDDR3.
+
+    The energy methods accept scalar or NumPy array counters, see
+    `VoltageDomain`. The energies of all voltage domains are summed
+    elementwise. `tck` and the `Timing` values can be arrays over the
+    frequencies, broadcast against the counters, see `VoltageDomain`.
     '''
 
+    __slots__ = ('type', 'timing', 'vdoms')
+
     def __init__(self, tck, timing, vdd1, idds1, vdd2, idds2, vddcaq, iddsin,
                  chipcnt, ddr=3):
         if ddr == 2 or ddr == 3:
@@ -97,6 +104,15 @@ class EnergyLPDDR(object):
         return sum(vdom.refresh_energy(self.timing, num_ref=num_ref)
                    for vdom in self.vdoms)
 
+    def compile(self):
+        '''
+        Compile into a linear model of per-counter energy coefficients, see
+        `CompiledEnergy`.
+        '''
+        # Imported here, so that NumPy is only imported when used.
+        from .compiled_energy import CompiledEnergy
+        return CompiledEnergy(self.vdoms, self.timing)
+
     @property
     def vdd1_domain(self):
         ''' VDD1 voltage domain. '''
@@ -0,0 +1,122 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+import numpy as np
+
+from .compiled_energy import COUNTERS
+from .termination import Termination
+
+
+class MemorySystem(object):
+    '''
+    Memory system of `chancnt` channels, each with `dimmcnt` DIMMs of `rankcnt`
+    ranks.
+
+    `energy` is the `EnergyDDR` or `EnergyLPDDR` model of a rank, whose
+    `chipcnt` is the number of chips per rank. `termination` is the
+    `Termination` of a chip on a channel, whose `rankcnt` must be the total
+    number of ranks per channel, i.e., `dimmcnt * rankcnt`. It can be None for
+    unterminated channels.
+
+    The termination energy of each read and write burst is the termination
+    power of all chips of the target rank over the burst cycles, and is
+    attributed to the target rank. With `include_memctlr`, it includes the
+    termination power at the memory controller.
+
+    `core_coef` and `term_coef` are the per-counter energy coefficients of a
+    rank, for the counters in `COUNTERS`; `coef` is their sum.
+    '''
+
+    def __init__(self, energy, termination, chancnt=1, dimmcnt=1, rankcnt=1,
+                 include_memctlr=True):
+        for name, val in [('chancnt', chancnt), ('dimmcnt', dimmcnt),
+                          ('rankcnt', rankcnt)]:
+            if not isinstance(val, int):
+                raise TypeError('{}: given {} has invalid type.'
+                                .format(self.__class__.__name__, name))
+            if val <= 0:
+                raise ValueError('{}: given {} is invalid.'
+                                 .format(self.__class__.__name__, name))
+        if termination is not None:
+            if not isinstance(termination, Termination):
+                raise TypeError('{}: given termination has invalid type.'
+                                .format(self.__class__.__name__))
+            if termination.rankcnt != dimmcnt * rankcnt:
+                raise ValueError('{}: given termination rankcnt does not '
+                                 'match the ranks per channel.'
+                                 .format(self.__class__.__name__))
+
+        self.energy = energy
+        self.termination = termination
+        self.chancnt = chancnt
+        self.dimmcnt = dimmcnt
+        self.rankcnt = rankcnt
+        self.include_memctlr = include_memctlr
+
+        self.core_coef = energy.compile().coef
+        self.term_coef = np.zeros_like(self.core_coef)
+        if termination is not None:
+            vdom = energy.vdoms[0]
+            if include_memctlr:
+                rd_power = termination.read_power_total()
+                wr_power = termination.write_power_total()
+            else:
+                rd_power = termination.read_power_devices()
+                wr_power = termination.write_power_devices()
+            # Power in W over time in ns is in nJ; convert to pJ.
+            burst_time = vdom.burstcycles * vdom.tck * vdom.chipcnt * 1e3
+            self.term_coef[..., COUNTERS.index('num_rd')] = \
+                    rd_power * burst_time
+            self.term_coef[..., COUNTERS.index('num_wr')] = \
+                    wr_power * burst_time
+        self.coef = self.core_coef + self.term_coef
+
+    @property
+    def ranks_per_channel(self):
+        ''' Number of ranks per channel. '''
+        return self.dimmcnt * self.rankcnt
+
+    def rank_energy(self, counters):
+        '''
+        Energy of each rank. `counters` is an array of shape (`chancnt`,
+        `ranks_per_channel`, number of counters), whose last dimension indexes
+        the counters in `COUNTERS`. Leading dimensions are broadcast, e.g., an
+        extra leading dimension for the epochs. If the energy model has arrays
+        of `tck`, their shape is prepended to the result.
+        '''
+        return np.tensordot(self.coef, self._check_counters(counters),
+                            axes=([-1], [-1]))
+
+    def channel_energy(self, counters):
+        ''' Energy of each channel, see `rank_energy`. '''
+        return self.rank_energy(counters).sum(axis=-1)
+
+    def total_energy(self, counters):
+        ''' Total energy of the memory system, see `rank_energy`. '''
+        return self.rank_energy(counters).sum(axis=(-2, -1))
+
+    def termination_energy(self, counters):
+        ''' Total termination energy of the memory system. '''
+        return np.tensordot(self.term_coef, self._check_counters(counters),
+                            axes=([-1], [-1])).sum(axis=(-2, -1))
+
+    def _check_counters(self, counters):
+        counters = np.asarray(counters)
+        if counters.ndim < 3 or counters.shape[-3:] != \
+                (self.chancnt, self.ranks_per_channel, len(COUNTERS)):
+            raise ValueError('{}: given counters have invalid shape {}.'
+                             .format(self.__class__.__name__, counters.shape))
+        return counters
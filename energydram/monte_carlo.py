@@ -0,0 +1,269 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+from collections import namedtuple
+import numpy as np
+
+from .termination import TermResistanceTable, TerminationBatch
+from .voltage_domain import IDDs, IDDsTable
+
+
+class Normal(namedtuple('Normal', ['mean', 'std'])):
+    ''' Normal distribution. '''
+
+    __slots__ = ()
+
+    def sample(self, rng, size):
+        ''' Draw `size` samples with the random state `rng`. '''
+        return rng.normal(self.mean, self.std, size)
+
+
+class Uniform(namedtuple('Uniform', ['low', 'high'])):
+    ''' Uniform distribution in [`low`, `high`). '''
+
+    __slots__ = ()
+
+    def sample(self, rng, size):
+        ''' Draw `size` samples with the random state `rng`. '''
+        return rng.uniform(self.low, self.high, size)
+
+
+class LogNormal(namedtuple('LogNormal', ['median', 'sigma'])):
+    ''' Log-normal distribution, with `sigma` of the underlying normal. '''
+
+    __slots__ = ()
+
+    def sample(self, rng, size):
+        ''' Draw `size` samples with the random state `rng`. '''
+        return rng.lognormal(np.log(self.median), self.sigma, size)
+
+
+class OnlineStats(object):
+    '''
+    Streaming statistics of a sequence of values, updated in batches.
+
+    The mean and the variance are merged across batches with the parallel
+    algorithm of Chan et al., and are exact. Percentiles are computed from a
+    uniform reservoir sample of at most `reservoir` values, so they are exact
+    only if no more values than that are given.
+    '''
+
+    def __init__(self, reservoir=100000, seed=None):
+        if not reservoir > 0:
+            raise ValueError('{}: given reservoir is invalid.'
+                             .format(self.__class__.__name__))
+        self.count = 0
+        self.mean = 0.
+        self._m2 = 0.
+        self.min = np.inf
+        self.max = -np.inf
+        self._reservoir = np.empty(int(reservoir))
+        self._rng = np.random.RandomState(seed)
+
+    def update(self, values):
+        ''' Add a batch of values. '''
+        values = np.asarray(values, dtype=float).ravel()
+        cnt = len(values)
+        if not cnt:
+            return self
+        mean = values.mean()
+        m2 = ((values - mean) ** 2).sum()
+        total = self.count + cnt
+        delta = mean - self.mean
+        self.mean += delta * cnt / total
+        self._m2 += m2 + delta ** 2 * self.count * cnt / total
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+
+        # Reservoir sampling: the i-th value replaces a random slot with
+        # probability k / i.
+        size = len(self._reservoir)
+        fill = max(0, min(size - self.count, cnt))
+        self._reservoir[self.count:self.count + fill] = values[:fill]
+        if fill < cnt:
+            seen = np.arange(self.count + fill, total) + 1
+            slots = (self._rng.random_sample(cnt - fill) * seen) \
+                    .astype(np.int64)
+            keep = slots < size
+            self._reservoir[slots[keep]] = values[fill:][keep]
+        self.count = total
+        return self
+
+    @property
+    def var(self):
+        ''' Sample variance. '''
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.
+
+    @property
+    def std(self):
+        ''' Sample standard deviation. '''
+        return np.sqrt(self.var)
+
+    def percentile(self, q):
+        ''' Percentiles `q` in [0, 100], scalar or array. '''
+        if not self.count:
+            raise ValueError('{}: no values.'.format(self.__class__.__name__))
+        return np.percentile(self._reservoir[:min(self.count,
+                                                   len(self._reservoir))], q)
+
+
+def _sample_table(cls, rng, specs, size):
+    '''
+    Sample a table of type `cls` without validation. Each field in `specs` is a
+    distribution or a constant.
+    '''
+    values = {}
+    for name in cls._fields:
+        if name not in specs:
+            raise ValueError('{}: no distribution of {}.'
+                             .format(cls.__name__, name))
+        spec = specs[name]
+        values[name] = spec.sample(rng, size) if hasattr(spec, 'sample') \
+                else np.full(size, spec, dtype=float)
+    return cls(validate=False, **values)
+
+
+class MonteCarlo(object):
+    '''
+    Monte Carlo analysis of process variation, with a seeded random state for
+    reproducible results.
+
+    Distributions are given as dicts from the fields of `IDDs` or
+    `TermResistance` to distributions, e.g., `Normal`, or constants. Invalid
+    samples, e.g., with IDD3N < IDD2N, are rejected and redrawn; `rejected`
+    counts them.
+
+    Samples are drawn and evaluated in vectorized batches of `batch` samples,
+    and only the streaming statistics are kept, see `OnlineStats`.
+    '''
+
+    def __init__(self, seed=None, batch=100000, reservoir=100000):
+        if not batch > 0:
+            raise ValueError('{}: given batch is invalid.'
+                             .format(self.__class__.__name__))
+        self.rng = np.random.RandomState(seed)
+        # Separate random state for reservoirs, so that the samples do not
+        # depend on the statistics.
+        self._stats_rng = np.random.RandomState(self.rng.randint(2 ** 31))
+        self.batch = batch
+        self.reservoir = reservoir
+        self.rejected = 0
+
+    def _stats(self):
+        return OnlineStats(reservoir=self.reservoir,
+                           seed=self._stats_rng.randint(2 ** 31))
+
+    def _batches(self, samples, draw):
+        '''
+        Yield batches of valid samples until `samples` are accepted. `draw` is
+        called with the batch size and returns the tables of a batch and
+        their validity mask.
+        '''
+        accepted = 0
+        drawn = 0
+        while accepted < samples:
+            need = samples - accepted
+            if accepted:
+                # Oversample by the observed acceptance rate.
+                size = int(np.ceil(need * 1.1 * drawn / accepted))
+            else:
+                if drawn >= self.batch:
+                    raise ValueError('{}: all samples of a batch are invalid.'
+                                     .format(self.__class__.__name__))
+                size = max(need, drawn)
+            size = min(self.batch, size)
+            tables, mask = draw(size)
+            # Keep the first valid samples up to the needed number.
+            rows = np.flatnonzero(mask)[:need]
+            used = rows[-1] + 1 if len(rows) else size
+            drawn += used
+            self.rejected += used - len(rows)
+            accepted += len(rows)
+            if len(rows):
+                yield [table.select(rows) for table in tables]
+
+    def sample_idds(self, specs, size):
+        '''
+        Sample an `IDDsTable` of `size` valid samples from the distributions
+        `specs`.
+        '''
+        tables = [tables[0] for tables in self._batches(
+            size, lambda cnt: self._draw_idds([specs], cnt))]
+        return IDDsTable(**{name: np.concatenate([getattr(tbl, name)
+                                                  for tbl in tables])
+                            for name in IDDs._fields})
+
+    def _draw_idds(self, domain_specs, size):
+        tables = [_sample_table(IDDsTable, self.rng, specs, size)
+                  for specs in domain_specs]
+        mask = np.ones(size, dtype=bool)
+        for table in tables:
+            mask &= table.valid()
+        return tables, mask
+
+    def energy(self, build, domain_specs, counters, samples):
+        '''
+        Distribution of the total energy of the counters, see
+        `CompiledEnergy.energy`, summed over the leading dimensions of the
+        counters.
+
+        `domain_specs` is the list of the IDD distributions of each voltage
+        domain. `build` is called with the list of `IDDsTable` of the voltage
+        domains, and returns the `EnergyDDR` or `EnergyLPDDR`, e.g.,
+        `lambda idds: EnergyDDR(tck, timing, 1.2, idds[0], 8, ddr=4, vpp=2.5,
+        ipps=idds[1])`. The model must have scalar `tck` and `Timing` values,
+        so that the samples are the only coefficient dimension.
+
+        Return an `OnlineStats` over `samples` valid samples.
+        '''
+        counters = np.asarray(counters)
+        stats = self._stats()
+        for tables in self._batches(
+                samples, lambda cnt: self._draw_idds(domain_specs, cnt)):
+            compiled = build(tables).compile()
+            if compiled.coef.shape[:-1] != tables[0].shape:
+                raise ValueError('{}: given build returns a model with array '
+                                 'tck or timing.'
+                                 .format(self.__class__.__name__))
+            energy = compiled.energy(counters)
+            stats.update(energy.reshape(len(energy), -1).sum(axis=1))
+        return stats
+
+    def termination(self, vdd, rankcnt, specs, samples, **kwargs):
+        '''
+        Distributions of the total read and write termination power, with the
+        resistance distributions `specs`. Other arguments are the same as
+        `TerminationBatch`, except that `vdd` and `level` must be scalars.
+
+        Return a tuple of `OnlineStats` of the read and write power over
+        `samples` valid samples.
+        '''
+        if np.ndim(vdd) or np.ndim(kwargs.get('level', 'mid')):
+            raise ValueError('{}: given vdd and level must be scalars.'
+                             .format(self.__class__.__name__))
+        rd_stats = self._stats()
+        wr_stats = self._stats()
+
+        def _draw(size):
+            table = _sample_table(TermResistanceTable, self.rng, specs, size)
+            return [table], table.valid()
+
+        for tables in self._batches(samples, _draw):
+            term = TerminationBatch(vdd, rankcnt, tables[0], **kwargs)
+            rd_stats.update(term.read_power_total())
+            wr_stats.update(term.write_power_total())
+        return rd_stats, wr_stats
+
@@ -0,0 +1,197 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+from collections import namedtuple
+import numpy as np
+
+from .termination import TermResistance, TerminationBatch, _network_swing
+
+'''
+An ODT configuration, with its average termination power over the read/write
+mix, and its read and write signal swings.
+'''
+ODTConfig = namedtuple('ODTConfig',
+                       ['resistance', 'power', 'rd_swing', 'wr_swing'])
+
+# DRAM read power only depends on the shared and the read resistances, and DRAM
+# write power only depends on the shared and the write resistances.
+_SHARED = ('rtt_nom', 'rs')
+_READ = ('rz_dev', 'rtt_mc')
+_WRITE = ('rz_mc', 'rtt_wr')
+
+
+def _half_grid(vdd, rankcnt, cands, names, is_read, kwargs):
+    '''
+    Evaluate power and swing of DRAM read or write, over the grid of the shared
+    resistances and the given read or write resistances `names`.
+
+    Return arrays of the shared grid shape, with the flattened grid of `names`
+    on the last dimension.
+    '''
+    axes = _SHARED + names
+    resistance = {}
+    for key in TermResistance._fields:
+        if key in axes:
+            shape = [1] * len(axes)
+            shape[axes.index(key)] = -1
+            resistance[key] = cands[key].reshape(shape)
+        else:
+            # Irrelevant to this half.
+            resistance[key] = cands[key][0]
+    batch = TerminationBatch(vdd, rankcnt, resistance, **kwargs)
+    rd_swing, wr_swing = _network_swing(vdd, rankcnt, batch.resistance,
+                                        kwargs.get('solver', 'structured'))
+    if is_read:
+        power, swing = batch.read_power_total(), rd_swing
+    else:
+        power, swing = batch.write_power_total(), wr_swing
+    shape = batch.shape[:len(_SHARED)] + (-1,)
+    return power.reshape(shape), \
+            np.broadcast_to(swing, batch.shape).reshape(shape)
+
+
+def _resistance(cands, shared_idx, rd_idx, wr_idx):
+    ''' Get the `TermResistance` of the given grid indices. '''
+    values = {}
+    for names, idx in [(_SHARED, shared_idx), (_READ, rd_idx),
+                       (_WRITE, wr_idx)]:
+        shape = [len(cands[key]) for key in names]
+        for key, i in zip(names, np.unravel_index(idx, shape)):
+            values[key] = cands[key][i].item()
+    return TermResistance(**values)
+
+
+def _pareto_mask(power, swing):
+    '''
+    Mask of the Pareto-optimal points which minimize power and maximize swing.
+    '''
+    order = np.lexsort((-swing, power))
+    swing_sorted = swing[order]
+    best = np.maximum.accumulate(swing_sorted)
+    keep = np.ones(len(order), dtype=bool)
+    keep[1:] = swing_sorted[1:] > best[:-1]
+    mask = np.zeros(len(order), dtype=bool)
+    mask[order[keep]] = True
+    return mask
+
+
+def _prepare(rz_dev, rz_mc, rtt_nom, rtt_wr, rtt_mc, rs, rd_ratio, func):
+    if not 0 <= rd_ratio <= 1:
+        raise ValueError('{}: given rd_ratio is invalid.'.format(func))
+    values = (rz_dev, rz_mc, rtt_nom, rtt_wr, rtt_mc, rs)
+    cands = dict(zip(TermResistance._fields,
+                     [np.atleast_1d(np.asarray(val, dtype=float))
+                      for val in values]))
+    for key, val in cands.items():
+        if val.ndim != 1 or val.size == 0:
+            raise ValueError('{}: given {} candidates are invalid.'
+                             .format(func, key))
+    return cands
+
+
+def optimize_odt(vdd, rankcnt, rz_dev, rz_mc, rtt_nom, rtt_wr, rtt_mc, rs,
+                 rd_ratio=0.5, min_swing=0., **kwargs):
+    '''
+    Find the ODT configuration with the minimum average termination power
+    among the candidate values of each resistance, given as scalars or 1D
+    sequences.
+
+    `rd_ratio` is the fraction of DRAM reads in the read/write mix. Only
+    configurations whose read and write swings are at least `min_swing` are
+    considered. Other arguments are the same as `Termination`.
+
+    Instead of evaluating the full Cartesian product, read and write are
+    minimized separately for each value of the shared resistances, as each of
+    them only depends on part of the resistances.
+
+    Return an `ODTConfig`, or None if no configuration meets `min_swing`.
+    '''
+    cands = _prepare(rz_dev, rz_mc, rtt_nom, rtt_wr, rtt_mc, rs, rd_ratio,
+                     'optimize_odt')
+
+    best = []
+    for names, is_read, ratio in [(_READ, True, rd_ratio),
+                                  (_WRITE, False, 1. - rd_ratio)]:
+        power, swing = _half_grid(vdd, rankcnt, cands, names, is_read,
+                                  kwargs)
+        cost = np.where(swing >= min_swing, ratio * power, np.inf)
+        idx = cost.argmin(axis=-1)
+        best.append((idx,
+                     np.take_along_axis(cost, idx[..., None], -1)[..., 0],
+                     np.take_along_axis(swing, idx[..., None], -1)[..., 0]))
+    (rd_idx, rd_cost, rd_swing), (wr_idx, wr_cost, wr_swing) = best
+
+    total = rd_cost + wr_cost
+    shared_idx = total.argmin()
+    if not np.isfinite(total.flat[shared_idx]):
+        return None
+    return ODTConfig(
+        resistance=_resistance(cands, shared_idx, rd_idx.flat[shared_idx],
+                               wr_idx.flat[shared_idx]),
+        power=total.flat[shared_idx].item(),
+        rd_swing=rd_swing.flat[shared_idx].item(),
+        wr_swing=wr_swing.flat[shared_idx].item())
+
+
+def pareto_odt(vdd, rankcnt, rz_dev, rz_mc, rtt_nom, rtt_wr, rtt_mc, rs,
+               rd_ratio=0.5, **kwargs):
+    '''
+    Find the Pareto-optimal ODT configurations of average termination power
+    vs. signal swing, i.e., the smaller of the read and write swings, among the
+    candidate values of each resistance. Arguments are the same as
+    `optimize_odt`.
+
+    For each value of the shared resistances, read and write options that are
+    dominated on their own are pruned before combining them.
+
+    Return a list of `ODTConfig` in increasing order of power.
+    '''
+    cands = _prepare(rz_dev, rz_mc, rtt_nom, rtt_wr, rtt_mc, rs, rd_ratio,
+                     'pareto_odt')
+
+    rd_power, rd_swing = _half_grid(vdd, rankcnt, cands, _READ, True, kwargs)
+    wr_power, wr_swing = _half_grid(vdd, rankcnt, cands, _WRITE, False, kwargs)
+    rd_power = rd_power.reshape(-1, rd_power.shape[-1]) * rd_ratio
+    wr_power = wr_power.reshape(-1, wr_power.shape[-1]) * (1. - rd_ratio)
+    rd_swing = rd_swing.reshape(rd_power.shape)
+    wr_swing = wr_swing.reshape(wr_power.shape)
+
+    points = []
+    for shared_idx in range(rd_power.shape[0]):
+        rd_keep = np.flatnonzero(_pareto_mask(rd_power[shared_idx],
+                                              rd_swing[shared_idx]))
+        wr_keep = np.flatnonzero(_pareto_mask(wr_power[shared_idx],
+                                              wr_swing[shared_idx]))
+        rd_sel, wr_sel = np.meshgrid(rd_keep, wr_keep, indexing='ij')
+        rd_sel = rd_sel.ravel()
+        wr_sel = wr_sel.ravel()
+        points.append((np.full(rd_sel.shape, shared_idx), rd_sel, wr_sel,
+                       rd_power[shared_idx, rd_sel]
+                       + wr_power[shared_idx, wr_sel],
+                       np.minimum(rd_swing[shared_idx, rd_sel],
+                                  wr_swing[shared_idx, wr_sel])))
+    shared_idx, rd_idx, wr_idx, power, swing = \
+            [np.concatenate(arrs) for arrs in zip(*points)]
+
+    configs = []
+    for idx in np.flatnonzero(_pareto_mask(power, swing)):
+        configs.append(ODTConfig(
+            resistance=_resistance(cands, shared_idx[idx], rd_idx[idx],
+                                   wr_idx[idx]),
+            power=power[idx].item(),
+            rd_swing=rd_swing[shared_idx[idx], rd_idx[idx]].item(),
+            wr_swing=wr_swing[shared_idx[idx], wr_idx[idx]].item()))
+    return sorted(configs, key=lambda cfg: cfg.power)
@@ -0,0 +1,163 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+from collections import OrderedDict
+import numpy as np
+
+from .compiled_energy import COUNTERS
+from .termination import TermResistance, _TermResistanceBase, \
+        _level_values, _network_power
+from .timing import Timing
+from .voltage_domain import IDDs, IDDsTable, VoltageDomain
+
+# Imaginary step of complex-step differentiation. There is no subtractive
+# cancellation, so it can be far below the resistance values.
+_COMPLEX_STEP = 1e-20
+
+
+def _unit_coefficients(vdom, idds, timing):
+    '''
+    Per-counter coefficients of the voltage domain in chip current-cycles,
+    i.e., with unit vdd, tck, and chipcnt.
+    '''
+    unit = VoltageDomain(1., 1., idds, 1, vdom.burstcycles)
+    return np.stack(np.broadcast_arrays(*[
+        np.asarray(val, dtype=float)
+        for val in unit.energy_coefficients(timing)]), axis=-1)
+
+
+def _stack(arrays, axis):
+    return np.stack(np.broadcast_arrays(*arrays), axis=axis)
+
+
+class EnergySensitivity(object):
+    '''
+    Exact partial derivatives of the energy of an `EnergyDDR` or `EnergyLPDDR`
+    model with respect to its parameters.
+
+    The energy is linear in the IDD values, and the voltage domains only
+    differ in vdd and IDD values, so the derivatives are also linear models,
+    with the per-counter coefficients on the last dimension indexing the
+    counters in `COUNTERS`, i.e., the energy components:
+
+    - `d_idds`: (number of voltage domains, IDD values in `IDDs._fields`,
+      counters).
+    - `d_vdd`: (number of voltage domains, counters).
+    - `d_tck`, `d_chipcnt`: (counters,).
+    - `d_timing`: (timing values in `Timing._fields`, counters).
+
+    If `tck` or the `Timing` values are arrays, their broadcast shape is
+    prepended, see `CompiledEnergy`. The derivative with respect to `tck`
+    keeps the timing values in cycles.
+    '''
+
+    def __init__(self, model):
+        timing = model.timing
+        vdoms = model.vdoms
+        if not vdoms:
+            raise ValueError('{}: given model has no voltage domains.'
+                             .format(self.__class__.__name__))
+
+        # Chip current-cycles per counter of each domain, and their
+        # derivatives to each IDD value, which are the current-cycles of the
+        # unit IDD values since they are linear.
+        zero_idds = {name: 0. for name in IDDs._fields}
+        cur = []
+        d_cur = []
+        for vdom in vdoms:
+            cur.append(_unit_coefficients(vdom, vdom.idds, timing))
+            d_cur.append(_stack([
+                _unit_coefficients(vdom, IDDsTable(
+                    validate=False, **dict(zero_idds, **{name: 1.})), timing)
+                for name in IDDs._fields], axis=-2))
+        cur = _stack(cur, axis=-2)
+
+        # Scale factors of each domain.
+        vdd = _stack([vdom.vdd for vdom in vdoms], axis=-1)[..., None]
+        tck = _stack([vdom.tck for vdom in vdoms], axis=-1)[..., None]
+        chipcnt = np.array([vdom.chipcnt for vdom in vdoms],
+                           dtype=float)[:, None]
+
+        self.d_idds = _stack(d_cur, axis=-3) \
+                * (vdd * tck * chipcnt)[..., None]
+        self.d_vdd = cur * tck * chipcnt
+        self.d_tck = (cur * vdd * chipcnt).sum(axis=-2)
+        self.d_chipcnt = (cur * vdd * tck).sum(axis=-2)
+
+        # The current-cycles are affine in the timing values, so the
+        # derivative is the difference from the zero timing.
+        zero_timing = Timing(*[0.] * len(Timing._fields))
+        d_timing = []
+        for name in Timing._fields:
+            unit_timing = zero_timing._replace(**{name: 1.})
+            d_timing.append(sum(
+                (_unit_coefficients(vdom, vdom.idds, unit_timing)
+                 - _unit_coefficients(vdom, vdom.idds, zero_timing))
+                * np.asarray(vdom.vdd * vdom.tck * vdom.chipcnt)[..., None]
+                for vdom in vdoms))
+        self.d_timing = _stack(d_timing, axis=-2)
+
+    def gradients(self, counters):
+        '''
+        Partial derivatives of the total energy of the counters, see
+        `CompiledEnergy.energy`.
+
+        Return an ordered dict of the derivatives to 'idds', 'vdd', 'tck',
+        'chipcnt', and 'timing', each with the shape of its coefficients
+        without the last dimension, followed by the counter leading
+        dimensions.
+        '''
+        counters = np.asarray(counters)
+        if counters.shape[-1:] != (len(COUNTERS),):
+            raise ValueError('{}: given counters have invalid shape {}.'
+                             .format(self.__class__.__name__, counters.shape))
+        return OrderedDict(
+            (name, np.tensordot(getattr(self, 'd_' + name), counters,
+                                axes=([-1], [-1])))
+            for name in ['idds', 'vdd', 'tck', 'chipcnt', 'timing'])
+
+
+def termination_gradients(term):
+    '''
+    Partial derivatives of the read and write power of a `Termination` or
+    `TerminationBatch` with respect to each resistance value in
+    `TermResistance._fields`.
+
+    Return the derivatives of `rd_power` and `wr_power`, with the resistances
+    inserted before the last dimension of the ranks and the memory
+    controller; sum over the last dimension for the total power.
+
+    The derivatives are computed by complex-step differentiation of the
+    nodal-voltage solution, which is exact to machine precision, with all
+    resistances in a single vectorized solve.
+    '''
+    nres = len(TermResistance._fields)
+    step = _COMPLEX_STEP * np.eye(nres) * 1j
+    # Resistances on a new last dimension, each with its own imaginary step.
+    resistance = _TermResistanceBase._make(
+        np.asarray(val, dtype=float)[..., None] + step[idx]
+        for idx, val in enumerate(term.resistance))
+    vdd = np.asarray(term.vdd, dtype=float)[..., None]
+    level_vals = [np.asarray(val, dtype=float)[..., None]
+                  for val in _level_values(term.level)]
+
+    rd_power, wr_power = _network_power(vdd, term.rankcnt, resistance,
+                                        *level_vals, solver='structured')
+    shape = term.rd_power.shape[:-1] + (nres, term.rankcnt + 1)
+    return np.broadcast_to(rd_power.imag / _COMPLEX_STEP * term.rdpincnt,
+                           shape), \
+            np.broadcast_to(wr_power.imag / _COMPLEX_STEP * term.wrpincnt,
+                            shape)
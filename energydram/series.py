@@ -0,0 +1,97 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+from collections import namedtuple
+import numpy as np
+
+from .compiled_energy import COUNTERS
+from .trace import window_counters
+
+'''
+Power time series. Each power component is an array over the windows and the
+voltage domains. `cycles` is the array of the window lengths.
+
+The power unit is the energy unit over the `tck` unit, e.g., mW for energy in
+pJ and `tck` in ns.
+'''
+PowerSeries = namedtuple('PowerSeries', ['background', 'activate',
+                                         'readwrite', 'refresh', 'cycles'])
+
+
+def power_series(model, counters, window=1, max_points=None):
+    '''
+    Power time series of the model `EnergyDDR` or `EnergyLPDDR`, from the dict
+    of per-epoch counters, each an array over the epochs, see
+    `compiled_energy.COUNTERS`. Missing counters are 0. The length of each
+    epoch is the sum of its background cycles.
+
+    Every `window` consecutive epochs are aggregated into one window. If
+    `max_points` is given, the windows are further enlarged so that there are
+    at most `max_points` windows. The last window may be partial.
+
+    Return a `PowerSeries`.
+    '''
+    for name in counters:
+        if name not in COUNTERS:
+            raise ValueError('power_series: given counter {} is invalid.'
+                             .format(name))
+    if not isinstance(window, int) or window <= 0:
+        raise ValueError('power_series: given window is invalid.')
+    cnts = dict(zip(COUNTERS, np.broadcast_arrays(
+        *[np.asarray(counters.get(name, 0)) for name in COUNTERS])))
+    if cnts[COUNTERS[0]].ndim != 1 or not cnts[COUNTERS[0]].size:
+        raise ValueError('power_series: given counters are invalid.')
+    epochcnt = len(cnts[COUNTERS[0]])
+
+    if max_points is not None:
+        if max_points <= 0:
+            raise ValueError('power_series: given max_points is invalid.')
+        window = max(window, -(-epochcnt // max_points))
+    if window > 1:
+        cnts = {name: np.add.reduceat(val, np.arange(0, epochcnt, window))
+                for name, val in cnts.items()}
+
+    cycles = sum(cnts[name] for name in COUNTERS[:4])
+    energies = [(vdom.background_energy(
+        cycles_bankpre_ckelo=cnts['cycles_bankpre_ckelo'],
+        cycles_bankpre_ckehi=cnts['cycles_bankpre_ckehi'],
+        cycles_bankact_ckelo=cnts['cycles_bankact_ckelo'],
+        cycles_bankact_ckehi=cnts['cycles_bankact_ckehi']),
+                 vdom.activate_energy(model.timing, num_act=cnts['num_act']),
+                 vdom.readwrite_energy(num_rd=cnts['num_rd'],
+                                       num_wr=cnts['num_wr']),
+                 vdom.refresh_energy(model.timing, num_ref=cnts['num_ref']))
+                for vdom in model.vdoms]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        powers = [np.stack([np.where(cycles > 0,
+                                     energy[comp] / (cycles * vdom.tck), 0.)
+                            for energy, vdom in zip(energies, model.vdoms)],
+                           axis=-1)
+                  for comp in range(4)]
+    return PowerSeries(*powers, cycles=cycles)
+
+
+def trace_power_series(model, cycles, commands, banks, window, start=None,
+                       end=None, max_points=None):
+    '''
+    Power time series of the model `EnergyDDR` or `EnergyLPDDR`, from arrays of
+    DRAM commands of a rank, in windows of `window` cycles, see
+    `trace.window_counters` and `power_series`.
+    '''
+    return power_series(model,
+                        window_counters(cycles, commands, banks, window,
+                                        start=start, end=end),
+                        max_points=max_points)
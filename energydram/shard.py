@@ -0,0 +1,182 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+import multiprocessing
+import numpy as np
+
+from .compiled_energy import COUNTERS
+from .trace import _ACT, _PRE, _PDE, _PDX, _check_commands, \
+        _counters_energy, count_commands
+
+
+class ShardCounters(object):
+    '''
+    Counters of the energy models over a shard of DRAM commands of a rank, from
+    cycle `start` to cycle `end`, see `trace.count_commands`.
+
+    The shard is counted from the initial state `init_state`, and ends in the
+    final state `final_state`, each a tuple of (frozenset of open banks,
+    whether CKE is low).
+
+    Shards of consecutive commands are merged with `+`, which is associative.
+    The background between the two shards is accounted in the final state of
+    the first shard, which must be the initial state of the second shard. A
+    shard of no commands, with `start` None, is the identity of `+`.
+    '''
+
+    def __init__(self, counts, start, end, init_state, final_state):
+        self.counts = dict(counts)
+        self.start = start
+        self.end = end
+        self.init_state = (frozenset(init_state[0]), bool(init_state[1]))
+        self.final_state = (frozenset(final_state[0]), bool(final_state[1]))
+
+    def __add__(self, other):
+        if not isinstance(other, ShardCounters):
+            return NotImplemented
+        if self.start is None:
+            return other
+        if other.start is None:
+            return self
+        if other.start < self.end:
+            raise ValueError('{}: shards are not in order of cycles.'
+                             .format(self.__class__.__name__))
+        if other.init_state != self.final_state:
+            raise ValueError('{}: shard initial state does not match the '
+                             'final state of the previous shard.'
+                             .format(self.__class__.__name__))
+        counts = {name: self.counts[name] + other.counts[name]
+                  for name in COUNTERS}
+        # Background between the shards.
+        open_banks, cke_low = self.final_state
+        gap = 2 * bool(open_banks) + (not cke_low)
+        counts[COUNTERS[gap]] += other.start - self.end
+        return ShardCounters(counts, self.start, other.end,
+                             self.init_state, other.final_state)
+
+    def counters(self):
+        ''' Get the counters as a dict. '''
+        return dict(self.counts)
+
+    def energy(self, model):
+        '''
+        Total energy of the counters, with the model `EnergyDDR` or
+        `EnergyLPDDR`.
+        '''
+        return _counters_energy(model, self.counts)
+
+
+def _shard_transition(args):
+    '''
+    State transition of a shard of commands, independent of its initial state.
+
+    Return the set of banks with ACT/PRE, the set of those finally open, and
+    whether CKE is finally low, or None without PDE/PDX.
+    '''
+    commands, banks = args
+    bank_idx = np.flatnonzero((commands == _ACT) | (commands == _PRE))
+    # Last command of each bank.
+    bank_ids, last = np.unique(banks[bank_idx][::-1], return_index=True)
+    last_cmds = commands[bank_idx][::-1][last]
+    cke_idx = np.flatnonzero((commands == _PDE) | (commands == _PDX))
+    cke_low = bool(commands[cke_idx[-1]] == _PDE) if cke_idx.size else None
+    return (set(bank_ids.tolist()),
+            set(bank_ids[last_cmds == _ACT].tolist()), cke_low)
+
+
+def _count_shard(args):
+    cycles, commands, banks, start, end, open_banks, cke_low = args
+    counts, state = count_commands(cycles, commands, banks, start=start,
+                                   end=end, open_banks=open_banks,
+                                   cke_low=cke_low)
+    return ShardCounters(counts, start, end, (open_banks, cke_low),
+                         state[1:])
+
+
+def parallel_count(cycles, commands, banks, start=None, end=None,
+                   open_banks=(), cke_low=False, shards=None, processes=None):
+    '''
+    Reduce arrays of DRAM commands of a rank to the counters of the energy
+    models in parallel, see `trace.count_commands` for the arguments. The
+    result is identical to `trace.count_commands`.
+
+    The commands are split into `shards` shards of consecutive commands,
+    defaulting to the number of processes. The state transitions of the shards
+    are first computed in parallel and chained to get the initial state of
+    each shard, and then the shards are counted in parallel and merged.
+
+    `processes` is the number of worker processes, defaulting to the number of
+    CPUs. With 1 process, the shards are counted in the calling process.
+
+    Return a `ShardCounters`.
+    '''
+    cycles, commands, banks, start, end = _check_commands(
+        'parallel_count', cycles, commands, banks, start, end)
+    init_state = (frozenset(open_banks), bool(cke_low))
+    if start is None:
+        return ShardCounters(dict.fromkeys(COUNTERS, 0), None, None,
+                             init_state, init_state)
+
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    if shards is None:
+        shards = processes
+    if not processes > 0 or not shards > 0:
+        raise ValueError('parallel_count: given processes or shards is '
+                         'invalid.')
+    shards = max(1, min(shards, len(cycles)))
+    bounds = np.linspace(0, len(cycles), shards + 1).astype(int)
+    slices = [slice(beg, end_) for beg, end_ in zip(bounds[:-1], bounds[1:])]
+
+    pool = multiprocessing.Pool(processes) if processes > 1 else None
+    mapper = pool.map if pool is not None else map
+    try:
+        transitions = mapper(_shard_transition,
+                             [(commands[sl], banks[sl]) for sl in slices])
+
+        # Chain the transitions to get the initial state of each shard.
+        states = [init_state]
+        for touched, opened, last_cke in transitions:
+            prev_open, prev_cke = states[-1]
+            states.append(((prev_open - touched) | opened,
+                           prev_cke if last_cke is None else last_cke))
+
+        # Each shard spans from its first to its last command, except the
+        # first and the last shards, which extend to the start and the end.
+        args = []
+        for idx, sl in enumerate(slices):
+            shard_start = start if idx == 0 else cycles[sl.start]
+            shard_end = end if idx == len(slices) - 1 else cycles[sl.stop - 1]
+            args.append((cycles[sl], commands[sl], banks[sl],
+                         int(shard_start), int(shard_end)) + states[idx])
+        results = list(mapper(_count_shard, args))
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    total = results[0]
+    for result in results[1:]:
+        total = total + result
+    return total
+
+
+def parallel_energy(model, cycles, commands, banks, **kwargs):
+    '''
+    Total energy of arrays of DRAM commands of a rank, with the model
+    `EnergyDDR` or `EnergyLPDDR`, counted in parallel, see `parallel_count`.
+    '''
+    return parallel_count(cycles, commands, banks, **kwargs).energy(model)
@@ -0,0 +1,84 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+import numpy as np
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    # Python < 3.8.
+    shared_memory = None
+
+
+class SharedArray(object):
+    '''
+    NumPy array in shared memory, e.g., counter arrays evaluated by multiple
+    worker processes.
+
+    The object is pickled as a small handle of the shared memory block, and
+    unpickling it, e.g., in a worker process, attaches to the same block
+    without copying the data. `array` is the array view of the block.
+
+    The creating process owns the block, and should `unlink` it when all
+    processes are done, e.g., by using the object as a context manager. The
+    array views must be released before `close`.
+    '''
+
+    def __init__(self, array):
+        if shared_memory is None:
+            raise RuntimeError('{}: requires multiprocessing.shared_memory '
+                               'of Python 3.8 or later.'
+                               .format(self.__class__.__name__))
+        array = np.asarray(array)
+        self._shm = shared_memory.SharedMemory(create=True,
+                                               size=max(array.nbytes, 1))
+        self._owner = True
+        self._attach(array.shape, array.dtype)
+        self.array[...] = array
+
+    def _attach(self, shape, dtype):
+        self.array = np.ndarray(shape, dtype=dtype, buffer=self._shm.buf)
+
+    @property
+    def name(self):
+        ''' Name of the shared memory block. '''
+        return self._shm.name
+
+    def __getstate__(self):
+        return (self._shm.name, self.array.shape, self.array.dtype.str)
+
+    def __setstate__(self, state):
+        name, shape, dtype = state
+        self._shm = shared_memory.SharedMemory(name=name)
+        self._owner = False
+        self._attach(shape, np.dtype(dtype))
+
+    def close(self):
+        ''' Detach from the shared memory block. '''
+        self.array = None
+        self._shm.close()
+
+    def unlink(self):
+        ''' Free the shared memory block. Only by the owner. '''
+        if self._owner:
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        self.unlink()
@@ -0,0 +1,265 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+import multiprocessing
+import os
+import numpy as np
+
+from .energy_ddr import EnergyDDR
+from .energy_lpddr import EnergyLPDDR
+from .shared import SharedArray
+from .termination import Termination
+
+# Per-process sweep state, set once by the pool initializer, so the shared
+# inputs are not pickled for each task.
+_WORKER = {}
+
+
+def _replace(src, dst):
+    ''' Rename the file `src` to `dst`, replacing `dst` if it exists. '''
+    if hasattr(os, 'replace'):
+        os.replace(src, dst)
+    else:
+        # Python 2 cannot rename over an existing file on Windows.
+        if os.path.exists(dst):
+            os.remove(dst)
+        os.rename(src, dst)
+
+
+def _init_worker(func, axes, fixed, shared, dtype, invalid):
+    _WORKER.clear()
+    # Replace the shared arrays with their views, and keep the handles alive.
+    if isinstance(shared, dict):
+        handles = [val for val in shared.values()
+                   if isinstance(val, SharedArray)]
+        shared = {key: val.array if isinstance(val, SharedArray) else val
+                  for key, val in shared.items()}
+    else:
+        handles = []
+    _WORKER.update(func=func, axes=axes, fixed=fixed, shared=shared,
+                   dtype=dtype, invalid=invalid, handles=handles)
+
+
+def _point(axes, fixed, idx):
+    ''' Parameters of the point at the given multi-dimensional index. '''
+    params = dict(fixed)
+    for (name, values), i in zip(axes, idx):
+        if isinstance(name, tuple):
+            params.update(zip(name, values[i]))
+        else:
+            params[name] = values[i]
+    return params
+
+
+def _run_chunk(bounds):
+    ''' Evaluate the points in the flat index range `bounds`. '''
+    beg, end = bounds
+    axes = _WORKER['axes']
+    dtype = _WORKER['dtype']
+    func = _WORKER['func']
+    shared = _WORKER['shared']
+    shape = tuple(len(values) for _, values in axes)
+    result = np.zeros(end - beg, dtype=dtype)
+    names = [name for name in dtype.names if name != 'valid']
+    # Invalid points are NaN in the floating-point fields, and 0 in others.
+    nan_names = [name for name in names if dtype[name].kind in 'fc']
+    for pos, idx in enumerate(zip(*np.unravel_index(np.arange(beg, end),
+                                                    shape))):
+        try:
+            values = func(_point(axes, _WORKER['fixed'], idx), shared)
+        except _WORKER['invalid']:
+            for name in nan_names:
+                result[name][pos] = np.nan
+            continue
+        if len(names) == 1:
+            values = (values,)
+        for name, val in zip(names, values):
+            result[name][pos] = val
+        result['valid'][pos] = True
+    return beg, result
+
+
+class Sweep(object):
+    '''
+    Design-space exploration over the Cartesian product of parameter axes.
+
+    `axes` is a sequence of (name, values) pairs. A name can be a tuple of
+    names, whose values are tuples of the same length, to sweep coupled
+    parameters together, e.g., `(('ddr', 'vdd'), [(3, 1.5), (4, 1.2)])`.
+    `fixed` is a dict of parameters common to all points.
+
+    `func` is called as `func(params, shared)` for each point, where `params`
+    is the dict of parameters of the point, and `shared` is the given shared
+    inputs, e.g., counter arrays. It must be picklable, i.e., a module-level
+    function, and returns a value per field in `fields`, a sequence of (name,
+    dtype) pairs. Points for which `func` raises one of the exception types in
+    `invalid` are invalid, with NaN in the floating-point fields and 0 in
+    others; other exceptions propagate.
+
+    If `shared` is a dict, its `SharedArray` values are passed to the workers
+    as shared memory handles, and given to `func` as arrays without copies.
+    '''
+
+    def __init__(self, axes, func, fields=(('energy', float),), fixed=None,
+                 shared=None, invalid=(ValueError,)):
+        self.axes = []
+        for name, values in axes:
+            values = list(values)
+            if not values:
+                raise ValueError('{}: given axis {} is empty.'
+                                 .format(self.__class__.__name__, name))
+            self.axes.append((name, values))
+        self.func = func
+        fields = [(str(name), dtype) for name, dtype in fields]
+        if not fields or any(name == 'valid' for name, _ in fields):
+            raise ValueError('{}: given fields are invalid.'
+                             .format(self.__class__.__name__))
+        self.dtype = np.dtype(fields + [('valid', bool)])
+        self.fixed = dict(fixed or {})
+        self.shared = shared
+        self.invalid = tuple(invalid)
+
+    @property
+    def shape(self):
+        ''' Shape of the sweep, one dimension per axis. '''
+        return tuple(len(values) for _, values in self.axes)
+
+    def __len__(self):
+        return int(np.prod(self.shape, dtype=np.int64))
+
+    def point(self, index):
+        ''' Parameters of the point at the given flat index. '''
+        if not 0 <= index < len(self):
+            raise IndexError('{}: given index is out of range.'
+                             .format(self.__class__.__name__))
+        return _point(self.axes, self.fixed,
+                      np.unravel_index(index, self.shape))
+
+    def run(self, processes=None, chunksize=256, progress=None,
+            checkpoint=None, checkpoint_interval=16):
+        '''
+        Evaluate all points, in chunks of `chunksize` points across
+        `processes` worker processes, defaulting to the number of CPUs. With 1
+        process, evaluate in the calling process.
+
+        `progress` is called as `progress(done, total)` in points after each
+        chunk.
+
+        If `checkpoint` is given as a file path, the results are saved to it
+        every `checkpoint_interval` chunks and at the end, and a later run
+        with the same checkpoint resumes from the saved results.
+
+        Return the structured array of the results, with the shape of the
+        sweep, the fields, and a boolean field `valid`.
+        '''
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+        if not processes > 0 or not chunksize > 0:
+            raise ValueError('{}: given processes or chunksize is invalid.'
+                             .format(self.__class__.__name__))
+        total = len(self)
+        result = np.zeros(total, dtype=self.dtype)
+        done = np.zeros(total, dtype=bool)
+        if checkpoint is not None and os.path.exists(checkpoint):
+            self._load_checkpoint(checkpoint, result, done)
+
+        chunks = [(beg, min(beg + chunksize, total))
+                  for beg in range(0, total, chunksize)
+                  if not done[beg:beg + chunksize].all()]
+        ndone = int(done.sum())
+        if progress is not None:
+            progress(ndone, total)
+
+        initargs = (self.func, self.axes, self.fixed, self.shared, self.dtype,
+                    self.invalid)
+        if processes > 1 and len(chunks) > 1:
+            pool = multiprocessing.Pool(processes, initializer=_init_worker,
+                                        initargs=initargs)
+            outputs = pool.imap_unordered(_run_chunk, chunks)
+        else:
+            pool = None
+            _init_worker(*initargs)
+            outputs = (_run_chunk(chunk) for chunk in chunks)
+        try:
+            for cnt, (beg, chunk) in enumerate(outputs):
+                result[beg:beg + len(chunk)] = chunk
+                done[beg:beg + len(chunk)] = True
+                ndone = int(done.sum())
+                if progress is not None:
+                    progress(ndone, total)
+                if checkpoint is not None \
+                        and (cnt + 1) % checkpoint_interval == 0:
+                    self._save_checkpoint(checkpoint, result, done)
+        except BaseException:
+            # Do not wait for the queued chunks on errors or interrupts.
+            if pool is not None:
+                pool.terminate()
+            raise
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+            else:
+                _WORKER.clear()
+            if checkpoint is not None:
+                self._save_checkpoint(checkpoint, result, done)
+
+        return result.reshape(self.shape)
+
+    def _save_checkpoint(self, path, result, done):
+        # Write to a temporary file first, so an interruption does not corrupt
+        # the checkpoint.
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as fh:
+            np.savez(fh, result=result, done=done,
+                     shape=np.array(self.shape))
+        _replace(tmp, path)
+
+    def _load_checkpoint(self, path, result, done):
+        with np.load(path) as data:
+            if data['result'].dtype != self.dtype \
+                    or tuple(data['shape']) != self.shape:
+                raise ValueError('{}: checkpoint {} does not match the sweep.'
+                                 .format(self.__class__.__name__, path))
+            result[:] = data['result']
+            done[:] = data['done']
+
+
+def evaluate_ddr(params, shared):
+    '''
+    Sweep function for `EnergyDDR`, constructed with the point parameters.
+    Return the total energy of the counter array `shared['counters']`, see
+    `CompiledEnergy.energy`.
+    '''
+    return EnergyDDR(**params).compile().energy(shared['counters']).sum()
+
+
+def evaluate_lpddr(params, shared):
+    '''
+    Sweep function for `EnergyLPDDR`, constructed with the point parameters.
+    Return the total energy of the counter array `shared['counters']`, see
+    `CompiledEnergy.energy`.
+    '''
+    return EnergyLPDDR(**params).compile().energy(shared['counters']).sum()
+
+
+def evaluate_termination(params, _):
+    '''
+    Sweep function for `Termination`, constructed with the point parameters.
+    Return the total read and write termination power.
+    '''
+    term = Termination(**params)
+    return term.read_power_total(), term.write_power_total()
@@ -0,0 +1,143 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+from collections import OrderedDict
+
+
+def _numpy():
+    '''
+    Import NumPy on first use, so that importing the pure Python modules does
+    not import NumPy.
+    '''
+    import numpy as np
+    return np
+
+
+def format_failures(failures, maxrows=10):
+    '''
+    Format the dict of the failed rules and their rows for error messages.
+    '''
+    msgs = []
+    for rule, rows in failures.items():
+        shown = ', '.join(str(row) for row in rows[:maxrows])
+        if len(rows) > maxrows:
+            shown += ', ... ({} rows)'.format(len(rows))
+        msgs.append('{} at rows [{}]'.format(rule, shown))
+    return '; '.join(msgs)
+
+
+class ValueTable(object):
+    '''
+    Base of a table of sets of values, mixed into a namedtuple of the fields,
+    with each value as a NumPy array over the rows. The arrays are broadcast
+    together, but are stored as given, e.g., sparse grids are not expanded.
+
+    All rows are validated at once, unless `validate` is False. A row is valid
+    if all its values are finite and it passes the rules of `_RULES`.
+
+    Subclasses must set `_RULES` to the list of validation rules. Each rule is
+    a tuple of (failure condition, larger, smaller), e.g., ('IDD2N < IDD2P',
+    'idd2n', 'idd2p'). A row fails the rule if larger < smaller; each of them
+    is a field name or a constant. Subclasses also set `_row_type` to the type
+    of a single row, and `_error` to the format of the error message with the
+    class name and the failures.
+    '''
+
+    __slots__ = ()
+
+    _RULES = None
+    _row_type = None
+    _error = '{}: {}!'
+
+    def __new__(cls, validate=True, **kwargs):
+        if cls._RULES is None:
+            raise TypeError('{}: no validation rules.'.format(cls.__name__))
+        np = _numpy()
+        self = super(ValueTable, cls).__new__(cls, **kwargs)
+        self = super(ValueTable, cls).__new__(
+            cls, *[np.asarray(val, dtype=float) for val in self])
+        if validate:
+            self.check()
+        return self
+
+    @property
+    def shape(self):
+        ''' Shape of the table. '''
+        return _numpy().broadcast(*self).shape
+
+    @staticmethod
+    def _label(name):
+        ''' Name of the field `name` in the validation rules. '''
+        return name
+
+    def _operand(self, operand):
+        return getattr(self, operand) if isinstance(operand, str) else operand
+
+    def _failures(self):
+        '''
+        All validation rules, including finite values, as a list of (rule,
+        array of whether each row fails the rule).
+        '''
+        np = _numpy()
+        return [('{} not finite'.format(self._label(name)), ~np.isfinite(val))
+                for name, val in zip(self._fields, self)] \
+                + [(rule, self._operand(larger) < self._operand(smaller))
+                   for rule, larger, smaller in self._RULES]
+
+    def violations(self):
+        '''
+        Get the failed validation rules, as a dict from the rule, e.g.,
+        'IDD2N < IDD2P', to the array of the flat indices of the failed rows.
+        '''
+        np = _numpy()
+        failures = OrderedDict()
+        for rule, failed in self._failures():
+            rows = np.flatnonzero(np.broadcast_to(failed, self.shape))
+            if rows.size:
+                failures[rule] = rows
+        return failures
+
+    def valid(self):
+        ''' Get the boolean array of whether each row is valid. '''
+        np = _numpy()
+        mask = np.ones(self.shape, dtype=bool)
+        for _, failed in self._failures():
+            mask &= ~failed
+        return mask
+
+    def check(self):
+        ''' Check validation of all rows. '''
+        failures = self.violations()
+        if failures:
+            raise ValueError(self._error.format(self.__class__.__name__,
+                                                format_failures(failures)))
+
+    def select(self, rows):
+        '''
+        Get the table of the selected rows, by an index or a boolean mask
+        array. The selected rows are not validated again.
+        '''
+        np = _numpy()
+        return self.__class__(validate=False,
+                              **{name: np.broadcast_to(val, self.shape)[rows]
+                                 for name, val in zip(self._fields, self)})
+
+    def row(self, index):
+        ''' Get a row, validated as `_row_type`. '''
+        np = _numpy()
+        return self._row_type(**{
+            name: float(np.broadcast_to(val, self.shape)[index])
+            for name, val in zip(self._fields, self)})
@@ -0,0 +1,126 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+import hashlib
+import os
+import sqlite3
+import numpy as np
+
+from .termination import MODEL_VERSION, Termination
+
+
+class TerminationStore(object):
+    '''
+    Persistent on-disk store of solved termination power, in an SQLite
+    database under a given directory.
+
+    Entries are keyed by a stable hash of the `Termination` inputs, and tagged
+    with the termination model version. Entries of other versions are stale,
+    and are re-solved and replaced. The database can be shared by multiple
+    processes.
+    '''
+
+    FILENAME = 'termination.sqlite'
+
+    def __init__(self, directory):
+        try:
+            os.makedirs(directory)
+        except OSError:
+            # Created by another process.
+            if not os.path.isdir(directory):
+                raise
+        self.path = os.path.join(directory, self.FILENAME)
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(self.path, timeout=60)
+        with self._conn:
+            self._conn.execute('CREATE TABLE IF NOT EXISTS termination ('
+                               'key TEXT PRIMARY KEY, version INTEGER, '
+                               'rd_power BLOB, wr_power BLOB)')
+
+    @staticmethod
+    def key(vdd, rankcnt, resistance, width=0, level='mid',
+            with_dqs=True, with_dm=True, with_dbi=False):
+        ''' Stable hash key of the `Termination` inputs. '''
+        inputs = (float(vdd), int(rankcnt),
+                  tuple(float(res) for res in resistance),
+                  int(width), str(level),
+                  bool(with_dqs), bool(with_dm), bool(with_dbi))
+        return hashlib.sha256(repr(inputs).encode('utf-8')).hexdigest()
+
+    def termination(self, vdd, rankcnt, resistance, width=0, level='mid',
+                    with_dqs=True, with_dm=True, with_dbi=False,
+                    solver='structured', dtype=None):
+        '''
+        Get the `Termination` of the given arguments, which are the same as
+        `Termination`. Use the stored power if available, otherwise solve and
+        store it.
+        '''
+        # pylint: disable=protected-access
+        term = Termination.__new__(Termination)
+        term._configure(vdd, rankcnt, resistance, width, level,
+                        with_dqs, with_dm, with_dbi, solver)
+        key = self.key(vdd, rankcnt, resistance, width=width, level=level,
+                       with_dqs=with_dqs, with_dm=with_dm, with_dbi=with_dbi)
+
+        row = self._conn.execute('SELECT version, rd_power, wr_power '
+                                 'FROM termination WHERE key = ?',
+                                 (key,)).fetchone()
+        if row is not None and row[0] == MODEL_VERSION:
+            self.hits += 1
+            term.rd_power = np.frombuffer(row[1], dtype=np.float64) \
+                    .astype(dtype or np.float64)
+            term.wr_power = np.frombuffer(row[2], dtype=np.float64) \
+                    .astype(dtype or np.float64)
+            return term
+
+        self.misses += 1
+        term._solve(solver)
+        with self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO termination VALUES (?, ?, ?, ?)',
+                (key, MODEL_VERSION,
+                 sqlite3.Binary(term.rd_power.astype(np.float64).tobytes()),
+                 sqlite3.Binary(term.wr_power.astype(np.float64).tobytes())))
+        if dtype is not None:
+            term.rd_power = term.rd_power.astype(dtype)
+            term.wr_power = term.wr_power.astype(dtype)
+        return term
+
+    def purge_stale(self):
+        ''' Remove the entries of other model versions. '''
+        with self._conn:
+            self._conn.execute('DELETE FROM termination WHERE version != ?',
+                               (MODEL_VERSION,))
+
+    def clear(self):
+        ''' Remove all entries. '''
+        with self._conn:
+            self._conn.execute('DELETE FROM termination')
+
+    def __len__(self):
+        return self._conn.execute('SELECT COUNT(*) FROM termination') \
+                .fetchone()[0]
+
+    def close(self):
+        ''' Close the database. '''
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -17,10 +17,24 @@ program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
 from collections import namedtuple
 import numpy as np
 
+from .table import ValueTable, format_failures
+
 _TermResistanceBase = namedtuple('_TermResistanceBase',
                                  ['rz_dev', 'rz_mc', 'rtt_nom', 'rtt_wr',
                                   'rtt_mc', 'rs'])
 
+# Validation rules of termination resistance values, as the fields that must
+# be positive, with their descriptions.
+_RESISTANCE_RULES = [
+    ('rz_dev', 'device driver impedance rz_dev'),
+    ('rz_mc', 'memory ctlr driver impedance rz_mc'),
+    ('rtt_nom', 'device R_TT,nom'),
+    ('rtt_wr', 'device R_TT(WR)'),
+    ('rtt_mc', 'memory ctlr termination rtt_mc'),
+    ('rs', 'trace impedance rs'),
+    ]
+
+
 class TermResistance(_TermResistanceBase):
     '''
     Define the set of termination resistance values.
@@ -41,36 +55,312 @@ class TermResistance(_TermResistanceBase):
 
     def check(self):
         ''' Check validation of termination resistance values. '''
-        if self.rz_dev < 1e-4:
-            raise ValueError('{}: given device driver impedance rz_dev '
-                             'is invalid.'
-                             .format(self.__class__.__name__))
-        if self.rz_mc < 1e-4:
-            raise ValueError('{}: given memory ctlr driver impedance rz_mc '
-                             'is invalid.'
-                             .format(self.__class__.__name__))
-        if self.rtt_nom < 1e-4:
-            raise ValueError('{}: given device R_TT,nom is invalid.'
-                             .format(self.__class__.__name__))
-        if self.rtt_wr < 1e-4:
-            raise ValueError('{}: given device R_TT(WR) is invalid.'
-                             .format(self.__class__.__name__))
-        if self.rtt_mc < 1e-4:
-            raise ValueError('{}: given memory ctlr termination rtt_mc '
-                             'is invalid.'
-                             .format(self.__class__.__name__))
-        if self.rs < 1e-4:
-            raise ValueError('{}: given trace impedance rs is invalid.'
-                             .format(self.__class__.__name__))
+        for name, desc in _RESISTANCE_RULES:
+            if getattr(self, name) < 1e-4:
+                raise ValueError('{}: given {} is invalid.'
+                                 .format(self.__class__.__name__, desc))
+
+
+class TermResistanceTable(ValueTable, _TermResistanceBase):
+    '''
+    Define a table of sets of termination resistance values, with each value
+    as a NumPy array over the rows, see `table.ValueTable`.
+
+    The table can be given to `TerminationBatch`, and the power is then
+    computed for each row.
+    '''
+
+    __slots__ = ()
+
+    _RULES = [('{} < 1e-4'.format(name), name, 1e-4)
+              for name, _ in _RESISTANCE_RULES]
+    _row_type = TermResistance
+    _error = '{}: given {} is invalid.'
+
+
+# Version of the termination model. Bump when the model results change, to
+# invalidate persisted results.
+MODEL_VERSION = 1
+
+# Termination levels, as (fraction of R_TT conductance connected to VDD,
+# fraction of R_TT conductance connected to GND, driver low voltage in VDD).
+_LEVELS = {
+    'high': (1., 0., 0.),
+    'low': (0., 1., 1.),
+    'mid': (.5, .5, 0.),
+}
+
+_SOLVERS = ('structured', 'dense')
+
+
+def _solve_nodes(rankcnt, diag, rhs, coupling, solver):
+    '''
+    Solve the nodal voltages of the termination network.
+
+    The nodes are the target rank, the other ranks, and the memory controller,
+    which connects to each rank node through `coupling` conductance. So the
+    nodal matrix is arrow-shaped, with -`coupling` on the last row and column.
+    `diag` and `rhs` are the triples of the diagonal and the rhs values for the
+    target rank, each of the other ranks, and the memory controller.
+
+    Return the voltages of the target rank, each of the other ranks, and the
+    memory controller. All values can be scalars or broadcastable arrays.
+    '''
+    diag_tgt, diag_oth, diag_mc = diag
+    rhs_tgt, rhs_oth, rhs_mc = rhs
+
+    if solver == 'dense':
+        shape = np.broadcast(diag_tgt, diag_oth, diag_mc,
+                             rhs_tgt, rhs_oth, rhs_mc, coupling).shape
+        coef = np.zeros(shape + (rankcnt + 1, rankcnt + 1))
+        vec = np.empty(shape + (rankcnt + 1,))
+        oth = np.arange(1, rankcnt)
+        coef[..., 0, 0] = diag_tgt
+        coef[..., oth, oth] = np.expand_dims(diag_oth, -1)
+        coef[..., -1, -1] = diag_mc
+        coef[..., :-1, -1] = np.expand_dims(-coupling, -1)
+        coef[..., -1, :-1] = np.expand_dims(-coupling, -1)
+        vec[..., 0] = rhs_tgt
+        vec[..., 1:-1] = np.expand_dims(rhs_oth, -1)
+        vec[..., -1] = rhs_mc
+        vnodes = np.linalg.solve(coef, vec[..., None])[..., 0]
+        return vnodes[..., 0], vnodes[..., min(1, rankcnt - 1)], \
+                vnodes[..., -1]
+
+    # Rank nodes: Vi = (rhs_i + coupling * VMC) / diag_i.
+    # Substitute into the memory controller equation (Schur complement) to
+    # solve VMC. All other ranks are identical.
+    othcnt = rankcnt - 1
+    vmc = (rhs_mc
+           + coupling * (rhs_tgt / diag_tgt + othcnt * rhs_oth / diag_oth)) \
+            / (diag_mc - coupling ** 2 * (1. / diag_tgt + othcnt / diag_oth))
+    return (rhs_tgt + coupling * vmc) / diag_tgt, \
+            (rhs_oth + coupling * vmc) / diag_oth, vmc
+
+
+def _rank_array(rankcnt, tgt, oth, mc):
+    '''
+    Expand the values of the target rank, each of the other ranks, and the
+    memory controller, to an array with all nodes on the last dimension.
+    '''
+    arr = np.empty(np.broadcast(tgt, oth, mc).shape + (rankcnt + 1,),
+                   dtype=np.result_type(tgt, oth, mc))
+    arr[..., 0] = tgt
+    arr[..., 1:-1] = np.expand_dims(oth, -1)
+    arr[..., -1] = mc
+    return arr
+
+
+def _level_values(level):
+    '''
+    Level values `up`, `down`, `drv` (see `_LEVELS`) of a scalar or an array
+    of levels.
+    '''
+    level = np.asarray(level)
+    if level.ndim == 0:
+        return _LEVELS[level.item()]
+    level_vals = np.array([_LEVELS[lvl] for lvl in level.ravel()]) \
+            .reshape(level.shape + (3,))
+    return [level_vals[..., idx] for idx in range(3)]
+
+
+def _pin_counts(width, with_dqs, with_dm, with_dbi):
+    '''
+    Read and write pin counts associated to termination, see `Termination`.
+    Return None if `width` is invalid.
+    '''
+    if width == 0:
+        rdpincnt = 1
+        wrpincnt = 1
+    elif width >= 4 and ((width & (width - 1)) == 0):
+        # Width must be power of 2.
+
+        rdpincnt = 0
+        wrpincnt = 0
+        # DQ switch is halved, DBI for each eight-pin group.
+        if with_dbi:
+            rdpincnt += width / 2 + max(1, width / 8)
+            wrpincnt += width / 2 + max(1, width / 8)
+        else:
+            rdpincnt += width
+            wrpincnt += width
+        # DQS, DQS# for each eight-pin group.
+        rdpincnt += (max(1, width / 8) * 2 if with_dqs else 0)
+        wrpincnt += (max(1, width / 8) * 2 if with_dqs else 0)
+        # DM for each eight-pin group.
+        wrpincnt += (max(1, width / 8) if with_dm else 0)
+    else:
+        return None
+    return rdpincnt, wrpincnt
+
+
+def _termination_power(vnode, vdd, rtt, up, down):
+    ''' Power on a termination R_TT, split to VDD and GND. '''
+    return (up * (vnode - vdd) ** 2 + down * vnode ** 2) / rtt
+
+
+def _network_power(vdd, rankcnt, resistance, up, down, drv, solver):
+    '''
+    Read and write power per pin at each node of the termination network, i.e.,
+    the ranks and the memory controller on the last dimension.
+
+    `vdd`, the resistance values, and the level values `up`, `down`, `drv` (see
+    `_LEVELS`) can be scalars or arrays, which are broadcast to the leading
+    dimensions.
+    '''
+    rz_dev = resistance.rz_dev
+    rz_mc = resistance.rz_mc
+    rtt_nom = resistance.rtt_nom
+    rtt_wr = resistance.rtt_wr
+    rtt_mc = resistance.rtt_mc
+    rs = resistance.rs
+
+    v_drv = drv * vdd
+
+    # According to nodal-voltage analysis, solve coef * vnodes = rhs, where
+    # vnodes = [V0, V1, V2, ..., VMC], for DRAM read and DRAM write,
+    # respectively. An R_TT contributes 1/R_TT to the diagonal, and
+    # up * VDD/R_TT to the rhs.
+
+    # Other ranks: rtt_nom.
+    # up * (Vi - VDD)/rtt_nom + down * Vi/rtt_nom + (Vi - VMC)/rs = 0
+    diag_oth = 1. / rtt_nom + 1. / rs
+    rhs_oth = up * vdd / rtt_nom
+
+    # DRAM read.
+
+    # Rank 0: rz_dev, to Vdrv.
+    # (V0 - Vdrv)/rz_dev + (V0 - VMC)/rs = 0
+    # MC: rtt_mc.
+    # up * (VMC - VDD)/rtt_mc + down * VMC/rtt_mc + sum (VMC - Vi)/rs = 0
+    v_tgt, v_oth, v_mc = _solve_nodes(
+        rankcnt,
+        (1. / rz_dev + 1. / rs, diag_oth, 1. / rtt_mc + rankcnt * 1. / rs),
+        (v_drv / rz_dev, rhs_oth, up * vdd / rtt_mc),
+        1. / rs, solver)
+
+    rd_power = _rank_array(
+        rankcnt,
+        ((v_tgt - v_drv) ** 2) / rz_dev + ((v_tgt - v_mc) ** 2) / rs,
+        _termination_power(v_oth, vdd, rtt_nom, up, down)
+        + ((v_oth - v_mc) ** 2) / rs,
+        _termination_power(v_mc, vdd, rtt_mc, up, down))
+
+    # DRAM write.
+
+    # Rank 0: rtt_wr.
+    # up * (V0 - VDD)/rtt_wr + down * V0/rtt_wr + (V0 - VMC)/rs = 0
+    # MC: rz_mc, to Vdrv.
+    # (VMC - Vdrv)/rz_mc + sum (VMC - Vi)/rs = 0
+    v_tgt, v_oth, v_mc = _solve_nodes(
+        rankcnt,
+        (1. / rtt_wr + 1. / rs, diag_oth, 1. / rz_mc + rankcnt * 1. / rs),
+        (up * vdd / rtt_wr, rhs_oth, v_drv / rz_mc),
+        1. / rs, solver)
+
+    wr_power = _rank_array(
+        rankcnt,
+        _termination_power(v_tgt, vdd, rtt_wr, up, down)
+        + ((v_tgt - v_mc) ** 2) / rs,
+        _termination_power(v_oth, vdd, rtt_nom, up, down)
+        + ((v_oth - v_mc) ** 2) / rs,
+        ((v_mc - v_drv) ** 2) / rz_mc)
+
+    return rd_power, wr_power
+
+
+def _network_swing(vdd, rankcnt, resistance, solver):
+    '''
+    Signal swing per pin at the receiver, i.e., the memory controller for DRAM
+    read, and the target rank for DRAM write.
+
+    The network is linear, so the swing is the receiver voltage response to the
+    driver switching between GND and VDD, independent of the level.
+    '''
+    rz_dev = resistance.rz_dev
+    rz_mc = resistance.rz_mc
+    rtt_nom = resistance.rtt_nom
+    rtt_wr = resistance.rtt_wr
+    rtt_mc = resistance.rtt_mc
+    rs = resistance.rs
+
+    diag_oth = 1. / rtt_nom + 1. / rs
+
+    _, _, rd_swing = _solve_nodes(
+        rankcnt,
+        (1. / rz_dev + 1. / rs, diag_oth, 1. / rtt_mc + rankcnt * 1. / rs),
+        (vdd / rz_dev, 0., 0.),
+        1. / rs, solver)
 
+    wr_swing, _, _ = _solve_nodes(
+        rankcnt,
+        (1. / rtt_wr + 1. / rs, diag_oth, 1. / rz_mc + rankcnt * 1. / rs),
+        (0., 0., vdd / rz_mc),
+        1. / rs, solver)
 
-class Termination(object):
+    return rd_swing, wr_swing
+
+
+class _TerminationPower(object):
+    '''
+    Termination power accessors, based on `rd_power` and `wr_power` with the
+    ranks and the memory controller on the last dimension.
+    '''
+
+    __slots__ = ()
+
+    def read_power_total(self):
+        ''' Get DRAM read termination power. '''
+        return self.rd_power.sum(axis=-1)
+
+    def write_power_total(self):
+        ''' Get DRAM write termination power. '''
+        return self.wr_power.sum(axis=-1)
+
+    def read_power_memctlr(self):
+        ''' Get DRAM read termination power at memory controller. '''
+        return self.rd_power[..., -1]
+
+    def write_power_memctlr(self):
+        ''' Get DRAM write termination power at memory controller. '''
+        return self.wr_power[..., -1]
+
+    def read_power_devices(self):
+        ''' Get DRAM read termination power at DRAM devices. '''
+        return self.rd_power[..., :self.rankcnt].sum(axis=-1)
+
+    def write_power_devices(self):
+        ''' Get DRAM write termination power at DRAM devices. '''
+        return self.wr_power[..., :self.rankcnt].sum(axis=-1)
+
+    def read_power_target_rank(self):
+        ''' Get DRAM read termination power at the target rank. '''
+        return self.rd_power[..., 0]
+
+    def write_power_target_rank(self):
+        ''' Get DRAM write termination power at the target rank. '''
+        return self.wr_power[..., 0]
+
+    def read_power_other_ranks(self):
+        ''' Get DRAM read termination power at other ranks. '''
+        return self.rd_power[..., 1:self.rankcnt].sum(axis=-1)
+
+    def write_power_other_ranks(self):
+        ''' Get DRAM write termination power at other ranks. '''
+        return self.wr_power[..., 1:self.rankcnt].sum(axis=-1)
+
+
+class Termination(_TerminationPower):
     '''
     Termination scheme for an individual chip.
     '''
 
+    __slots__ = ('vdd', 'rankcnt', 'resistance', 'rdpincnt', 'wrpincnt',
+                 'level', 'rd_power', 'wr_power')
+
     def __init__(self, vdd, rankcnt, resistance, width=0, level='mid',
-                 with_dqs=True, with_dm=True, with_dbi=False):
+                 with_dqs=True, with_dm=True, with_dbi=False,
+                 solver='structured', dtype=None):
         '''
         `width` specifies the chip width and determines the pin count
         associated to termination. Currently support 0, 4, 8, 16, 32. Valid for
@@ -95,9 +385,28 @@ class Termination(object):
         low: single R_TT connects to GND.
 
         mid: R_TTU connects to VDD and R_TTD connects to GND, both are 2 * R_TT.
+
+        `solver` can be 'structured' or 'dense', for how to solve the nodal
+        equations of the termination network.
+
+        structured: eliminate the rank nodes, which only connect to the memory
+        controller node, in closed form. The solve cost does not depend on
+        `rankcnt`.
+
+        dense: build the full nodal matrix and use `np.linalg.solve`. Kept as
+        the reference.
+
+        `dtype` is the NumPy data type of `rd_power` and `wr_power`, e.g.,
+        `np.float32` to reduce the memory of many instances. The network is
+        always solved in double precision.
         '''
-        # pylint: disable=too-many-branches
+        self._configure(vdd, rankcnt, resistance, width, level,
+                        with_dqs, with_dm, with_dbi, solver)
+        self._solve(solver, dtype=dtype)
 
+    def _configure(self, vdd, rankcnt, resistance, width, level,
+                   with_dqs, with_dm, with_dbi, solver):
+        ''' Validate and set the configuration, without solving power. '''
         if vdd < 0:
             raise ValueError('{}: given vdd is invalid.'
                              .format(self.__class__.__name__))
@@ -115,198 +424,129 @@ class Termination(object):
         self.rankcnt = rankcnt
         self.resistance = resistance
 
-        if width == 0:
-            self.rdpincnt = 1
-            self.wrpincnt = 1
-        elif width >= 4 and ((width & (width - 1)) == 0):
-            # Width must be power of 2.
-
-            self.rdpincnt = 0
-            self.wrpincnt = 0
-            # DQ switch is halved, DBI for each eight-pin group.
-            if with_dbi:
-                self.rdpincnt += width / 2 + max(1, width / 8)
-                self.wrpincnt += width / 2 + max(1, width / 8)
-            else:
-                self.rdpincnt += width
-                self.wrpincnt += width
-            # DQS, DQS# for each eight-pin group.
-            self.rdpincnt += (max(1, width / 8) * 2 if with_dqs else 0)
-            self.wrpincnt += (max(1, width / 8) * 2 if with_dqs else 0)
-            # DM for each eight-pin group.
-            self.wrpincnt += (max(1, width / 8) if with_dm else 0)
-        else:
+        pincnts = _pin_counts(width, with_dqs, with_dm, with_dbi)
+        if pincnts is None:
             raise ValueError('{}: given width is invalid.'
                              .format(self.__class__.__name__))
+        self.rdpincnt, self.wrpincnt = pincnts
 
-        if level == 'high':
-            vdd_eq = vdd / 1.
-            v_drv = 0.
-        elif level == 'low':
-            vdd_eq = 0.
-            v_drv = vdd / 1.
-        elif level == 'mid':
-            vdd_eq = vdd / 2.
-            v_drv = 0.
-        else:
+        if level not in _LEVELS:
             raise ValueError('{}: given level is invalid.'
                              .format(self.__class__.__name__))
+        self.level = level
+        if solver not in _SOLVERS:
+            raise ValueError('{}: given solver is invalid.'
+                             .format(self.__class__.__name__))
 
-        rz_dev = resistance.rz_dev
-        rz_mc = resistance.rz_mc
-        rtt_nom = resistance.rtt_nom
-        rtt_wr = resistance.rtt_wr
-        rtt_mc = resistance.rtt_mc
-        rs = resistance.rs
-
-        # According to nodal-voltage analysis, solve coef * vnodes = rhs, where
-        # vnodes = [V0, V1, V2, ..., VMC], for DRAM read and DRAM write,
-        # respectively.
-
-        # DRAM read.
-
-        coef = np.zeros((rankcnt + 1, rankcnt + 1))
-        rhs = np.zeros(rankcnt + 1)
-        # Rank 0: rz_dev, to GND.
-        # (V0 - Vdrv)/rz_dev + (V0 - VMC)/rs = 0
-        coef[0, 0] = 1. / rz_dev + 1. / rs
-        coef[0, rankcnt] = -1. / rs
-        rhs[0] = v_drv / rz_dev
-        # Other rankcnt: rtt_nom, 2x up to VDD and down to GND.
-        # (Vi - VDD)/2rtt_nom + Vi/2rtt_nom + (Vi - VMC)/rs = 0
-        for idx in range(1, rankcnt):
-            coef[idx, idx] = 1. / rtt_nom + 1. / rs
-            coef[idx, rankcnt] = -1. / rs
-            rhs[idx] = vdd_eq / rtt_nom
-        # MC: rtt_mc, 2x up to VDD and down to GND.
-        # (VMC - VDD)/2rtt_mc + VMC/2rtt_mc + sum (VMC - Vi)/rs = 0
-        coef[rankcnt, 0:rankcnt] = -1. / rs
-        coef[rankcnt, rankcnt] = 1. / rtt_mc + rankcnt * 1. / rs
-        rhs[rankcnt] = vdd_eq / rtt_mc
-
-        rd_vnodes = np.linalg.solve(coef, rhs)
-
-        self.rd_power = np.zeros(rankcnt + 1)
-        self.rd_power[0] = \
-                ((rd_vnodes[0] - v_drv) ** 2) / rz_dev \
-                + ((rd_vnodes[0] - rd_vnodes[-1]) ** 2) / rs
-        for idx in range(1, rankcnt):
-            if level == 'mid':
-                self.rd_power[idx] = \
-                        ((rd_vnodes[idx] - vdd) ** 2) / 2 / rtt_nom \
-                        + (rd_vnodes[idx] ** 2) / 2 / rtt_nom \
-                        + ((rd_vnodes[idx] - rd_vnodes[-1]) ** 2) / rs
-            elif level == 'high':
-                self.rd_power[idx] = \
-                        ((rd_vnodes[idx] - vdd) ** 2) / rtt_nom \
-                        + ((rd_vnodes[idx] - rd_vnodes[-1]) ** 2) / rs
-            elif level == 'low':
-                self.rd_power[idx] = \
-                        ((rd_vnodes[idx]) ** 2) / rtt_nom \
-                        + ((rd_vnodes[idx] - rd_vnodes[-1]) ** 2) / rs
-        if level == 'mid':
-            self.rd_power[-1] = \
-                    ((rd_vnodes[-1] - vdd) ** 2) / 2 / rtt_mc \
-                    + (rd_vnodes[-1] ** 2) / 2 / rtt_mc
-        elif level == 'high':
-            self.rd_power[-1] = ((rd_vnodes[-1] - vdd) ** 2) / rtt_mc
-        elif level == 'low':
-            self.rd_power[-1] = ((rd_vnodes[-1]) ** 2) / rtt_mc
-
-        # DRAM write.
-
-        coef = np.zeros((rankcnt + 1, rankcnt + 1))
-        rhs = np.zeros(rankcnt + 1)
-        # Rank 0: rtt_wr, 2x up to VDD and down to GND.
-        # (V0 - VDD)/2rtt_wr + V0/2rtt_wr + (V0 - VMC)/rs = 0
-        coef[0, 0] = 1. / rtt_wr + 1. / rs
-        coef[0, rankcnt] = -1. / rs
-        rhs[0] = vdd_eq / rtt_wr
-        # Other rankcnt: rtt_nom, 2x up to VDD and down to GND.
-        # (Vi - VDD)/2rtt_nom + Vi/2rtt_nom + (Vi - VMC)/rs = 0
-        for idx in range(1, rankcnt):
-            coef[idx, idx] = 1. / rtt_nom + 1. / rs
-            coef[idx, rankcnt] = -1. / rs
-            rhs[idx] = vdd_eq / rtt_nom
-        # MC: rz_mc, to GND.
-        # (VMC - Vdrv)/rz_mc + sum (VMC - Vi)/rs = 0
-        coef[rankcnt, 0:rankcnt] = -1. / rs
-        coef[rankcnt, rankcnt] = 1. / rz_mc + rankcnt * 1. / rs
-        rhs[rankcnt] = v_drv / rz_mc
-
-        wr_vnodes = np.linalg.solve(coef, rhs)
-
-        self.wr_power = np.zeros(rankcnt + 1)
-        if level == 'mid':
-            self.wr_power[0] = \
-                    ((wr_vnodes[0] - vdd) ** 2) / 2 / rtt_wr \
-                    + (wr_vnodes[0] ** 2) / 2 / rtt_wr \
-                    + ((wr_vnodes[0] - wr_vnodes[-1]) ** 2) / rs
-        elif level == 'high':
-            self.wr_power[0] = \
-                    ((wr_vnodes[0] - vdd) ** 2) / rtt_wr \
-                    + ((wr_vnodes[0] - wr_vnodes[-1]) ** 2) / rs
-        elif level == 'low':
-            self.wr_power[0] = \
-                    ((wr_vnodes[0]) ** 2) / rtt_wr \
-                    + ((wr_vnodes[0] - wr_vnodes[-1]) ** 2) / rs
-        for idx in range(1, rankcnt):
-            if level == 'mid':
-                self.wr_power[idx] = \
-                        ((wr_vnodes[idx] - vdd) ** 2) / 2 / rtt_nom \
-                        + (wr_vnodes[idx] ** 2) / 2 / rtt_nom \
-                        + ((wr_vnodes[idx] - wr_vnodes[-1]) ** 2) / rs
-            elif level == 'high':
-                self.wr_power[idx] = \
-                        ((wr_vnodes[idx] - vdd) ** 2) / rtt_nom \
-                        + ((wr_vnodes[idx] - wr_vnodes[-1]) ** 2) / rs
-            elif level == 'low':
-                self.wr_power[idx] = \
-                        ((wr_vnodes[idx]) ** 2) / rtt_nom \
-                        + ((wr_vnodes[idx] - wr_vnodes[-1]) ** 2) / rs
-        self.wr_power[-1] = ((wr_vnodes[-1] - v_drv) ** 2) / rz_mc
+    def _solve(self, solver, dtype=None):
+        ''' Solve the termination network for the read and write power. '''
+        self.rd_power, self.wr_power = _network_power(
+            self.vdd, self.rankcnt, self.resistance, *_LEVELS[self.level],
+            solver=solver)
 
         # Multiply pin count to be a whole chip.
         self.rd_power *= self.rdpincnt
         self.wr_power *= self.wrpincnt
+        if dtype is not None:
+            self.rd_power = self.rd_power.astype(dtype)
+            self.wr_power = self.wr_power.astype(dtype)
 
-    def read_power_total(self):
-        ''' Get DRAM read termination power. '''
-        return self.rd_power.sum()
+    @staticmethod
+    def sweep(vdd, rankcnt, rz_dev, rz_mc, rtt_nom, rtt_wr, rtt_mc, rs,
+              **kwargs):
+        '''
+        Sweep the Cartesian product of the candidate values of each resistance,
+        each given as a scalar or a 1D sequence.
 
-    def write_power_total(self):
-        ''' Get DRAM write termination power. '''
-        return self.wr_power.sum()
+        Return a `TerminationBatch` with one dimension per resistance, in the
+        order of the arguments. Other arguments are the same as `Termination`.
+        '''
+        grids = np.meshgrid(*[np.atleast_1d(val) for val
+                              in (rz_dev, rz_mc, rtt_nom, rtt_wr, rtt_mc, rs)],
+                            indexing='ij', sparse=True)
+        return TerminationBatch(vdd, rankcnt,
+                                TermResistanceTable(validate=False, **dict(
+                                    zip(TermResistance._fields, grids))),
+                                **kwargs)
 
-    def read_power_memctlr(self):
-        ''' Get DRAM read termination power at memory controller. '''
-        return self.rd_power[-1]
 
-    def write_power_memctlr(self):
-        ''' Get DRAM write termination power at memory controller. '''
-        return self.wr_power[-1]
+class TerminationBatch(_TerminationPower):
+    '''
+    Termination scheme for an individual chip, with a batch of resistance
+    values, vdd values, and levels.
+    '''
 
-    def read_power_devices(self):
-        ''' Get DRAM read termination power at DRAM devices. '''
-        return self.rd_power[:self.rankcnt].sum()
+    __slots__ = ('vdd', 'rankcnt', 'resistance', 'rdpincnt', 'wrpincnt',
+                 'level', 'rd_power', 'wr_power')
 
-    def write_power_devices(self):
-        ''' Get DRAM write termination power at DRAM devices. '''
-        return self.wr_power[:self.rankcnt].sum()
+    def __init__(self, vdd, rankcnt, resistance, width=0, level='mid',
+                 with_dqs=True, with_dm=True, with_dbi=False,
+                 solver='structured'):
+        '''
+        `resistance` is a `TermResistance`, a `TermResistanceTable`, or a dict
+        of the same fields. The resistance values, `vdd`, and `level` can be
+        scalars or arrays, and are broadcast together. Other arguments are the
+        same as `Termination`.
+
+        `rd_power` and `wr_power` have the broadcast shape as the leading
+        dimensions, and the ranks and the memory controller on the last
+        dimension. The power accessors return arrays of the broadcast shape,
+        which match those of `Termination` for each element.
+        '''
+        if isinstance(resistance, dict):
+            resistance = TermResistanceTable(validate=False, **resistance)
+        if isinstance(resistance, TermResistanceTable):
+            failures = resistance.violations()
+            if failures:
+                raise ValueError('{}: given resistance {} is invalid.'
+                                 .format(self.__class__.__name__,
+                                         format_failures(failures)))
+        elif not isinstance(resistance, TermResistance):
+            raise TypeError('{}: given resistance has invalid type.'
+                            .format(self.__class__.__name__))
 
-    def read_power_target_rank(self):
-        ''' Get DRAM read termination power at the target rank. '''
-        return self.rd_power[0]
+        vdd = np.asarray(vdd, dtype=float)
+        if np.any(vdd < 0):
+            raise ValueError('{}: given vdd is invalid.'
+                             .format(self.__class__.__name__))
+        if not isinstance(rankcnt, int):
+            raise TypeError('{}: given rankcnt has invalid type.'
+                            .format(self.__class__.__name__))
+        if rankcnt <= 0:
+            raise ValueError('{}: given rankcnt is invalid.'
+                             .format(self.__class__.__name__))
 
-    def write_power_target_rank(self):
-        ''' Get DRAM write termination power at the target rank. '''
-        return self.wr_power[0]
+        self.vdd = vdd
+        self.rankcnt = rankcnt
+        self.resistance = resistance
 
-    def read_power_other_ranks(self):
-        ''' Get DRAM read termination power at other ranks. '''
-        return self.rd_power[1:self.rankcnt].sum() if self.rankcnt > 1 else 0
+        pincnts = _pin_counts(width, with_dqs, with_dm, with_dbi)
+        if pincnts is None:
+            raise ValueError('{}: given width is invalid.'
+                             .format(self.__class__.__name__))
+        self.rdpincnt, self.wrpincnt = pincnts
 
-    def write_power_other_ranks(self):
-        ''' Get DRAM write termination power at other ranks. '''
-        return self.wr_power[1:self.rankcnt].sum() if self.rankcnt > 1 else 0
+        level = np.asarray(level)
+        if not set(level.ravel().tolist()) <= set(_LEVELS):
+            raise ValueError('{}: given level is invalid.'
+                             .format(self.__class__.__name__))
+        self.level = level
+        if solver not in _SOLVERS:
+            raise ValueError('{}: given solver is invalid.'
+                             .format(self.__class__.__name__))
 
+        level_vals = _level_values(level)
+        rd_power, wr_power = _network_power(
+            vdd, rankcnt, resistance, *level_vals, solver=solver)
+
+        # Read and write power may not depend on all inputs, so broadcast to
+        # the full batch shape, and multiply pin count to be a whole chip.
+        shape = np.broadcast(vdd, *(list(resistance) + list(level_vals))) \
+                .shape + (rankcnt + 1,)
+        self.rd_power = np.broadcast_to(rd_power, shape) * self.rdpincnt
+        self.wr_power = np.broadcast_to(wr_power, shape) * self.wrpincnt
+
+    @property
+    def shape(self):
+        ''' Shape of the batch. '''
+        return self.rd_power.shape[:-1]
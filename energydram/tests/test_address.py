@@ -0,0 +1,166 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+import unittest
+
+import numpy as np
+
+import energydram
+
+
+class TestAddressMapping(unittest.TestCase):
+    ''' AddressMapping class unit tests. '''
+
+    def setUp(self):
+        self.mapping = energydram.AddressMapping(
+            row=(16, 14), bank=(13, 3), rank=(30, 1), channel=(6, 1))
+
+    def test_shape(self):
+        ''' Shape. '''
+        self.assertEqual(self.mapping.shape, (2, 2, 8))
+        self.assertEqual(energydram.AddressMapping(row=(10, 4), bank=(6, 2))
+                         .shape, (1, 1, 4))
+
+    def test_decode(self):
+        ''' Decode addresses. '''
+        addr = (123 << 16) | (5 << 13) | (1 << 30) | (1 << 6) | 0x3f
+        channel, rank, bank, row = self.mapping.decode([addr, 0])
+        self.assertListEqual(channel.tolist(), [1, 0])
+        self.assertListEqual(rank.tolist(), [1, 0])
+        self.assertListEqual(bank.tolist(), [5, 0])
+        self.assertListEqual(row.tolist(), [123, 0])
+        self.assertListEqual(self.mapping.bank_index([addr, 0]).tolist(),
+                             [(1 * 2 + 1) * 8 + 5, 0])
+
+    def test_invalid(self):
+        ''' Invalid fields. '''
+        with self.assertRaisesRegexp(ValueError,
+                                     'AddressMapping: .*overlap.*'):
+            energydram.AddressMapping(row=(16, 14), bank=(15, 3))
+        with self.assertRaisesRegexp(ValueError, 'AddressMapping: .*row.*'):
+            energydram.AddressMapping(row=(60, 14), bank=(13, 3))
+        with self.assertRaisesRegexp(TypeError, 'AddressMapping: .*rank.*'):
+            energydram.AddressMapping(row=(16, 14), bank=(13, 3), rank=1)
+        with self.assertRaisesRegexp(ValueError, 'AddressMapping: .*col.*'):
+            self.mapping.field('col', [0])
+
+
+class TestRowBufferCounter(unittest.TestCase):
+    ''' RowBufferCounter class and count_accesses unit tests. '''
+
+    def setUp(self):
+        self.mapping = energydram.AddressMapping(row=(8, 2), bank=(6, 2),
+                                                 rank=(10, 1))
+        rng = np.random.RandomState(0)
+        self.addresses = rng.randint(0, 1 << 11, size=2000)
+        self.is_write = rng.rand(2000) < 0.3
+
+    def _reference(self):
+        ''' Per-access reference of the open page policy. '''
+        hits = np.zeros(self.mapping.shape, dtype=int)
+        misses = np.zeros(self.mapping.shape, dtype=int)
+        open_rows = {}
+        for addr in self.addresses.tolist():
+            idx = (0, addr >> 10 & 1, addr >> 6 & 3)
+            row = addr >> 8 & 3
+            if open_rows.get(idx) == row:
+                hits[idx] += 1
+            else:
+                misses[idx] += 1
+            open_rows[idx] = row
+        return hits, misses
+
+    def test_open(self):
+        ''' Open page policy. '''
+        hits, misses = self._reference()
+        counter = energydram.RowBufferCounter(self.mapping)
+        counter.update(self.addresses, self.is_write)
+        np.testing.assert_array_equal(counter.hits, hits)
+        np.testing.assert_array_equal(counter.misses, misses)
+        self.assertEqual(counter.writes.sum(), self.is_write.sum())
+        self.assertEqual(counter.reads.sum() + counter.writes.sum(),
+                         len(self.addresses))
+
+    def test_open_chunks(self):
+        ''' Open rows are kept across chunks. '''
+        hits, _ = self._reference()
+        counter = energydram.count_accesses(self.mapping, self.addresses,
+                                            self.is_write, chunksize=77)
+        np.testing.assert_array_equal(counter.hits, hits)
+
+    def test_shapes(self):
+        ''' Multi-dimensional and broadcast is_write. '''
+        counter = energydram.count_accesses(self.mapping, self.addresses,
+                                            self.is_write)
+        counter2d = energydram.count_accesses(
+            self.mapping, self.addresses.reshape(40, 50),
+            self.is_write.reshape(40, 50), chunksize=77)
+        np.testing.assert_array_equal(counter2d.hits, counter.hits)
+        np.testing.assert_array_equal(counter2d.writes, counter.writes)
+        counter = energydram.count_accesses(self.mapping, self.addresses,
+                                            [True], chunksize=77)
+        self.assertEqual(counter.writes.sum(), len(self.addresses))
+        with self.assertRaisesRegexp(ValueError,
+                                     'count_accesses: .*is_write.*'):
+            energydram.count_accesses(self.mapping, self.addresses,
+                                      [True, False])
+        counter = energydram.RowBufferCounter(self.mapping).update(
+            self.addresses.reshape(40, 50), self.is_write.reshape(40, 50))
+        np.testing.assert_array_equal(counter.writes, counter2d.writes)
+        with self.assertRaisesRegexp(ValueError,
+                                     'RowBufferCounter: .*is_write.*'):
+            energydram.RowBufferCounter(self.mapping).update(
+                self.addresses, [True, False])
+
+    def test_closed(self):
+        ''' Closed page policy. '''
+        counter = energydram.count_accesses(self.mapping, self.addresses,
+                                            policy='closed')
+        self.assertEqual(counter.hits.sum(), 0)
+        self.assertEqual(counter.misses.sum(), len(self.addresses))
+        self.assertEqual(counter.writes.sum(), 0)
+
+    def test_counters(self):
+        ''' Counters of each rank. '''
+        counter = energydram.count_accesses(self.mapping, self.addresses,
+                                            self.is_write)
+        counters = counter.counters()
+        self.assertEqual(counters.shape, (1, 2, len(energydram.COUNTERS)))
+        idx_act = energydram.COUNTERS.index('num_act')
+        idx_rd = energydram.COUNTERS.index('num_rd')
+        idx_wr = energydram.COUNTERS.index('num_wr')
+        np.testing.assert_array_equal(counters[..., idx_act],
+                                      counter.misses.sum(axis=-1))
+        np.testing.assert_array_equal(counters[..., idx_rd],
+                                      counter.reads.sum(axis=-1))
+        np.testing.assert_array_equal(counters[..., idx_wr],
+                                      counter.writes.sum(axis=-1))
+        self.assertEqual(counters[..., idx_wr].sum(), self.is_write.sum())
+
+    def test_sequential(self):
+        ''' Sequential accesses within a row hit. '''
+        counter = energydram.count_accesses(self.mapping, np.arange(64))
+        self.assertEqual(counter.misses.sum(), 1)
+        self.assertEqual(counter.hits.sum(), 63)
+
+    def test_invalid(self):
+        ''' Invalid arguments. '''
+        with self.assertRaisesRegexp(ValueError, 'RowBufferCounter: .*'):
+            energydram.RowBufferCounter(self.mapping, policy='adaptive')
+        with self.assertRaisesRegexp(TypeError, 'RowBufferCounter: .*'):
+            energydram.RowBufferCounter(None)
+        with self.assertRaisesRegexp(ValueError, 'count_accesses: .*'):
+            energydram.count_accesses(self.mapping, [0], chunksize=0)
@@ -0,0 +1,129 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+import unittest
+
+import numpy as np
+
+import energydram
+
+
+class TestBandwidth(unittest.TestCase):
+    '''
+    access_power and max_access_rate unit tests.
+
+    Based on DDR4 with VPP domain, 2 channels of 2 dual-rank DIMMs.
+    '''
+
+    tck = 1000./1200
+    timing = energydram.Timing(RRD=5, RAS=39, RP=17, RFC=420, REFI=9360)
+    idds = energydram.IDDs(idd0=58, idd2p=25, idd2n=34, idd3p=30,
+                           idd3n=44, idd4r=140, idd4w=130, idd5=250)
+    ipps = energydram.IDDs(idd0=4, idd2p=3, idd2n=3, idd3p=3,
+                           idd3n=3, idd4r=3, idd4w=3, idd5=20)
+    resistance = energydram.TermResistance(rz_dev=34, rz_mc=34, rtt_nom=60,
+                                           rtt_wr=120, rtt_mc=60, rs=10)
+
+    def setUp(self):
+        self.eddr4 = energydram.EnergyDDR(self.tck, self.timing, 1.2,
+                                          self.idds, 8, ddr=4,
+                                          vpp=2.5, ipps=self.ipps)
+        self.term = energydram.Termination(1.2, 4, self.resistance, width=8,
+                                           level='high')
+        self.system = energydram.MemorySystem(self.eddr4, self.term,
+                                              chancnt=2, dimmcnt=2, rankcnt=2)
+
+    def test_access_power(self):
+        ''' Power matches the energy of the equivalent counters. '''
+        cycles = 93600
+        rate = 0.1
+        accesses = rate * cycles * self.tck
+        counters = energydram.CompiledEnergy.stack_counters(
+            cycles_bankpre_ckelo=0.2 * 0.3 * cycles,
+            cycles_bankpre_ckehi=0.8 * 0.3 * cycles,
+            cycles_bankact_ckelo=0.2 * 0.7 * cycles,
+            cycles_bankact_ckehi=0.8 * 0.7 * cycles,
+            num_act=0.4 * accesses, num_rd=0.6 * accesses,
+            num_wr=0.4 * accesses, num_ref=cycles / self.timing.REFI)
+        energy = self.eddr4.compile().energy(counters)
+        self.assertAlmostEqual(
+            energydram.access_power(self.eddr4, rate, rd_ratio=0.6,
+                                    hit_rate=0.6, pdn_ratio=0.2,
+                                    open_ratio=0.7),
+            energy / (cycles * self.tck))
+
+    def test_max_access_rate(self):
+        ''' Power at the maximum rate matches the budget. '''
+        static = energydram.access_power(self.eddr4, 0., hit_rate=0.5)
+        budgets = static + np.array([10., 100., 200.])
+        rates = energydram.max_access_rate(self.eddr4, budgets, hit_rate=0.5)
+        self.assertEqual(rates.shape, (3,))
+        np.testing.assert_allclose(
+            energydram.access_power(self.eddr4, rates, hit_rate=0.5),
+            budgets)
+        self.assertTrue(np.all(np.diff(rates) > 0))
+
+    def test_max_access_rate_clip(self):
+        ''' Clipped to the data bus bandwidth and to 0. '''
+        rates = energydram.max_access_rate(self.eddr4, [0., 1e6])
+        self.assertEqual(rates[0], 0.)
+        self.assertAlmostEqual(rates[1], 1. / (4 * self.tck))
+
+    def test_max_access_rate_configs(self):
+        ''' Broadcast over the workload configurations. '''
+        rates = energydram.max_access_rate(
+            self.eddr4, np.array([[500.], [1000.]]),
+            hit_rate=np.array([0., 0.5, 0.9]), pdn_ratio=0.5)
+        self.assertEqual(rates.shape, (2, 3))
+        self.assertTrue(np.all(np.diff(rates, axis=1) > 0))
+        self.assertAlmostEqual(rates[1, 1], energydram.max_access_rate(
+            self.eddr4, 1000., hit_rate=0.5, pdn_ratio=0.5))
+
+    def test_memory_system(self):
+        ''' Memory system with termination. '''
+        static = energydram.access_power(self.eddr4, 0.)
+        self.assertAlmostEqual(energydram.access_power(self.system, 0.),
+                               8 * static)
+        rate = energydram.max_access_rate(self.system, 8 * static + 100.)
+        core_rate = energydram.max_access_rate(self.eddr4, static + 100.)
+        # Termination adds to the energy per access.
+        self.assertLess(rate, core_rate)
+        self.assertAlmostEqual(
+            energydram.access_power(self.system, rate), 8 * static + 100.)
+        self.assertAlmostEqual(
+            energydram.max_access_rate(self.system, 1e6),
+            2. / (4 * self.tck))
+
+    def test_invalid_ratio(self):
+        ''' Invalid ratios. '''
+        with self.assertRaisesRegexp(ValueError,
+                                     'max_access_rate: .*hit_rate.*'):
+            energydram.max_access_rate(self.eddr4, 100., hit_rate=1.5)
+        with self.assertRaisesRegexp(ValueError,
+                                     'access_power: .*rd_ratio.*'):
+            energydram.access_power(self.eddr4, 0.1, rd_ratio=[0.5, -1])
+        with self.assertRaisesRegexp(ValueError,
+                                     'max_access_rate: .*hit_rate.*'):
+            energydram.max_access_rate(self.eddr4, 100., hit_rate=np.nan)
+
+    def test_list_ratios(self):
+        ''' Ratios given as lists. '''
+        rates = energydram.max_access_rate(self.eddr4, 500.,
+                                           hit_rate=[0., 0.5],
+                                           pdn_ratio=[0, .5])
+        self.assertEqual(rates.shape, (2,))
+        self.assertAlmostEqual(rates[1], energydram.max_access_rate(
+            self.eddr4, 500., hit_rate=0.5, pdn_ratio=0.5))
@@ -0,0 +1,101 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+import unittest
+
+import numpy as np
+
+import energydram
+
+
+class TestLRUCache(unittest.TestCase):
+    ''' LRUCache class unit tests. '''
+
+    resistance = energydram.TermResistance(rz_dev=34, rz_mc=34, rtt_nom=40,
+                                           rtt_wr=30, rtt_mc=60, rs=15)
+    timing = energydram.Timing(RRD=6, RAS=35, RP=47.5-35, RFC=160, REFI=7800)
+    idds = energydram.IDDs(idd0=95, idd2p=35, idd2n=42, idd3p=40,
+                           idd3n=45, idd4r=180, idd4w=185, idd5=215)
+
+    def test_init_invalid_maxsize(self):
+        ''' Initialize with invalid maxsize. '''
+        with self.assertRaisesRegexp(TypeError, 'LRUCache: .*maxsize.*'):
+            energydram.LRUCache(maxsize=1.5)
+        with self.assertRaisesRegexp(ValueError, 'LRUCache: .*maxsize.*'):
+            energydram.LRUCache(maxsize=0)
+
+    def test_construct(self):
+        ''' Construct models. '''
+        cache = energydram.LRUCache()
+        term = cache.construct(energydram.Termination, 1.5, 2, self.resistance,
+                               level='mid')
+        self.assertIs(cache.construct(energydram.Termination, 1.5, 2,
+                                      self.resistance, level='mid'), term)
+        self.assertIsNot(cache.construct(energydram.Termination, 1.5, 2,
+                                         self.resistance, level='high'), term)
+        np.testing.assert_array_equal(
+            term.rd_power,
+            energydram.Termination(1.5, 2, self.resistance).rd_power)
+
+        eddr = cache.construct(energydram.EnergyDDR, 1.25, self.timing, 1.5,
+                               self.idds, 8)
+        self.assertIs(cache.construct(energydram.EnergyDDR, 1.25, self.timing,
+                                      1.5, self.idds, 8), eddr)
+
+        self.assertEqual(cache.info(), energydram.CacheInfo(
+            hits=2, misses=3, maxsize=128, currsize=3))
+
+    def test_construct_types(self):
+        ''' Arguments of different types are not shared. '''
+        cache = energydram.LRUCache()
+        named = cache.construct(list, self.resistance)
+        plain = cache.construct(list, tuple(self.resistance))
+        self.assertIsNot(named, plain)
+        self.assertIs(cache.construct(list, self.resistance), named)
+        self.assertIsNot(cache.construct(dict, key=1),
+                         cache.construct(dict, key=1.))
+        self.assertEqual(cache.info().misses, 4)
+
+    def test_construct_error(self):
+        ''' Construction errors are not cached. '''
+        cache = energydram.LRUCache()
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                cache.construct(energydram.Termination, -1., 2,
+                                self.resistance)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.info().misses, 2)
+
+    def test_evict(self):
+        ''' Evict least recently used. '''
+        cache = energydram.LRUCache(maxsize=2)
+        cache.get('a', lambda: 1)
+        cache.get('b', lambda: 2)
+        self.assertEqual(cache.get('a', lambda: 3), 1)
+        cache.get('c', lambda: 4)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_clear(self):
+        ''' Clear cache. '''
+        cache = energydram.LRUCache()
+        cache.get('a', lambda: 1)
+        cache.get('a', lambda: 1)
+        cache.clear()
+        self.assertEqual(cache.info(), energydram.CacheInfo(
+            hits=0, misses=0, maxsize=128, currsize=0))
@@ -0,0 +1,149 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+import unittest
+
+import numpy as np
+
+import energydram
+
+
+class TestCompiledEnergy(unittest.TestCase):
+    '''
+    CompiledEnergy class unit tests.
+
+    Based on DDR4 with VPP domain.
+    '''
+
+    tck = 1000./1200
+    timing = energydram.Timing(RRD=5, RAS=39, RP=17, RFC=420, REFI=9360)
+    idds = energydram.IDDs(idd0=58, idd2p=25, idd2n=34, idd3p=30,
+                           idd3n=44, idd4r=140, idd4w=130, idd5=250)
+    ipps = energydram.IDDs(idd0=4, idd2p=3, idd2n=3, idd3p=3,
+                           idd3n=3, idd4r=3, idd4w=3, idd5=20)
+
+    def setUp(self):
+        self.eddr4 = energydram.EnergyDDR(self.tck, self.timing, 1.2,
+                                          self.idds, 8, ddr=4,
+                                          vpp=2.5, ipps=self.ipps)
+        self.compiled = self.eddr4.compile()
+
+    def _reference(self, cnts):
+        return (self.eddr4.background_energy(*cnts[:4])
+                + self.eddr4.activate_energy(cnts[4])
+                + self.eddr4.readwrite_energy(cnts[5], cnts[6])
+                + self.eddr4.refresh_energy(cnts[7]))
+
+    def test_coef(self):
+        ''' Coefficients. '''
+        self.assertEqual(self.compiled.coef_matrix.shape,
+                         (2, len(energydram.COUNTERS)))
+        np.testing.assert_allclose(self.compiled.coef,
+                                   self.compiled.coef_matrix.sum(axis=0))
+        self.assertAlmostEqual(self.compiled.coef[4],
+                               self.eddr4.activate_energy(1))
+
+    def test_energy(self):
+        ''' Total energy. '''
+        cnts = [100, 2000, 300, 4000, 50, 60, 70, 2]
+        self.assertAlmostEqual(self.compiled.energy(cnts),
+                               self._reference(cnts))
+
+        rng = np.random.RandomState(0)
+        cnts = rng.randint(0, 10000, size=(5, 3, 8))
+        energy = self.compiled.energy(cnts)
+        self.assertEqual(energy.shape, (5, 3))
+        np.testing.assert_allclose(energy[3, 1], self._reference(cnts[3, 1]))
+
+    def test_domain_energy(self):
+        ''' Per-domain energy. '''
+        cnts = np.array([[100, 2000, 300, 4000, 50, 60, 70, 2],
+                         [0, 0, 0, 0, 1, 0, 0, 0]])
+        energy = self.compiled.domain_energy(cnts)
+        self.assertEqual(energy.shape, (2, 2))
+        np.testing.assert_allclose(energy.sum(axis=-1),
+                                   self.compiled.energy(cnts))
+        self.assertAlmostEqual(
+            energy[1, 1],
+            self.eddr4.vpp_domain.activate_energy(self.timing, 1))
+
+    def test_lpddr(self):
+        ''' Compile LPDDR. '''
+        idds1 = energydram.IDDs(idd0=8, idd2p=0.8, idd2n=0.8, idd3p=1.4,
+                                idd3n=2.0, idd4r=2, idd4w=2, idd5=28)
+        idds2 = energydram.IDDs(idd0=60, idd2p=1.8, idd2n=26, idd3p=11,
+                                idd3n=34, idd4r=230, idd4w=240, idd5=150)
+        iddsin = energydram.IDDs(idd0=6, idd2p=0.2, idd2n=6, idd3p=0.2,
+                                 idd3n=6, idd4r=6, idd4w=6, idd5=6)
+        elpddr3 = energydram.EnergyLPDDR(self.tck, self.timing, 1.8, idds1,
+                                         1.2, idds2, 1.2, iddsin, 1)
+        compiled = elpddr3.compile()
+        self.assertEqual(compiled.coef_matrix.shape[0], 3)
+        self.assertAlmostEqual(compiled.energy([0, 0, 0, 0, 0, 3, 4, 0]),
+                               elpddr3.readwrite_energy(3, 4))
+
+    def test_stack_counters(self):
+        ''' Stack named counters. '''
+        cnts = energydram.CompiledEnergy.stack_counters(
+            num_rd=np.arange(4), cycles_bankact_ckehi=10)
+        self.assertEqual(cnts.shape, (4, 8))
+        np.testing.assert_array_equal(cnts[:, 5], np.arange(4))
+        np.testing.assert_array_equal(cnts[:, 3], 10)
+        np.testing.assert_array_equal(cnts[:, 0], 0)
+
+    def test_stack_counters_invalid(self):
+        ''' Stack invalid counter name. '''
+        with self.assertRaisesRegexp(ValueError,
+                                     'CompiledEnergy: .*num_pre.*'):
+            energydram.CompiledEnergy.stack_counters(num_pre=1)
+
+    def test_invalid_counters(self):
+        ''' Evaluate with invalid counter shape. '''
+        with self.assertRaisesRegexp(ValueError, 'CompiledEnergy: .*shape.*'):
+            self.compiled.energy(np.zeros((4, 7)))
+
+    def test_tck_array(self):
+        ''' Compile with array tck. '''
+        tcks = np.array([1000./1200, 1000./1066, 1000./933])
+        timing = energydram.Timing(RRD=5, RAS=np.array([39, 35, 31]),
+                                   RP=np.array([17, 15, 13]),
+                                   RFC=np.array([420, 374, 327]), REFI=9360)
+        eddr4 = energydram.EnergyDDR(tcks, timing, 1.2, self.idds, 8, ddr=4,
+                                     vpp=2.5, ipps=self.ipps)
+        compiled = eddr4.compile()
+        self.assertEqual(compiled.coef_matrix.shape, (3, 2, 8))
+        self.assertEqual(compiled.coef.shape, (3, 8))
+
+        rng = np.random.RandomState(0)
+        cnts = rng.randint(0, 10000, size=(5, 8))
+        energy = compiled.energy(cnts)
+        self.assertEqual(energy.shape, (3, 5))
+        domain = compiled.domain_energy(cnts)
+        self.assertEqual(domain.shape, (3, 5, 2))
+        np.testing.assert_allclose(domain.sum(axis=-1), energy)
+
+        eddr4_1 = energydram.EnergyDDR(
+            tcks[1], energydram.Timing(RRD=5, RAS=35, RP=15, RFC=374,
+                                       REFI=9360),
+            1.2, self.idds, 8, ddr=4, vpp=2.5, ipps=self.ipps)
+        np.testing.assert_allclose(energy[1], eddr4_1.compile().energy(cnts))
+        # Same as the energy methods.
+        np.testing.assert_allclose(
+            energy[:, 2],
+            eddr4.background_energy(*cnts[2, :4])
+            + eddr4.activate_energy(cnts[2, 4])
+            + eddr4.readwrite_energy(cnts[2, 5], cnts[2, 6])
+            + eddr4.refresh_energy(cnts[2, 7]))
@@ -0,0 +1,102 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+import energydram
+
+
+class TestCounterLog(unittest.TestCase):
+    ''' Binary counter log unit tests. '''
+
+    tck = 1000./1200
+    timing = energydram.Timing(RRD=5, RAS=39, RP=17, RFC=420, REFI=9360)
+    idds = energydram.IDDs(idd0=58, idd2p=25, idd2n=34, idd3p=30,
+                           idd3n=44, idd4r=140, idd4w=130, idd5=250)
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'counters.bin')
+        rng = np.random.RandomState(0)
+        self.counters = {name: rng.randint(0, 1000, size=20)
+                         for name in energydram.COUNTERS}
+        self.header = {'tck': self.tck, 'vdd': 1.2, 'chipcnt': 8}
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def _write(self):
+        with energydram.CounterLogWriter(self.path, self.header) as writer:
+            writer.append({name: val[:5]
+                           for name, val in self.counters.items()})
+            writer.append(**{name: val[5:]
+                             for name, val in self.counters.items()})
+
+    def test_roundtrip(self):
+        ''' Write and read back. '''
+        self._write()
+        log = energydram.CounterLog(self.path)
+        self.assertEqual(log.header, self.header)
+        self.assertEqual(len(log), 20)
+        self.assertIsInstance(log.records, np.memmap)
+        for name in energydram.COUNTERS:
+            np.testing.assert_array_equal(log[name], self.counters[name])
+        np.testing.assert_array_equal(
+            log.matrix[:, 5], self.counters[energydram.COUNTERS[5]])
+        # Zero-copy views.
+        self.assertTrue(np.shares_memory(log.matrix, log.records))
+
+    def test_append(self):
+        ''' Append to existing log, with a partial record. '''
+        self._write()
+        with open(self.path, 'ab') as fh:
+            fh.write(b'\0' * 10)
+        self.assertEqual(len(energydram.CounterLog(self.path)), 20)
+        with energydram.CounterLogWriter(self.path, append=True) as writer:
+            self.assertEqual(writer.header, self.header)
+            writer.append(num_rd=[1, 2], cycles_bankpre_ckehi=100)
+        log = energydram.CounterLog(self.path)
+        self.assertEqual(len(log), 22)
+        np.testing.assert_array_equal(log['num_rd'][-2:], [1, 2])
+        np.testing.assert_array_equal(log['cycles_bankpre_ckehi'][-2:], 100)
+        np.testing.assert_array_equal(log['num_wr'][-2:], 0)
+
+    def test_energy(self):
+        ''' Evaluate energy over the log. '''
+        self._write()
+        model = energydram.EnergyDDR(self.tck, self.timing, 1.5, self.idds, 8)
+        log = energydram.CounterLog(self.path)
+        energy = model.compile().energy(np.stack(
+            [self.counters[name] for name in energydram.COUNTERS], axis=-1))
+        np.testing.assert_allclose(log.energy(model), energy)
+        np.testing.assert_allclose(log.energy(model, chunksize=3), energy)
+
+    def test_invalid(self):
+        ''' Invalid log. '''
+        with energydram.CounterLogWriter(self.path) as writer:
+            with self.assertRaisesRegexp(ValueError,
+                                         'CounterLogWriter: .*num_pre.*'):
+                writer.append(num_pre=1)
+        self.assertEqual(len(energydram.CounterLog(self.path)), 0)
+        with open(self.path, 'wb') as fh:
+            fh.write(b'not a counter log file')
+        with self.assertRaisesRegexp(ValueError, 'invalid file format'):
+            energydram.CounterLog(self.path)
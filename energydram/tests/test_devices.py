@@ -0,0 +1,110 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+import energydram
+
+
+class TestDeviceDatabase(unittest.TestCase):
+    ''' DeviceDatabase class unit tests. '''
+
+    def test_get(self):
+        ''' Look up device. '''
+        dev = energydram.DEVICES.get('DDR3', 2, 8, 1600)
+        self.assertIsInstance(dev, energydram.Device)
+        self.assertEqual(dev.tck, 1.25)
+        self.assertEqual(dev.domains[0][0], 1.5)
+        self.assertEqual(dev.domains[0][1].idd0, 95)
+        self.assertEqual(dev.timing_ns.RFC, 160)
+        self.assertIn(('LPDDR3', 8, 32, 1600), energydram.DEVICES)
+        with self.assertRaisesRegexp(KeyError, 'DeviceDatabase: .*'):
+            energydram.DEVICES.get('DDR3', 4, 8, 1600)
+
+    def test_lazy(self):
+        ''' Load on first access. '''
+        database = energydram.DeviceDatabase()
+        # pylint: disable=protected-access
+        self.assertIsNone(database._index)
+        self.assertEqual(len(database), len(database.keys()))
+        self.assertIsNotNone(database._index)
+
+    def test_model(self):
+        ''' Build models. '''
+        eddr3 = energydram.DEVICES.model('DDR3', 2, 8, 1600, chipcnt=8)
+        self.assertIsInstance(eddr3, energydram.EnergyDDR)
+        self.assertEqual(eddr3.type, 'DDR3')
+        self.assertEqual(eddr3.vdd_domain.chipcnt, 8)
+        self.assertEqual(eddr3.timing.RP, 10)
+
+        eddr4 = energydram.DEVICES.model('DDR4', 8, 8, 2400)
+        self.assertEqual(len(eddr4.vdoms), 2)
+        self.assertEqual(eddr4.timing.RP, 17)
+        self.assertEqual(eddr4.timing.RAS, 39)
+
+        elpddr3 = energydram.DEVICES.model('LPDDR3', 8, 32, 1600, tck=1.5)
+        self.assertIsInstance(elpddr3, energydram.EnergyLPDDR)
+        self.assertEqual(len(elpddr3.vdoms), 3)
+        self.assertEqual(elpddr3.vdd2_domain.tck, 1.5)
+        self.assertEqual(elpddr3.timing.RFC, 140)
+
+    def test_standards(self):
+        ''' Standards with suffixes, and invalid standards. '''
+        with open(energydram.DEVICES.path, 'r') as fh:
+            data = json.load(fh)
+        entry = [dev for dev in data['devices']
+                 if dev['standard'] == 'DDR3'][0]
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, 'devices.json')
+            with open(path, 'w') as fh:
+                json.dump({'devices': [dict(entry, standard='DDR3L')]}, fh)
+            database = energydram.DeviceDatabase(path)
+            key = ('DDR3L', entry['density'], entry['width'], entry['speed'])
+            self.assertEqual(database.model(*key).type, 'DDR3')
+
+            # LPDDR4X is not modeled.
+            for standard in ['DDR3X', 'LPDDR4X']:
+                with open(path, 'w') as fh:
+                    json.dump({'devices': [dict(entry, standard=standard)]},
+                              fh)
+                with self.assertRaisesRegexp(
+                        ValueError, 'DeviceDatabase: .*{}.*'.format(standard)):
+                    energydram.DeviceDatabase(path).keys()
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_as_arrays(self):
+        ''' Get devices as arrays. '''
+        arrays = energydram.DEVICES.as_arrays()
+        cnt = len(energydram.DEVICES)
+        self.assertEqual(len(arrays['key']), cnt)
+        self.assertEqual(arrays['tck'].shape, (cnt,))
+        self.assertEqual(arrays['idd0'].shape, (cnt, 3))
+        self.assertEqual(arrays['RFC'].shape, (cnt,))
+        idx = arrays['key'].index(('DDR3', 2, 8, 1600))
+        self.assertEqual(arrays['idd4w'][idx, 0], 185)
+        self.assertTrue(np.isnan(arrays['vdd'][idx, 1:]).all())
+
+        arrays = energydram.DEVICES.as_arrays(standard='DDR4')
+        self.assertEqual(arrays['key'], [('DDR4', 8, 8, 2400)])
+        self.assertEqual(arrays['vdd'].shape, (1, 2))
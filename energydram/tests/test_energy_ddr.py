@@ -16,6 +16,8 @@ program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
 
 import unittest
 
+import numpy as np
+
 import energydram
 
 
@@ -49,6 +51,7 @@ class TestEnergyDDR(unittest.TestCase):
             self.assertEqual(vdom.chipcnt, self.chipcnt, 'chipcnt')
             self.assertEqual(vdom.burstcycles, 4, 'burstcycles')
         self.assertIn('DDR3', eddr3.type, 'type')
+        self.assertFalse(hasattr(eddr3, '__dict__'))
 
     def test_init_ddr2(self):
         ''' Initialization for DDR2. '''
@@ -165,3 +168,24 @@ class TestEnergyDDR(unittest.TestCase):
         pds_ref = eref / self.timing.REFI / self.tck
         self.assertAlmostEqual(pds_ref, 5.2, delta=0.1)
 
+    def test_energy_array(self):
+        ''' Calculate energy with array counters. '''
+        eddr3 = energydram.EnergyDDR(self.tck, self.timing, self.vdd,
+                                     self.idds, self.chipcnt)
+
+        nums = np.array([0, 1, 7, 1000])
+        ebg = eddr3.background_energy(nums, nums, 2 * nums, 3)
+        eact = eddr3.activate_energy(nums)
+        erw = eddr3.readwrite_energy(num_rd=nums, num_wr=nums[::-1])
+        eref = eddr3.refresh_energy(nums)
+        for earr in [ebg, eact, erw, eref]:
+            self.assertEqual(earr.shape, (4,))
+        for idx, num in enumerate(nums):
+            self.assertAlmostEqual(ebg[idx],
+                                   eddr3.background_energy(num, num,
+                                                           2 * num, 3))
+            self.assertAlmostEqual(eact[idx], eddr3.activate_energy(num))
+            self.assertAlmostEqual(erw[idx],
+                                   eddr3.readwrite_energy(
+                                       num_rd=num, num_wr=nums[::-1][idx]))
+            self.assertAlmostEqual(eref[idx], eddr3.refresh_energy(num))
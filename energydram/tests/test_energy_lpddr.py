@@ -16,6 +16,8 @@ program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
 
 import unittest
 
+import numpy as np
+
 import energydram
 
 
@@ -48,8 +50,8 @@ class TestEnergyDDR(unittest.TestCase):
         ''' Initialization. '''
         elpddr3 = energydram.EnergyLPDDR(self.tck, self.timing, self.vdd1,
                                          self.idds1, self.vdd2, self.idds2,
-                                         self.vddcaq, self.iddsin, self.chipcnt,
-                                         ddr=3)
+                                         self.vddcaq, self.iddsin,
+                                         self.chipcnt, ddr=3)
         self.assertEqual(elpddr3.timing, self.timing, 'timing')
         self.assertEqual(elpddr3.vdd1_domain.vdd, self.vdd1, 'vdd1')
         self.assertEqual(elpddr3.vdd2_domain.vdd, self.vdd2, 'vdd2')
@@ -61,6 +63,7 @@ class TestEnergyDDR(unittest.TestCase):
             self.assertEqual(vdom.tck, self.tck, 'tck')
             self.assertEqual(vdom.chipcnt, self.chipcnt, 'chipcnt')
             self.assertEqual(vdom.burstcycles, 4, 'burstcycles')
+        self.assertFalse(hasattr(elpddr3, '__dict__'))
         self.assertIn('LPDDR3', elpddr3.type, 'type')
 
     def test_init_lpddr2(self):
@@ -152,8 +155,8 @@ class TestEnergyDDR(unittest.TestCase):
         ''' Calculate background energy. '''
         elpddr3 = energydram.EnergyLPDDR(self.tck, self.timing, self.vdd1,
                                          self.idds1, self.vdd2, self.idds2,
-                                         self.vddcaq, self.iddsin, self.chipcnt,
-                                         ddr=3)
+                                         self.vddcaq, self.iddsin,
+                                         self.chipcnt, ddr=3)
 
         pds_pre_lo = elpddr3.background_energy(1, 0, 0, 0) / self.tck
         self.assertIsInstance(pds_pre_lo, float)
@@ -171,8 +174,8 @@ class TestEnergyDDR(unittest.TestCase):
         ''' Calculate activate energy. '''
         elpddr3 = energydram.EnergyLPDDR(self.tck, self.timing, self.vdd1,
                                          self.idds1, self.vdd2, self.idds2,
-                                         self.vddcaq, self.iddsin, self.chipcnt,
-                                         ddr=3)
+                                         self.vddcaq, self.iddsin,
+                                         self.chipcnt, ddr=3)
 
         eact = elpddr3.activate_energy(1)
         pds_act = eact / (self.timing.RAS + self.timing.RP) / self.tck
@@ -182,8 +185,8 @@ class TestEnergyDDR(unittest.TestCase):
         ''' Calculate read/write energy. '''
         elpddr3 = energydram.EnergyLPDDR(self.tck, self.timing, self.vdd1,
                                          self.idds1, self.vdd2, self.idds2,
-                                         self.vddcaq, self.iddsin, self.chipcnt,
-                                         ddr=3)
+                                         self.vddcaq, self.iddsin,
+                                         self.chipcnt, ddr=3)
 
         erd = elpddr3.readwrite_energy(num_rd=1, num_wr=0)
         pds_rd = erd / 4 / self.tck
@@ -197,10 +200,33 @@ class TestEnergyDDR(unittest.TestCase):
         ''' Calculate activate energy. '''
         elpddr3 = energydram.EnergyLPDDR(self.tck, self.timing, self.vdd1,
                                          self.idds1, self.vdd2, self.idds2,
-                                         self.vddcaq, self.iddsin, self.chipcnt,
-                                         ddr=3)
+                                         self.vddcaq, self.iddsin,
+                                         self.chipcnt, ddr=3)
 
         eref = elpddr3.refresh_energy(1)
         pds_ref = eref / self.timing.REFI / self.tck
         self.assertIsInstance(pds_ref, float)
 
+    def test_energy_array(self):
+        ''' Calculate energy with array counters. '''
+        elpddr3 = energydram.EnergyLPDDR(self.tck, self.timing, self.vdd1,
+                                         self.idds1, self.vdd2, self.idds2,
+                                         self.vddcaq, self.iddsin,
+                                         self.chipcnt, ddr=3)
+
+        nums = np.array([0, 1, 7, 1000])
+        ebg = elpddr3.background_energy(nums, nums, 2 * nums, 3)
+        eact = elpddr3.activate_energy(nums)
+        erw = elpddr3.readwrite_energy(num_rd=nums, num_wr=nums[::-1])
+        eref = elpddr3.refresh_energy(nums)
+        for earr in [ebg, eact, erw, eref]:
+            self.assertEqual(earr.shape, (4,))
+        for idx, num in enumerate(nums):
+            self.assertAlmostEqual(ebg[idx],
+                                   elpddr3.background_energy(num, num,
+                                                             2 * num, 3))
+            self.assertAlmostEqual(eact[idx], elpddr3.activate_energy(num))
+            self.assertAlmostEqual(erw[idx],
+                                   elpddr3.readwrite_energy(
+                                       num_rd=num, num_wr=nums[::-1][idx]))
+            self.assertAlmostEqual(eref[idx], elpddr3.refresh_energy(num))
@@ -0,0 +1,96 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+import energydram
+
+
+def _run(code, *options):
+    ''' Run Python code in a fresh interpreter, return stdout and stderr. '''
+    # Run from the directory containing the package.
+    cwd = os.path.dirname(os.path.dirname(os.path.abspath(
+        energydram.__file__)))
+    proc = subprocess.Popen([sys.executable] + list(options) + ['-c', code],
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            universal_newlines=True, cwd=cwd)
+    out, err = proc.communicate()
+    if proc.returncode != 0:
+        raise RuntimeError(err)
+    return out, err
+
+
+@unittest.skipIf(sys.version_info < (3, 7), 'requires module __getattr__')
+class TestImport(unittest.TestCase):
+    ''' Lazy package import unit tests. '''
+
+    def test_no_numpy(self):
+        ''' Core models do not import NumPy. '''
+        out, _ = _run('import sys\n'
+                      'import energydram\n'
+                      'idds = energydram.IDDs(idd0=95, idd2p=35, idd2n=42, '
+                      'idd3p=40, idd3n=45, idd4r=180, idd4w=185, idd5=215)\n'
+                      'timing = energydram.Timing(RRD=6, RAS=35, RP=12, '
+                      'RFC=160, REFI=7800)\n'
+                      'model = energydram.EnergyDDR(1.25, timing, 1.5, idds, '
+                      '8)\n'
+                      'model.readwrite_energy(10, 10)\n'
+                      'print("numpy" in sys.modules)\n'
+                      'energydram.Termination\n'
+                      'print("numpy" in sys.modules)\n')
+        self.assertEqual(out.split(), ['False', 'True'])
+
+    def test_lazy_attrs(self):
+        ''' Lazy attributes. '''
+        # pylint: disable=protected-access
+        for name in energydram._LAZY_ATTRS:
+            self.assertIsNotNone(getattr(energydram, name))
+            self.assertIn(name, dir(energydram))
+        with self.assertRaises(AttributeError):
+            _ = energydram.NoSuchAttr
+        # Exported names must not collide with submodule names.
+        self.assertFalse(set(energydram._LAZY_ATTRS)
+                         & set(energydram._LAZY_MODULES))
+
+    def test_import_light(self):
+        ''' Package import does not load heavy modules. '''
+        out, _ = _run('import sys\n'
+                      'import energydram\n'
+                      'print([mod for mod in ("numpy", "sqlite3", '
+                      '"multiprocessing") if mod in sys.modules])\n')
+        self.assertEqual(out.strip(), '[]')
+
+    def test_star_import(self):
+        ''' Star import gets all exported names. '''
+        out, _ = _run('from energydram import *\n'
+                      'import energydram\n'
+                      'print(all(name in globals() for name in '
+                      'energydram.__all__))\n'
+                      'print(Termination is energydram.Termination)\n')
+        self.assertEqual(out.split(), ['True', 'True'])
+        # pylint: disable=protected-access
+        for name in energydram._LAZY_ATTRS:
+            self.assertIn(name, energydram.__all__)
+
+    def test_submodule_import_order(self):
+        ''' Exported names are not shadowed by submodule imports. '''
+        out, _ = _run('from energydram.series import PowerSeries\n'
+                      'import energydram\n'
+                      'print(callable(energydram.power_series))\n')
+        self.assertEqual(out.split(), ['True'])
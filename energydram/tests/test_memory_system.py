@@ -0,0 +1,105 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+import unittest
+
+import numpy as np
+
+import energydram
+
+
+class TestMemorySystem(unittest.TestCase):
+    '''
+    MemorySystem class unit tests.
+
+    Based on DDR4 with VPP domain, 2 channels of 2 dual-rank DIMMs.
+    '''
+
+    tck = 1000./1200
+    timing = energydram.Timing(RRD=5, RAS=39, RP=17, RFC=420, REFI=9360)
+    idds = energydram.IDDs(idd0=58, idd2p=25, idd2n=34, idd3p=30,
+                           idd3n=44, idd4r=140, idd4w=130, idd5=250)
+    ipps = energydram.IDDs(idd0=4, idd2p=3, idd2n=3, idd3p=3,
+                           idd3n=3, idd4r=3, idd4w=3, idd5=20)
+    resistance = energydram.TermResistance(rz_dev=34, rz_mc=34, rtt_nom=60,
+                                           rtt_wr=120, rtt_mc=60, rs=10)
+
+    def setUp(self):
+        self.eddr4 = energydram.EnergyDDR(self.tck, self.timing, 1.2,
+                                          self.idds, 8, ddr=4,
+                                          vpp=2.5, ipps=self.ipps)
+        self.term = energydram.Termination(1.2, 4, self.resistance, width=8,
+                                           level='high')
+        self.system = energydram.MemorySystem(self.eddr4, self.term,
+                                              chancnt=2, dimmcnt=2, rankcnt=2)
+        rng = np.random.RandomState(0)
+        self.counters = rng.randint(0, 1000,
+                                    size=(2, 4, len(energydram.COUNTERS)))
+
+    def test_coef(self):
+        ''' Coefficients. '''
+        np.testing.assert_allclose(self.system.core_coef,
+                                   self.eddr4.compile().coef)
+        idx_rd = energydram.COUNTERS.index('num_rd')
+        idx_wr = energydram.COUNTERS.index('num_wr')
+        self.assertAlmostEqual(
+            self.system.term_coef[idx_rd],
+            self.term.read_power_total() * 4 * self.tck * 8 * 1e3)
+        self.assertAlmostEqual(
+            self.system.term_coef[idx_wr],
+            self.term.write_power_total() * 4 * self.tck * 8 * 1e3)
+        self.assertEqual(np.count_nonzero(self.system.term_coef), 2)
+
+        system = energydram.MemorySystem(self.eddr4, self.term, dimmcnt=4,
+                                         include_memctlr=False)
+        self.assertLess(system.term_coef[idx_rd],
+                        self.system.term_coef[idx_rd])
+        system = energydram.MemorySystem(self.eddr4, None)
+        np.testing.assert_array_equal(system.term_coef, 0)
+
+    def test_energy(self):
+        ''' Energy. '''
+        rank = self.system.rank_energy(self.counters)
+        self.assertEqual(rank.shape, (2, 4))
+        cnts = self.counters[1, 3]
+        core = self.eddr4.compile().energy(cnts)
+        term = cnts[5] * self.system.term_coef[5] \
+                + cnts[6] * self.system.term_coef[6]
+        self.assertAlmostEqual(rank[1, 3], core + term)
+        np.testing.assert_allclose(self.system.channel_energy(self.counters),
+                                   rank.sum(axis=-1))
+        self.assertAlmostEqual(self.system.total_energy(self.counters),
+                               rank.sum())
+        self.assertAlmostEqual(
+            self.system.termination_energy(self.counters),
+            (self.counters[..., 5].sum() * self.system.term_coef[5]
+             + self.counters[..., 6].sum() * self.system.term_coef[6]))
+
+        # Extra leading dimension.
+        epochs = np.stack([self.counters, 2 * self.counters])
+        np.testing.assert_allclose(self.system.total_energy(epochs),
+                                   [rank.sum(), 2 * rank.sum()])
+
+    def test_invalid(self):
+        ''' Invalid arguments. '''
+        with self.assertRaisesRegexp(ValueError, 'MemorySystem: .*rankcnt.*'):
+            energydram.MemorySystem(self.eddr4, self.term, rankcnt=1)
+        with self.assertRaisesRegexp(ValueError, 'MemorySystem: .*chancnt.*'):
+            energydram.MemorySystem(self.eddr4, None, chancnt=0)
+        with self.assertRaisesRegexp(TypeError, 'MemorySystem: .*'):
+            energydram.MemorySystem(self.eddr4, self.resistance)
+        with self.assertRaisesRegexp(ValueError, 'MemorySystem: .*shape.*'):
+            self.system.rank_energy(self.counters[0])
@@ -0,0 +1,172 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+import unittest
+
+import numpy as np
+
+import energydram
+
+
+class TestOnlineStats(unittest.TestCase):
+    ''' OnlineStats class unit tests. '''
+
+    def setUp(self):
+        self.values = np.random.RandomState(0).normal(10., 2., size=5000)
+
+    def test_moments(self):
+        ''' Mean and variance merged over batches. '''
+        stats = energydram.OnlineStats()
+        for batch in np.array_split(self.values, 7):
+            stats.update(batch)
+        self.assertEqual(stats.count, len(self.values))
+        self.assertAlmostEqual(stats.mean, self.values.mean())
+        self.assertAlmostEqual(stats.var, self.values.var(ddof=1))
+        self.assertEqual(stats.min, self.values.min())
+        self.assertEqual(stats.max, self.values.max())
+
+    def test_percentile_exact(self):
+        ''' Exact percentiles within the reservoir size. '''
+        stats = energydram.OnlineStats(reservoir=len(self.values))
+        stats.update(self.values[:1000]).update(self.values[1000:])
+        np.testing.assert_allclose(stats.percentile([5, 50, 95]),
+                                   np.percentile(self.values, [5, 50, 95]))
+
+    def test_percentile_reservoir(self):
+        ''' Approximate percentiles beyond the reservoir size. '''
+        stats = energydram.OnlineStats(reservoir=1000, seed=1)
+        for batch in np.array_split(self.values, 10):
+            stats.update(batch)
+        self.assertEqual(stats.count, len(self.values))
+        self.assertAlmostEqual(stats.percentile(50), 10., delta=0.3)
+
+    def test_percentile_empty(self):
+        ''' Percentiles without values. '''
+        with self.assertRaisesRegexp(ValueError, 'OnlineStats: .*'):
+            energydram.OnlineStats().percentile(50)
+
+
+class TestMonteCarlo(unittest.TestCase):
+    ''' MonteCarlo class unit tests. '''
+
+    tck = 1.25
+    timing = energydram.Timing(RRD=5, RAS=28, RP=11, RFC=128, REFI=6240)
+    idds = energydram.IDDs(idd0=95, idd2p=35, idd2n=42, idd3p=40,
+                           idd3n=45, idd4r=180, idd4w=185, idd5=215)
+    resistance = energydram.TermResistance(rz_dev=34, rz_mc=34, rtt_nom=30,
+                                           rtt_wr=120, rtt_mc=75, rs=15)
+
+    def setUp(self):
+        # IDD3N and IDD2N overlap, so some samples are invalid.
+        self.idds_specs = dict(self.idds._asdict(),
+                               idd2n=energydram.Normal(42, 3),
+                               idd3n=energydram.Normal(45, 3),
+                               idd4r=energydram.Uniform(160, 180))
+        self.res_specs = dict(self.resistance._asdict(),
+                              rtt_nom=energydram.LogNormal(30, 0.1))
+        self.counters = energydram.CompiledEnergy.stack_counters(
+            cycles_bankpre_ckehi=1000, cycles_bankact_ckehi=3000,
+            num_act=20, num_rd=100, num_wr=50, num_ref=1)
+
+    def _build(self, idds):
+        return energydram.EnergyDDR(self.tck, self.timing, 1.5, idds[0], 8)
+
+    def test_sample_idds(self):
+        ''' Sample valid IDDs. '''
+        mc = energydram.MonteCarlo(seed=0, batch=100)
+        table = mc.sample_idds(self.idds_specs, 1000)
+        self.assertEqual(table.shape, (1000,))
+        self.assertTrue(table.valid().all())
+        self.assertGreater(mc.rejected, 0)
+        self.assertTrue(((table.idd4r >= 160) & (table.idd4r < 180)).all())
+        self.assertTrue((table.idd0 == 95).all())
+
+    def test_sample_missing(self):
+        ''' Missing distribution. '''
+        specs = dict(self.idds_specs)
+        del specs['idd5']
+        with self.assertRaisesRegexp(ValueError, 'IDDsTable: .*idd5.*'):
+            energydram.MonteCarlo(seed=0).sample_idds(specs, 10)
+
+    def test_sample_all_invalid(self):
+        ''' All samples invalid. '''
+        specs = dict(self.idds_specs, idd3n=0.)
+        with self.assertRaisesRegexp(ValueError, 'MonteCarlo: .*invalid.*'):
+            energydram.MonteCarlo(seed=0).sample_idds(specs, 10)
+
+    def test_energy(self):
+        ''' Energy distribution matches the per-sample models. '''
+        mc = energydram.MonteCarlo(seed=0, batch=300)
+        stats = mc.energy(self._build, [self.idds_specs], self.counters, 1000)
+        self.assertEqual(stats.count, 1000)
+
+        table = energydram.MonteCarlo(seed=0, batch=300).sample_idds(
+            self.idds_specs, 1000)
+        energy = self._build([table]).compile().energy(self.counters)
+        nominal = self._build([self.idds]).compile().energy(self.counters)
+        np.testing.assert_allclose(stats.mean, energy.mean())
+        np.testing.assert_allclose(stats.std, energy.std(ddof=1))
+        self.assertLess(stats.percentile(50), nominal)
+
+    def test_energy_reproducible(self):
+        ''' Same seed gives same results. '''
+        results = [energydram.MonteCarlo(seed=3, batch=64).energy(
+            self._build, [self.idds_specs], self.counters, 500)
+                   for _ in range(2)]
+        self.assertEqual(results[0].mean, results[1].mean)
+        self.assertEqual(results[0].percentile(90),
+                         results[1].percentile(90))
+
+    def test_energy_counters_summed(self):
+        ''' Leading counter dimensions are summed. '''
+        counters = np.stack([self.counters] * 3)
+        stats1 = energydram.MonteCarlo(seed=0).energy(
+            self._build, [self.idds_specs], self.counters, 200)
+        stats3 = energydram.MonteCarlo(seed=0).energy(
+            self._build, [self.idds_specs], counters, 200)
+        np.testing.assert_allclose(stats3.mean, 3 * stats1.mean)
+
+    def test_termination(self):
+        ''' Termination power distributions. '''
+        mc = energydram.MonteCarlo(seed=0, batch=128)
+        rd_stats, wr_stats = mc.termination(1.5, 2, self.res_specs, 500,
+                                            width=8)
+        self.assertEqual(rd_stats.count, 500)
+        self.assertEqual(wr_stats.count, 500)
+        term = energydram.Termination(1.5, 2, self.resistance, width=8)
+        self.assertAlmostEqual(rd_stats.percentile(50),
+                               term.read_power_total(),
+                               delta=0.1 * term.read_power_total())
+        self.assertGreater(rd_stats.max, rd_stats.min)
+
+    def test_array_params(self):
+        ''' Array vdd, level, or tck are rejected. '''
+        mc = energydram.MonteCarlo(seed=0)
+        with self.assertRaisesRegexp(ValueError, 'MonteCarlo: .*vdd.*'):
+            mc.termination(np.array([1.2, 1.35]), 2, self.res_specs, 100,
+                           width=8)
+        with self.assertRaisesRegexp(ValueError, 'MonteCarlo: .*level.*'):
+            mc.termination(1.5, 2, self.res_specs, 100,
+                           level=['high', 'mid'])
+        with self.assertRaisesRegexp(ValueError, 'MonteCarlo: .*tck.*'):
+            mc.energy(lambda idds: energydram.EnergyDDR(
+                np.array([[1.25], [1.5]]), self.timing, 1.5, idds[0], 8),
+                      [self.idds_specs], self.counters, 100)
+
+    def test_invalid_batch(self):
+        ''' Invalid batch size. '''
+        with self.assertRaisesRegexp(ValueError, 'MonteCarlo: .*batch.*'):
+            energydram.MonteCarlo(batch=0)
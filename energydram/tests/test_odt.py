@@ -0,0 +1,113 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+import unittest
+
+import numpy as np
+
+import energydram
+from energydram.termination import _network_swing
+
+
+class TestODT(unittest.TestCase):
+    '''
+    ODT optimizer unit tests.
+
+    Based on DDR4 RTT values, compared with brute-force search.
+    '''
+
+    vdd = 1.2
+    cands = dict(rz_dev=[34, 48], rz_mc=[34, 40, 48],
+                 rtt_nom=[34, 40, 48, 60, 80, 120, 240],
+                 rtt_wr=[80, 120, 240], rtt_mc=[40, 60, 120], rs=[10, 15])
+
+    def _brute_force(self, rankcnt, rd_ratio):
+        batch = energydram.Termination.sweep(self.vdd, rankcnt, level='high',
+                                             **self.cands)
+        power = rd_ratio * batch.read_power_total() \
+                + (1 - rd_ratio) * batch.write_power_total()
+        rd_swing, wr_swing = _network_swing(self.vdd, rankcnt,
+                                            batch.resistance, 'structured')
+        rd_swing = np.broadcast_to(rd_swing, batch.shape)
+        wr_swing = np.broadcast_to(wr_swing, batch.shape)
+        return power, rd_swing, wr_swing
+
+    def _grid_idx(self, resistance):
+        return tuple(self.cands[key].index(getattr(resistance, key))
+                     for key in energydram.TermResistance._fields)
+
+    def test_optimize(self):
+        ''' Minimum power. '''
+        for rankcnt in [1, 2, 4]:
+            for rd_ratio in [0., 0.3, 1.]:
+                power, _, _ = self._brute_force(rankcnt, rd_ratio)
+                cfg = energydram.optimize_odt(self.vdd, rankcnt, level='high',
+                                              rd_ratio=rd_ratio, **self.cands)
+                self.assertAlmostEqual(cfg.power, power.min(), places=12)
+                self.assertAlmostEqual(power[self._grid_idx(cfg.resistance)],
+                                       cfg.power, places=12)
+
+    def test_optimize_min_swing(self):
+        ''' Minimum power with swing constraint. '''
+        rankcnt = 2
+        power, rd_swing, wr_swing = self._brute_force(rankcnt, 0.6)
+        min_swing = np.median(np.minimum(rd_swing, wr_swing))
+        feasible = (rd_swing >= min_swing) & (wr_swing >= min_swing)
+        cfg = energydram.optimize_odt(self.vdd, rankcnt, level='high',
+                                      rd_ratio=0.6, min_swing=min_swing,
+                                      **self.cands)
+        self.assertAlmostEqual(cfg.power, power[feasible].min(), places=12)
+        idx = self._grid_idx(cfg.resistance)
+        self.assertTrue(feasible[idx])
+        self.assertAlmostEqual(cfg.rd_swing, rd_swing[idx], places=12)
+        self.assertAlmostEqual(cfg.wr_swing, wr_swing[idx], places=12)
+
+    def test_optimize_infeasible(self):
+        ''' No configuration meets swing constraint. '''
+        self.assertIsNone(energydram.optimize_odt(self.vdd, 2, min_swing=2.,
+                                                  **self.cands))
+
+    def test_pareto(self):
+        ''' Pareto-optimal power vs. swing. '''
+        rankcnt = 3
+        power, rd_swing, wr_swing = self._brute_force(rankcnt, 0.5)
+        swing = np.minimum(rd_swing, wr_swing).ravel()
+        power = power.ravel()
+
+        configs = energydram.pareto_odt(self.vdd, rankcnt, level='high',
+                                        **self.cands)
+        self.assertGreater(len(configs), 1)
+        for cfg in configs:
+            # Not dominated by any configuration.
+            cfg_swing = min(cfg.rd_swing, cfg.wr_swing)
+            self.assertFalse(np.any(
+                ((power < cfg.power - 1e-15) & (swing >= cfg_swing))
+                | ((power <= cfg.power) & (swing > cfg_swing + 1e-15))))
+        # Covers the brute-force front.
+        for idx in range(len(power)):
+            dominated = any(cfg.power <= power[idx] + 1e-15
+                            and min(cfg.rd_swing, cfg.wr_swing)
+                            >= swing[idx] - 1e-15 for cfg in configs)
+            self.assertTrue(dominated)
+        powers = [cfg.power for cfg in configs]
+        self.assertEqual(powers, sorted(powers))
+
+    def test_invalid_rd_ratio(self):
+        ''' Invalid read ratio. '''
+        with self.assertRaisesRegexp(ValueError, 'optimize_odt: .*rd_ratio.*'):
+            energydram.optimize_odt(self.vdd, 2, rd_ratio=1.5, **self.cands)
+        with self.assertRaisesRegexp(ValueError, 'pareto_odt: .*rd_ratio.*'):
+            energydram.pareto_odt(self.vdd, 2, rd_ratio=-1, **self.cands)
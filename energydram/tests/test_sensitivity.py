@@ -0,0 +1,173 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+import unittest
+
+import numpy as np
+
+import energydram
+
+
+class TestEnergySensitivity(unittest.TestCase):
+    '''
+    EnergySensitivity class unit tests.
+
+    Based on DDR4 with VPP domain, compared to finite differences. The energy
+    is linear in each parameter, so a unit step is exact.
+    '''
+
+    tck = 1000./1200
+    timing = energydram.Timing(RRD=5, RAS=39, RP=17, RFC=420, REFI=9360)
+    idds = energydram.IDDs(idd0=58, idd2p=25, idd2n=34, idd3p=30,
+                           idd3n=44, idd4r=140, idd4w=130, idd5=250)
+    ipps = energydram.IDDs(idd0=4, idd2p=3, idd2n=3, idd3p=3,
+                           idd3n=3, idd4r=3, idd4w=3, idd5=20)
+    step = 1.
+
+    def setUp(self):
+        self.counters = energydram.CompiledEnergy.stack_counters(
+            cycles_bankpre_ckelo=[100, 200], cycles_bankpre_ckehi=1000,
+            cycles_bankact_ckelo=50, cycles_bankact_ckehi=3000,
+            num_act=[20, 40], num_rd=100, num_wr=50, num_ref=2)
+        self.grads = energydram.EnergySensitivity(self._model()) \
+                .gradients(self.counters)
+
+    def _model(self, tck=None, timing=None, idds=None, ipps=None, chipcnt=8):
+        return energydram.EnergyDDR(
+            self.tck if tck is None else tck,
+            self.timing if timing is None else timing, 1.2,
+            self.idds if idds is None else idds, chipcnt, ddr=4, vpp=2.5,
+            ipps=self.ipps if ipps is None else ipps)
+
+    def _diff(self, model):
+        return (model.compile().energy(self.counters)
+                - self._model().compile().energy(self.counters)) / self.step
+
+    def test_shape(self):
+        ''' Gradient shapes. '''
+        self.assertEqual(list(self.grads),
+                         ['idds', 'vdd', 'tck', 'chipcnt', 'timing'])
+        self.assertEqual(self.grads['idds'].shape, (2, 8, 2))
+        self.assertEqual(self.grads['vdd'].shape, (2, 2))
+        self.assertEqual(self.grads['tck'].shape, (2,))
+        self.assertEqual(self.grads['chipcnt'].shape, (2,))
+        self.assertEqual(self.grads['timing'].shape, (5, 2))
+
+    def test_idds(self):
+        ''' Derivatives to IDD values. '''
+        for idx, name in enumerate(energydram.IDDs._fields):
+            idds = self.idds._replace(**{name: getattr(self.idds, name)
+                                         + self.step})
+            np.testing.assert_allclose(self.grads['idds'][0, idx],
+                                       self._diff(self._model(idds=idds)),
+                                       rtol=1e-6, atol=1e-6, err_msg=name)
+            ipps = self.ipps._replace(**{name: getattr(self.ipps, name)
+                                         + self.step})
+            np.testing.assert_allclose(self.grads['idds'][1, idx],
+                                       self._diff(self._model(ipps=ipps)),
+                                       rtol=1e-6, atol=1e-6, err_msg=name)
+
+    def test_vdd(self):
+        ''' Derivatives to vdd. '''
+        vdoms = self._model().vdoms
+        energy = sum(vdom.vdd * grad
+                     for vdom, grad in zip(vdoms, self.grads['vdd']))
+        np.testing.assert_allclose(
+            energy, self._model().compile().energy(self.counters))
+
+    def test_tck_chipcnt(self):
+        ''' Derivatives to tck and chipcnt. '''
+        np.testing.assert_allclose(
+            self.grads['tck'],
+            self._diff(self._model(tck=self.tck + self.step)), rtol=1e-6)
+        energy = self._model().compile().energy(self.counters)
+        np.testing.assert_allclose(self.grads['chipcnt'] * 8, energy)
+
+    def test_timing(self):
+        ''' Derivatives to timing values. '''
+        for idx, name in enumerate(energydram.Timing._fields):
+            timing = self.timing._replace(**{name: getattr(self.timing, name)
+                                             + self.step})
+            np.testing.assert_allclose(self.grads['timing'][idx],
+                                       self._diff(self._model(timing=timing)),
+                                       rtol=1e-6, atol=1e-6, err_msg=name)
+        self.assertTrue(np.all(self.grads['timing'][
+            energydram.Timing._fields.index('REFI')] == 0))
+
+    def test_array_tck(self):
+        ''' Arrays of tck and timing. '''
+        tcks = np.array([self.tck, 1.])
+        timing = energydram.Timing(*[np.array([val, val])
+                                     for val in self.timing])
+        grads = energydram.EnergySensitivity(
+            self._model(tck=tcks, timing=timing)).gradients(self.counters)
+        self.assertEqual(grads['idds'].shape, (2, 2, 8, 2))
+        np.testing.assert_allclose(grads['idds'][0], self.grads['idds'])
+        np.testing.assert_allclose(grads['tck'][1], self.grads['tck'])
+
+    def test_lpddr(self):
+        ''' LPDDR with three voltage domains. '''
+        model = energydram.EnergyLPDDR(
+            self.tck, self.timing, 1.8, self.ipps, 1.2, self.idds,
+            1.2, self.ipps, 8, ddr=3)
+        sens = energydram.EnergySensitivity(model)
+        self.assertEqual(sens.d_idds.shape, (3, 8, 8))
+        np.testing.assert_allclose(
+            sens.gradients(self.counters)['chipcnt'] * 8,
+            model.compile().energy(self.counters))
+
+    def test_invalid_counters(self):
+        ''' Invalid counter shape. '''
+        with self.assertRaisesRegexp(ValueError, 'EnergySensitivity: .*'):
+            energydram.EnergySensitivity(self._model()).gradients([1, 2])
+
+
+class TestTerminationGradients(unittest.TestCase):
+    ''' termination_gradients unit tests. '''
+
+    resistance = energydram.TermResistance(rz_dev=34, rz_mc=34, rtt_nom=60,
+                                           rtt_wr=120, rtt_mc=60, rs=10)
+    step = 1e-6
+
+    def _check(self, make):
+        term = make(self.resistance)
+        rd_grad, wr_grad = energydram.termination_gradients(term)
+        self.assertEqual(rd_grad.shape,
+                         term.rd_power.shape[:-1] + (6, term.rankcnt + 1))
+        for idx, name in enumerate(energydram.TermResistance._fields):
+            res = self.resistance._replace(
+                **{name: getattr(self.resistance, name) + self.step})
+            diff = make(res)
+            np.testing.assert_allclose(
+                rd_grad[..., idx, :],
+                (diff.rd_power - term.rd_power) / self.step,
+                rtol=1e-4, atol=1e-9, err_msg=name)
+            np.testing.assert_allclose(
+                wr_grad[..., idx, :],
+                (diff.wr_power - term.wr_power) / self.step,
+                rtol=1e-4, atol=1e-9, err_msg=name)
+
+    def test_termination(self):
+        ''' Termination. '''
+        for level in ['high', 'mid', 'low']:
+            self._check(lambda res, level=level: energydram.Termination(
+                1.2, 2, res, width=8, level=level))
+
+    def test_termination_batch(self):
+        ''' TerminationBatch with array vdd and levels. '''
+        self._check(lambda res: energydram.TerminationBatch(
+            np.array([[1.2], [1.5]]), 4, res, width=8,
+            level=['high', 'mid']))
@@ -0,0 +1,113 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+import unittest
+
+import numpy as np
+
+import energydram
+
+
+class TestPowerSeries(unittest.TestCase):
+    '''
+    Power time series unit tests.
+
+    Based on DDR4 with VPP domain.
+    '''
+
+    tck = 1000./1200
+    timing = energydram.Timing(RRD=5, RAS=39, RP=17, RFC=420, REFI=9360)
+    idds = energydram.IDDs(idd0=58, idd2p=25, idd2n=34, idd3p=30,
+                           idd3n=44, idd4r=140, idd4w=130, idd5=250)
+    ipps = energydram.IDDs(idd0=4, idd2p=3, idd2n=3, idd3p=3,
+                           idd3n=3, idd4r=3, idd4w=3, idd5=20)
+
+    def setUp(self):
+        self.eddr4 = energydram.EnergyDDR(self.tck, self.timing, 1.2,
+                                          self.idds, 8, ddr=4,
+                                          vpp=2.5, ipps=self.ipps)
+        rng = np.random.RandomState(0)
+        self.counters = {name: rng.randint(0, 1000, size=10)
+                         for name in energydram.COUNTERS}
+
+    def test_epochs(self):
+        ''' Per-epoch power. '''
+        series = energydram.power_series(self.eddr4, self.counters)
+        self.assertEqual(series.background.shape, (10, 2))
+        self.assertEqual(series.refresh.shape, (10, 2))
+        cnts = {name: val[3] for name, val in self.counters.items()}
+        cycles = sum(cnts[name] for name in energydram.COUNTERS[:4])
+        self.assertEqual(series.cycles[3], cycles)
+        self.assertAlmostEqual(
+            series.activate[3, 1],
+            self.eddr4.vpp_domain.activate_energy(self.timing, cnts['num_act'])
+            / (cycles * self.tck))
+        total = sum(comp.sum(axis=-1) for comp in series[:4]) \
+                * series.cycles * self.tck
+        energy = self.eddr4.compile().energy(np.stack(
+            [self.counters[name] for name in energydram.COUNTERS], axis=-1))
+        np.testing.assert_allclose(total, energy)
+
+    def test_window(self):
+        ''' Aggregate epochs into windows. '''
+        series = energydram.power_series(self.eddr4, self.counters, window=4)
+        self.assertEqual(series.readwrite.shape, (3, 2))
+        self.assertEqual(series.cycles[2],
+                         sum(self.counters[name][8:].sum()
+                             for name in energydram.COUNTERS[:4]))
+        self.assertEqual(
+            energydram.power_series(self.eddr4, self.counters,
+                                    max_points=4).background.shape,
+            (4, 2))
+
+    def test_invalid(self):
+        ''' Invalid counters. '''
+        with self.assertRaisesRegexp(ValueError, 'power_series: .*num_pre.*'):
+            energydram.power_series(self.eddr4, {'num_pre': [1]})
+        with self.assertRaisesRegexp(ValueError, 'power_series: .*window.*'):
+            energydram.power_series(self.eddr4, self.counters, window=0)
+
+    def test_trace(self):
+        ''' Power from trace. '''
+        rng = np.random.RandomState(1)
+        cycles = np.cumsum(rng.randint(0, 30, size=2000))
+        commands = rng.randint(0, len(energydram.COMMANDS), size=2000)
+        banks = rng.randint(0, 16, size=2000)
+        window = 1000
+        counters = energydram.window_counters(cycles, commands, banks, window,
+                                              start=0)
+        nwin = -(-cycles[-1] // window)
+        for name in energydram.COUNTERS:
+            self.assertEqual(counters[name].shape, (nwin,))
+        # Same as counting each window.
+        for idx in [0, 5, nwin - 1]:
+            lo, hi = idx * window, min((idx + 1) * window, cycles[-1])
+            sel = (cycles >= lo) & (cycles < hi) if idx < nwin - 1 \
+                    else (cycles >= lo)
+            _, state = energydram.count_commands(cycles[cycles < lo],
+                                                 commands[cycles < lo],
+                                                 banks[cycles < lo],
+                                                 start=0, end=lo)
+            counts, _ = energydram.count_commands(
+                cycles[sel], commands[sel], banks[sel], start=lo, end=hi,
+                open_banks=state[1], cke_low=state[2])
+            for name in energydram.COUNTERS:
+                self.assertEqual(counters[name][idx], counts[name], name)
+
+        series = energydram.trace_power_series(self.eddr4, cycles, commands,
+                                               banks, window, start=0)
+        np.testing.assert_array_equal(series.cycles[:-1], window)
+        self.assertEqual(series.background.shape, (nwin, 2))
@@ -0,0 +1,100 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+import unittest
+
+import numpy as np
+
+import energydram
+
+
+class TestShard(unittest.TestCase):
+    ''' Parallel trace-shard evaluation unit tests. '''
+
+    tck = 1000./1200
+    timing = energydram.Timing(RRD=5, RAS=39, RP=17, RFC=420, REFI=9360)
+    idds = energydram.IDDs(idd0=58, idd2p=25, idd2n=34, idd3p=30,
+                           idd3n=44, idd4r=140, idd4w=130, idd5=250)
+
+    def setUp(self):
+        rng = np.random.RandomState(2)
+        self.cycles = np.cumsum(rng.randint(0, 30, size=5000)) + 100
+        self.commands = rng.randint(0, len(energydram.COMMANDS), size=5000)
+        self.banks = rng.randint(0, 8, size=5000)
+
+    def test_identical(self):
+        ''' Same as single-process counting. '''
+        kwargs = dict(start=50, end=self.cycles[-1] + 70,
+                      open_banks={3}, cke_low=True)
+        counts, state = energydram.count_commands(
+            self.cycles, self.commands, self.banks, **kwargs)
+        for shards, processes in [(1, 1), (7, 1), (4, 2), (5000, 1)]:
+            result = energydram.parallel_count(
+                self.cycles, self.commands, self.banks, shards=shards,
+                processes=processes, **kwargs)
+            self.assertEqual(result.counters(), counts)
+            self.assertEqual(result.final_state, (frozenset(state[1]),
+                                                  state[2]))
+            self.assertEqual((result.start, result.end),
+                             (kwargs['start'], kwargs['end']))
+
+        model = energydram.EnergyDDR(self.tck, self.timing, 1.5, self.idds, 8)
+        counter = energydram.TraceCounter(start=kwargs['start'])
+        counter.open_banks, counter.cke_low = {3}, True
+        counter.update_arrays(self.cycles, self.commands, self.banks)
+        counter.finish(kwargs['end'])
+        self.assertEqual(energydram.parallel_energy(
+            model, self.cycles, self.commands, self.banks, shards=3,
+            processes=2, **kwargs), counter.energy(model))
+
+    def test_merge(self):
+        ''' Merge shards. '''
+        cnts = [energydram.parallel_count(self.cycles[sl], self.commands[sl],
+                                          self.banks[sl], processes=1)
+                for sl in [slice(0, 1000), slice(1000, 3000)]]
+        with self.assertRaisesRegexp(ValueError, 'ShardCounters: .*state.*'):
+            _ = cnts[0] + cnts[1]
+        counts, state = energydram.count_commands(
+            self.cycles[:1000], self.commands[:1000], self.banks[:1000])
+        cnts[1] = energydram.parallel_count(
+            self.cycles[1000:3000], self.commands[1000:3000],
+            self.banks[1000:3000], open_banks=state[1], cke_low=state[2],
+            processes=1)
+        total = cnts[0] + cnts[1]
+        counts, _ = energydram.count_commands(
+            self.cycles[:3000], self.commands[:3000], self.banks[:3000])
+        self.assertEqual(total.counters(), counts)
+        with self.assertRaisesRegexp(ValueError, 'ShardCounters: .*order.*'):
+            _ = cnts[1] + cnts[0]
+
+    def test_merge_empty(self):
+        ''' Merge an empty shard. '''
+        cnt = energydram.parallel_count(self.cycles, self.commands,
+                                        self.banks, processes=1)
+        empty = energydram.parallel_count([], [], [])
+        self.assertIsNone(empty.start)
+        self.assertEqual((empty + cnt).counters(), cnt.counters())
+        self.assertEqual((cnt + empty).counters(), cnt.counters())
+        self.assertEqual(((cnt + empty) + empty).end, cnt.end)
+
+    def test_invalid(self):
+        ''' Invalid arguments. '''
+        with self.assertRaisesRegexp(ValueError, 'parallel_count: .*'):
+            energydram.parallel_count(self.cycles, self.commands, self.banks,
+                                      processes=0)
+        result = energydram.parallel_count([], [], [])
+        self.assertEqual(result.counters(),
+                         dict.fromkeys(energydram.COUNTERS, 0))
@@ -0,0 +1,77 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+import pickle
+import unittest
+
+import numpy as np
+
+import energydram
+
+
+def _probe(params, shared):
+    ''' Sweep function to check the shared array is not a copy. '''
+    counters = shared['counters']
+    return counters[params['idx']].sum(), not counters.flags.owndata
+
+
+class TestSharedArray(unittest.TestCase):
+    ''' SharedArray class unit tests. '''
+
+    timing = energydram.Timing(RRD=5, RAS=39, RP=17, RFC=420, REFI=9360)
+    idds = energydram.IDDs(idd0=58, idd2p=25, idd2n=34, idd3p=30,
+                           idd3n=44, idd4r=140, idd4w=130, idd5=250)
+
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.counters = rng.randint(0, 1000,
+                                    size=(20, len(energydram.COUNTERS)))
+
+    def test_pickle(self):
+        ''' Pickle as handle. '''
+        with energydram.SharedArray(self.counters) as shared:
+            np.testing.assert_array_equal(shared.array, self.counters)
+            data = pickle.dumps(shared)
+            self.assertLess(len(data), 1000)
+            attached = pickle.loads(data)
+            np.testing.assert_array_equal(attached.array, self.counters)
+            # Same buffer.
+            shared.array[0, 0] = -1
+            self.assertEqual(attached.array[0, 0], -1)
+            attached.close()
+
+    def test_sweep(self):
+        ''' Sweep with shared counters. '''
+        with energydram.SharedArray(self.counters) as shared:
+            sweep = energydram.Sweep(
+                [('tck', [1., 1.25]), ('chipcnt', [4, 8, 16])],
+                energydram.evaluate_ddr,
+                fixed={'timing': self.timing, 'vdd': 1.5, 'idds': self.idds},
+                shared={'counters': shared})
+            result = sweep.run(processes=2, chunksize=2)
+            expected = energydram.EnergyDDR(1.25, self.timing, 1.5, self.idds,
+                                            8).compile() \
+                    .energy(self.counters).sum()
+            self.assertAlmostEqual(result['energy'][1, 1], expected)
+
+            sweep = energydram.Sweep(
+                [('idx', range(20))], _probe,
+                fields=[('sum', int), ('view', bool)],
+                shared={'counters': shared})
+            result = sweep.run(processes=2, chunksize=5)
+            np.testing.assert_array_equal(result['sum'],
+                                          self.counters.sum(axis=1))
+            self.assertTrue(result['view'].all())
@@ -0,0 +1,198 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+import energydram
+from energydram import sweep as sweep_mod
+
+
+def _count(params, _):
+    if params['x'] == 2:
+        raise ValueError('invalid x')
+    return params['x'] * 10
+
+
+def _buggy(params, _):
+    return params['x'] + None
+
+
+def _slow(params, _):
+    time.sleep(0.05)
+    return params['x']
+
+
+class TestSweep(unittest.TestCase):
+    ''' Sweep class unit tests. '''
+
+    timing = energydram.Timing(RRD=5, RAS=39, RP=17, RFC=420, REFI=9360)
+    idds = energydram.IDDs(idd0=58, idd2p=25, idd2n=34, idd3p=30,
+                           idd3n=44, idd4r=140, idd4w=130, idd5=250)
+    ipps = energydram.IDDs(idd0=4, idd2p=3, idd2n=3, idd3p=3,
+                           idd3n=3, idd4r=3, idd4w=3, idd5=20)
+
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.counters = rng.randint(0, 1000,
+                                    size=(50, len(energydram.COUNTERS)))
+        self.sweep = energydram.Sweep(
+            [('tck', [1000./800, 1000./1066, 1000./1200]),
+             ('chipcnt', [4, 8, 16]),
+             (('ddr', 'vdd', 'vpp', 'ipps'),
+              [(3, 1.5, None, None), (4, 1.2, 2.5, self.ipps),
+               (4, 1.5, 2.5, self.ipps)])],
+            energydram.evaluate_ddr,
+            fixed={'timing': self.timing, 'idds': self.idds},
+            shared={'counters': self.counters})
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def _reference(self, params):
+        return energydram.EnergyDDR(**params).compile() \
+                .energy(self.counters).sum()
+
+    def test_point(self):
+        ''' Lazy points. '''
+        self.assertEqual(self.sweep.shape, (3, 3, 3))
+        self.assertEqual(len(self.sweep), 27)
+        params = self.sweep.point(3 * 3 * 2 + 3 * 1 + 1)
+        self.assertEqual(params['tck'], 1000./1200)
+        self.assertEqual(params['chipcnt'], 8)
+        self.assertEqual(params['ddr'], 4)
+        self.assertEqual(params['vpp'], 2.5)
+        self.assertEqual(params['timing'], self.timing)
+        with self.assertRaises(IndexError):
+            self.sweep.point(27)
+
+    def test_run(self):
+        ''' Run sweep. '''
+        calls = []
+        result = self.sweep.run(processes=1, chunksize=4,
+                                progress=lambda *args: calls.append(args))
+        self.assertEqual(result.shape, (3, 3, 3))
+        self.assertEqual(calls[0], (0, 27))
+        self.assertEqual(calls[-1], (27, 27))
+        self.assertEqual(len(calls), 1 + 7)
+        # Invalid DDR4 vdd.
+        self.assertFalse(result['valid'][:, :, 2].any())
+        self.assertTrue(np.isnan(result['energy'][:, :, 2]).all())
+        self.assertTrue(result['valid'][:, :, :2].all())
+        self.assertAlmostEqual(result['energy'][1, 2, 1],
+                               self._reference(self.sweep.point(16)))
+
+        parallel = self.sweep.run(processes=2, chunksize=5)
+        np.testing.assert_array_equal(parallel['valid'], result['valid'])
+        np.testing.assert_array_equal(parallel['energy'], result['energy'])
+
+    def test_checkpoint(self):
+        ''' Resume from checkpoint. '''
+        path = os.path.join(self.dir, 'sweep.npz')
+        expected = self.sweep.run(processes=1)
+
+        def _interrupt(done, _):
+            if done >= 8:
+                raise KeyboardInterrupt
+        with self.assertRaises(KeyboardInterrupt):
+            self.sweep.run(processes=1, chunksize=4, progress=_interrupt,
+                           checkpoint=path, checkpoint_interval=1)
+        calls = []
+        result = self.sweep.run(processes=1, chunksize=4,
+                                progress=lambda *args: calls.append(args),
+                                checkpoint=path)
+        self.assertEqual(calls[0], (8, 27))
+        np.testing.assert_array_equal(result['energy'], expected['energy'])
+
+        sweep = energydram.Sweep([('tck', [1., 2.])], energydram.evaluate_ddr)
+        with self.assertRaisesRegexp(ValueError, 'Sweep: .*checkpoint.*'):
+            sweep.run(processes=1, checkpoint=path)
+
+    def test_replace(self):
+        ''' Checkpoint replaces an existing file, also without os.replace. '''
+        # pylint: disable=protected-access
+        path = os.path.join(self.dir, 'sweep.npz')
+        for content in ['old', 'new']:
+            with open(path + '.tmp', 'w') as fh:
+                fh.write(content)
+            sweep_mod._replace(path + '.tmp', path)
+            with open(path) as fh:
+                self.assertEqual(fh.read(), content)
+        replace = getattr(os, 'replace', None)
+        if replace is not None:
+            del os.replace
+        try:
+            with open(path + '.tmp', 'w') as fh:
+                fh.write('py2')
+            sweep_mod._replace(path + '.tmp', path)
+        finally:
+            if replace is not None:
+                os.replace = replace
+        with open(path) as fh:
+            self.assertEqual(fh.read(), 'py2')
+        self.assertFalse(os.path.exists(path + '.tmp'))
+
+    def test_termination(self):
+        ''' Sweep termination. '''
+        resistance = energydram.TermResistance(
+            rz_dev=34, rz_mc=34, rtt_nom=60, rtt_wr=120, rtt_mc=60, rs=10)
+        sweep = energydram.Sweep(
+            [('rankcnt', [1, 2, 4]), ('level', ['high', 'mid'])],
+            energydram.evaluate_termination,
+            fields=[('rd_power', float), ('wr_power', float)],
+            fixed={'vdd': 1.2, 'resistance': resistance, 'width': 8})
+        result = sweep.run(processes=1)
+        term = energydram.Termination(1.2, 4, resistance, width=8,
+                                      level='mid')
+        self.assertAlmostEqual(result['rd_power'][2, 1],
+                               term.read_power_total())
+        self.assertAlmostEqual(result['wr_power'][2, 1],
+                               term.write_power_total())
+
+    def test_invalid_int_field(self):
+        ''' Invalid points with integer fields. '''
+        sweep = energydram.Sweep([('x', [1, 2, 3])], _count,
+                                 fields=[('count', int)])
+        result = sweep.run(processes=1)
+        self.assertListEqual(result['valid'].tolist(), [True, False, True])
+        self.assertListEqual(result['count'].tolist(), [10, 0, 30])
+
+    def test_invalid_types(self):
+        ''' Only the given exception types mark points invalid. '''
+        sweep = energydram.Sweep([('x', [1, 2])], _buggy)
+        with self.assertRaises(TypeError):
+            sweep.run(processes=1)
+        sweep = energydram.Sweep([('x', [1, 2])], _buggy,
+                                 invalid=(ValueError, TypeError))
+        self.assertFalse(sweep.run(processes=1)['valid'].any())
+
+    def test_interrupt(self):
+        ''' Errors do not wait for the queued chunks. '''
+        sweep = energydram.Sweep([('x', list(range(400)))], _slow)
+
+        def _interrupt(done, _):
+            if done > 0:
+                raise KeyboardInterrupt
+        start = time.time()
+        with self.assertRaises(KeyboardInterrupt):
+            sweep.run(processes=2, chunksize=1, progress=_interrupt)
+        self.assertLess(time.time() - start, 5)
@@ -0,0 +1,64 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+from collections import namedtuple
+import unittest
+
+import numpy as np
+
+from energydram.table import ValueTable
+
+_PairBase = namedtuple('_PairBase', ['large', 'small'])
+
+
+class _PairTable(ValueTable, _PairBase):
+    ''' Table of pairs, with large >= small >= 0. '''
+
+    __slots__ = ()
+
+    _RULES = [('large < small', 'large', 'small'), ('small < 0', 'small', 0)]
+
+
+class _NoRulesTable(ValueTable, _PairBase):
+    ''' Table without rules. '''
+
+    __slots__ = ()
+
+
+class TestValueTable(unittest.TestCase):
+    ''' ValueTable class unit tests. '''
+
+    def test_rules(self):
+        ''' Rules with fields and constants. '''
+        table = _PairTable(validate=False, large=[2, 1, 3, np.nan],
+                           small=[1, 2, -1, 0])
+        failures = table.violations()
+        self.assertListEqual(list(failures),
+                             ['large not finite', 'large < small',
+                              'small < 0'])
+        np.testing.assert_array_equal(failures['large < small'], [1])
+        np.testing.assert_array_equal(failures['small < 0'], [2])
+        np.testing.assert_array_equal(table.valid(),
+                                      [True, False, False, False])
+        with self.assertRaisesRegexp(ValueError,
+                                     r'_PairTable: large not finite at rows '
+                                     r'\[3\]; large < small at rows \[1\]'):
+            table.check()
+
+    def test_no_rules(self):
+        ''' Rules are required. '''
+        with self.assertRaisesRegexp(TypeError, '_NoRulesTable: .*rules.*'):
+            _NoRulesTable(large=1, small=0)
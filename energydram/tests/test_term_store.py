@@ -0,0 +1,134 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+import contextlib
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+import energydram
+from energydram import term_store, termination
+
+
+@contextlib.contextmanager
+def _patch(obj, name, value):
+    ''' Temporarily replace the attribute `name` of `obj` with `value`. '''
+    orig = getattr(obj, name)
+    setattr(obj, name, value)
+    try:
+        yield value
+    finally:
+        setattr(obj, name, orig)
+
+
+class TestTerminationStore(unittest.TestCase):
+    ''' TerminationStore class unit tests. '''
+
+    resistance = energydram.TermResistance(rz_dev=34, rz_mc=34, rtt_nom=40,
+                                           rtt_wr=30, rtt_mc=60, rs=15)
+
+    def setUp(self):
+        self.directory = os.path.join(tempfile.mkdtemp(), 'store')
+
+    def tearDown(self):
+        shutil.rmtree(os.path.dirname(self.directory))
+
+    def _assert_same(self, term, ref):
+        np.testing.assert_array_equal(term.rd_power, ref.rd_power)
+        np.testing.assert_array_equal(term.wr_power, ref.wr_power)
+        self.assertEqual(term.rankcnt, ref.rankcnt)
+        self.assertEqual(term.rdpincnt, ref.rdpincnt)
+        self.assertEqual(term.read_power_other_ranks(),
+                         ref.read_power_other_ranks())
+
+    def test_warm(self):
+        ''' Warm store skips solves. '''
+        ref = energydram.Termination(1.5, 2, self.resistance, width=8)
+        with energydram.TerminationStore(self.directory) as store:
+            self._assert_same(store.termination(1.5, 2, self.resistance,
+                                                width=8), ref)
+            self.assertEqual((store.hits, store.misses), (0, 1))
+
+        with energydram.TerminationStore(self.directory) as store:
+            calls = []
+
+            def _solve(*args, **kwargs):
+                calls.append(args)
+                return orig_solve(*args, **kwargs)
+            orig_solve = termination._network_power
+            with _patch(termination, '_network_power', _solve):
+                term = store.termination(1.5, 2, self.resistance, width=8)
+                self.assertFalse(calls)
+            self._assert_same(term, ref)
+            self.assertEqual((store.hits, store.misses), (1, 0))
+
+            store.termination(1.5, 2, self.resistance, width=16)
+            store.termination(1.5, 2, self.resistance, width=8, level='high')
+            self.assertEqual(store.misses, 2)
+            self.assertEqual(len(store), 3)
+
+            # Stored in double precision regardless of dtype.
+            term = store.termination(1.5, 2, self.resistance, width=8,
+                                     dtype=np.float32)
+            self.assertEqual(term.rd_power.dtype, np.float32)
+            self.assertEqual(store.hits, 2)
+
+    def test_key(self):
+        ''' Stable keys. '''
+        key = energydram.TerminationStore.key(1.5, 2, self.resistance)
+        self.assertEqual(key, energydram.TerminationStore.key(
+            np.float64(1.5), 2, tuple(self.resistance), level='mid'))
+        self.assertNotEqual(key, energydram.TerminationStore.key(
+            1.5, 2, self.resistance, with_dbi=True))
+
+    def test_stale(self):
+        ''' Stale entries are re-solved. '''
+        with energydram.TerminationStore(self.directory) as store:
+            store.termination(1.5, 2, self.resistance)
+            with _patch(term_store, 'MODEL_VERSION', -1):
+                store.termination(1.5, 2, self.resistance)
+                self.assertEqual(store.misses, 2)
+                store.termination(1.5, 2, self.resistance)
+                self.assertEqual(store.hits, 1)
+                store.termination(1.5, 3, self.resistance)
+            self.assertEqual(len(store), 2)
+            store.purge_stale()
+            self.assertEqual(len(store), 0)
+
+    def test_invalid(self):
+        ''' Invalid inputs are not stored. '''
+        with energydram.TerminationStore(self.directory) as store:
+            with self.assertRaisesRegexp(ValueError, 'Termination: .*level.*'):
+                store.termination(1.5, 2, self.resistance, level='inv')
+            self.assertEqual(len(store), 0)
+
+    def test_concurrent_create(self):
+        ''' Directory created by another process meanwhile. '''
+        orig_makedirs = os.makedirs
+
+        def _makedirs(path):
+            orig_makedirs(path)
+            raise OSError('exists')
+        with _patch(os, 'makedirs', _makedirs):
+            with energydram.TerminationStore(self.directory) as store:
+                self.assertEqual(len(store), 0)
+        path = os.path.join(os.path.dirname(self.directory), 'file')
+        open(path, 'w').close()
+        with self.assertRaises(OSError):
+            energydram.TerminationStore(path)
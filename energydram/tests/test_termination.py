@@ -16,6 +16,8 @@ program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
 
 import unittest
 
+import numpy as np
+
 import energydram
 
 
@@ -110,6 +112,56 @@ class TestTermResistance(unittest.TestCase):
                                       rtt_wr=120, rtt_mc=75, rs=-10)
 
 
+class TestTermResistanceTable(unittest.TestCase):
+    ''' TermResistanceTable class unit tests. '''
+
+    def test_validate(self):
+        ''' Validate all rows at once. '''
+        kwargs = dict(rz_dev=34, rz_mc=[34, 0, 40, 48], rtt_nom=30,
+                      rtt_wr=[[120], [0]], rtt_mc=75, rs=15)
+        with self.assertRaisesRegexp(
+                ValueError, r'TermResistanceTable: .*rz_mc < 1e-4 at rows '
+                r'\[1, 5\].*rtt_wr < 1e-4 at rows \[4, 5, 6, 7\]'):
+            energydram.TermResistanceTable(**kwargs)
+        table = energydram.TermResistanceTable(validate=False, **kwargs)
+        self.assertEqual(table.shape, (2, 4))
+        # Not expanded.
+        self.assertEqual(table.rz_mc.shape, (4,))
+        np.testing.assert_array_equal(table.valid(),
+                                      [[True, False, True, True],
+                                       [False, False, False, False]])
+        self.assertEqual(table.row((0, 2)).rz_mc, 40)
+        self.assertEqual(table.select(table.valid()).shape, (3,))
+
+    def test_not_finite(self):
+        ''' Reject non-finite values. '''
+        table = energydram.TermResistanceTable(
+            validate=False, rz_dev=34, rz_mc=34, rtt_nom=[30, np.nan, 60],
+            rtt_wr=[120, 120, np.inf], rtt_mc=75, rs=15)
+        self.assertListEqual(list(table.violations()),
+                             ['rtt_nom not finite', 'rtt_wr not finite'])
+        np.testing.assert_array_equal(table.valid(), [True, False, False])
+        with self.assertRaisesRegexp(ValueError,
+                                     'TerminationBatch: .*rtt_nom not finite'):
+            energydram.TerminationBatch(1.5, 2, table)
+
+    def test_batch(self):
+        ''' Use table in batch. '''
+        table = energydram.TermResistanceTable(
+            rz_dev=34, rz_mc=34, rtt_nom=[30, 40, 60], rtt_wr=120, rtt_mc=75,
+            rs=15)
+        batch = energydram.TerminationBatch(1.5, 2, table, width=8)
+        self.assertEqual(batch.shape, (3,))
+        term = energydram.Termination(1.5, 2, table.row(1), width=8)
+        self.assertAlmostEqual(batch.read_power_total()[1],
+                               term.read_power_total())
+        with self.assertRaisesRegexp(ValueError,
+                                     'TerminationBatch: .*rtt_nom.*'):
+            energydram.TerminationBatch(
+                1.5, 2, energydram.TermResistanceTable(
+                    validate=False, **dict(table._asdict(), rtt_nom=[0, 1])))
+
+
 class TestTermination(unittest.TestCase):
     '''
     Termination class unit tests.
@@ -350,3 +402,137 @@ class TestTerminationLPDDR4(unittest.TestCase):
         self.assertGreater(self.term.read_power_total(), 0)
         self.assertGreater(self.term.write_power_total(), 0)
 
+
+
+class TestTerminationSolver(unittest.TestCase):
+    ''' Termination class unit tests for the nodal equation solvers. '''
+
+    vdd = 1.2
+    resistance = energydram.TermResistance(rz_dev=34, rz_mc=40, rtt_nom=60,
+                                           rtt_wr=120, rtt_mc=48, rs=15)
+
+    def test_structured_vs_dense(self):
+        ''' Structured solver matches dense solver. '''
+        for rankcnt in [1, 2, 3, 8]:
+            for level in ['high', 'low', 'mid']:
+                term = energydram.Termination(self.vdd, rankcnt,
+                                              self.resistance, width=8,
+                                              level=level)
+                term_dense = energydram.Termination(self.vdd, rankcnt,
+                                                    self.resistance, width=8,
+                                                    level=level,
+                                                    solver='dense')
+                np.testing.assert_allclose(term.rd_power, term_dense.rd_power,
+                                           rtol=1e-12)
+                np.testing.assert_allclose(term.wr_power, term_dense.wr_power,
+                                           rtol=1e-12)
+
+    def test_many_ranks(self):
+        ''' Solve with many ranks. '''
+        term = energydram.Termination(self.vdd, 1000, self.resistance)
+        self.assertEqual(term.rd_power.shape, (1001,))
+        self.assertAlmostEqual(term.read_power_devices(),
+                               term.read_power_target_rank()
+                               + term.read_power_other_ranks())
+
+    def test_invalid_solver(self):
+        ''' Initialize with invalid solver. '''
+        with self.assertRaisesRegexp(ValueError, 'Termination: .*solver.*'):
+            energydram.Termination(self.vdd, 2, self.resistance,
+                                   solver='inv')
+
+    def test_dtype(self):
+        ''' Store power in float32. '''
+        term = energydram.Termination(self.vdd, 4, self.resistance, width=8)
+        term32 = energydram.Termination(self.vdd, 4, self.resistance,
+                                        width=8, dtype=np.float32)
+        self.assertEqual(term32.rd_power.dtype, np.float32)
+        self.assertEqual(term32.wr_power.nbytes, term.wr_power.nbytes // 2)
+        np.testing.assert_allclose(term32.rd_power, term.rd_power, rtol=1e-6)
+        self.assertAlmostEqual(term32.write_power_total(),
+                               term.write_power_total(), places=6)
+
+    def test_slots(self):
+        ''' No per-instance dict. '''
+        term = energydram.Termination(self.vdd, 2, self.resistance)
+        self.assertFalse(hasattr(term, '__dict__'))
+        with self.assertRaises(AttributeError):
+            term.rd_pwr = None
+        batch = energydram.TerminationBatch(self.vdd, 2, self.resistance)
+        self.assertFalse(hasattr(batch, '__dict__'))
+
+
+class TestTerminationBatch(unittest.TestCase):
+    ''' TerminationBatch class unit tests. '''
+
+    vdd = 1.5
+    rankcnt = 3
+    resistances = dict(rz_dev=[34, 40, 48], rz_mc=[34, 40], rtt_nom=[40, 60],
+                       rtt_wr=[60, 120], rtt_mc=60, rs=[10, 15])
+
+    def _check_scalar(self, batch, idx, resistance, vdd, level, **kwargs):
+        term = energydram.Termination(vdd, self.rankcnt, resistance,
+                                      level=level, **kwargs)
+        for name in ['read_power_total', 'write_power_total',
+                     'read_power_memctlr', 'write_power_memctlr',
+                     'read_power_devices', 'write_power_devices',
+                     'read_power_target_rank', 'write_power_target_rank',
+                     'read_power_other_ranks', 'write_power_other_ranks']:
+            self.assertAlmostEqual(getattr(batch, name)()[idx],
+                                   getattr(term, name)(), places=12, msg=name)
+
+    def test_sweep(self):
+        ''' Sweep resistance grids. '''
+        batch = energydram.Termination.sweep(self.vdd, self.rankcnt,
+                                             width=8, level='high',
+                                             **self.resistances)
+        self.assertEqual(batch.shape, (3, 2, 2, 2, 1, 2))
+        self.assertEqual(batch.rd_power.shape, (3, 2, 2, 2, 1, 2, 4))
+        for idx in [(0, 0, 0, 0, 0, 0), (2, 1, 0, 1, 0, 1),
+                    (1, 0, 1, 1, 0, 0)]:
+            resistance = energydram.TermResistance(
+                **{key: np.atleast_1d(self.resistances[key])[i]
+                   for key, i in zip(energydram.TermResistance._fields, idx)})
+            self._check_scalar(batch, idx, resistance, self.vdd, 'high',
+                               width=8)
+
+    def test_vdd_level(self):
+        ''' Batch of vdd and level values. '''
+        resistance = energydram.TermResistance(rz_dev=34, rz_mc=40,
+                                               rtt_nom=60, rtt_wr=120,
+                                               rtt_mc=48, rs=15)
+        vdd = np.array([[1.2], [1.5]])
+        level = ['high', 'low', 'mid']
+        for solver in ['structured', 'dense']:
+            batch = energydram.TerminationBatch(vdd, self.rankcnt, resistance,
+                                                level=level, solver=solver)
+            self.assertEqual(batch.shape, (2, 3))
+            for i in range(2):
+                for j in range(3):
+                    self._check_scalar(batch, (i, j), resistance,
+                                       vdd[i, 0], level[j])
+
+    def test_single_rank(self):
+        ''' Single rank has no other ranks power. '''
+        batch = energydram.Termination.sweep(1.2, 1, **self.resistances)
+        np.testing.assert_array_equal(batch.read_power_other_ranks(), 0)
+        np.testing.assert_array_equal(batch.write_power_other_ranks(), 0)
+
+    def test_invalid_resistance(self):
+        ''' Initialize with invalid resistance. '''
+        with self.assertRaisesRegexp(TypeError,
+                                     'TerminationBatch: .*resistance.*'):
+            energydram.TerminationBatch(self.vdd, self.rankcnt, None)
+        resistances = dict(self.resistances, rtt_nom=[40, 0])
+        with self.assertRaisesRegexp(ValueError,
+                                     'TerminationBatch: .*rtt_nom.*'):
+            energydram.Termination.sweep(self.vdd, self.rankcnt,
+                                         **resistances)
+
+    def test_invalid_level(self):
+        ''' Initialize with invalid level. '''
+        with self.assertRaisesRegexp(ValueError,
+                                     'TerminationBatch: .*level.*'):
+            energydram.Termination.sweep(self.vdd, self.rankcnt,
+                                         level=['mid', 'inv'],
+                                         **self.resistances)
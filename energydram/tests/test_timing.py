@@ -0,0 +1,70 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+import unittest
+
+import numpy as np
+
+import energydram
+
+
+class TestTimingNS(unittest.TestCase):
+    '''
+    Timing conversion from ns unit tests.
+
+    Based on DDR4-2400R.
+    '''
+
+    timing_ns = energydram.TimingNS(RAS=32, RP=13.32, RFC=350, REFI=7800,
+                                    RRD=5.3)
+
+    def test_convert(self):
+        ''' Convert with JEDEC rounding. '''
+        timing = energydram.timing_from_ns(self.timing_ns, 0.833)
+        self.assertIsInstance(timing, energydram.Timing)
+        # 15.99 cycles within the guard band.
+        self.assertEqual(timing.RP, 16)
+        self.assertEqual(timing.RAS, 39)
+        self.assertEqual(timing.RFC, 421)
+        self.assertEqual(timing.RRD, 7)
+        # Rounded down.
+        self.assertEqual(timing.REFI, 9363)
+
+    def test_cache(self):
+        ''' Cache converted timing. '''
+        info = energydram.timing_cache_info()
+        timing = energydram.timing_from_ns(self.timing_ns, 0.625)
+        self.assertIs(energydram.timing_from_ns(self.timing_ns, 0.625),
+                      timing)
+        self.assertEqual(energydram.timing_cache_info().hits, info.hits + 1)
+
+    def test_array(self):
+        ''' Convert array tck. '''
+        tcks = np.array([0.833, 0.9375, 1.071, 1.25])
+        timing = energydram.timing_from_ns(self.timing_ns, tcks)
+        for idx, tck in enumerate(tcks):
+            scalar = energydram.timing_from_ns(self.timing_ns, float(tck))
+            for val, ref in zip(timing, scalar):
+                self.assertEqual(val[idx], ref)
+
+    def test_invalid(self):
+        ''' Invalid arguments. '''
+        with self.assertRaisesRegexp(TypeError, 'timing_from_ns: .*'):
+            energydram.timing_from_ns(energydram.Timing(*self.timing_ns), 1.)
+        with self.assertRaisesRegexp(ValueError, 'timing_from_ns: .*tck.*'):
+            energydram.timing_from_ns(self.timing_ns, 0.)
+        with self.assertRaisesRegexp(ValueError, 'timing_from_ns: .*tck.*'):
+            energydram.timing_from_ns(self.timing_ns, np.array([1., -1.]))
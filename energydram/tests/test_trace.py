@@ -0,0 +1,180 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+import io
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import energydram
+
+
+TRACE = '''# cycle command bank
+0 ACT 0
+10 RD 0
+14 ACT 1
+20 WR 1
+30 PRE 0
+40 PRE 1
+50 PDE
+90 PDX
+100 REF
+300 ACT 2
+310 PDE
+330 PDX
+340 PRE 2
+'''
+
+
+class TestTrace(unittest.TestCase):
+    ''' Trace ingestion unit tests. '''
+
+    counters = dict(cycles_bankpre_ckelo=40, cycles_bankpre_ckehi=280,
+                    cycles_bankact_ckelo=20, cycles_bankact_ckehi=60,
+                    num_act=3, num_rd=1, num_wr=1, num_ref=1)
+
+    def test_parse(self):
+        ''' Parse trace lines. '''
+        cmds = list(energydram.parse_trace(io.StringIO(TRACE)))
+        self.assertEqual(len(cmds), 13)
+        self.assertEqual(cmds[0], (0, 'ACT', 0))
+        self.assertEqual(cmds[6], (50, 'PDE', -1))
+
+    def test_parse_invalid(self):
+        ''' Parse invalid trace lines. '''
+        with self.assertRaisesRegexp(ValueError, 'parse_trace: .*NOP.*'):
+            list(energydram.parse_trace(['10 NOP']))
+        with self.assertRaisesRegexp(ValueError, 'parse_trace: .*bank.*'):
+            list(energydram.parse_trace(['10 ACT']))
+
+    def test_read_chunks(self):
+        ''' Read trace in chunks. '''
+        chunks = list(energydram.read_trace(io.StringIO(TRACE), chunksize=5))
+        self.assertEqual([len(chunk) for chunk in chunks], [5, 5, 3])
+
+    def test_count(self):
+        ''' Count trace. '''
+        for chunksize in [1, 4, 100]:
+            counter = energydram.count_trace(io.StringIO(TRACE),
+                                             chunksize=chunksize, end=400)
+            self.assertEqual(counter.counters(), self.counters)
+
+    def test_count_file(self):
+        ''' Count trace from file path. '''
+        fd, path = tempfile.mkstemp()
+        try:
+            with os.fdopen(fd, 'w') as fh:
+                fh.write(TRACE)
+            counter = energydram.count_trace(path, start=0, end=400)
+            self.assertEqual(counter.counters(), self.counters)
+        finally:
+            os.remove(path)
+
+    def test_count_out_of_order(self):
+        ''' Count trace out of order. '''
+        with self.assertRaisesRegexp(ValueError, 'TraceCounter: .*order.*'):
+            energydram.TraceCounter().update([(10, 'RD', 0), (5, 'WR', 0)])
+
+    def test_energy(self):
+        ''' Energy of trace. '''
+        idds = energydram.IDDs(idd0=95, idd2p=35, idd2n=42, idd3p=40,
+                               idd3n=45, idd4r=180, idd4w=185, idd5=215)
+        timing = energydram.Timing(RRD=6, RAS=28, RP=10, RFC=128, REFI=6240)
+        eddr3 = energydram.EnergyDDR(1.25, timing, 1.5, idds, 8)
+        counter = energydram.count_trace(io.StringIO(TRACE), end=400)
+        self.assertAlmostEqual(counter.energy(eddr3),
+                               eddr3.compile().energy(
+                                   [self.counters[name] for name
+                                    in energydram.COUNTERS]))
+
+
+class TestCountCommands(unittest.TestCase):
+    ''' Vectorized command counting unit tests. '''
+
+    @staticmethod
+    def _reference(cycles, commands, banks, start, end, open_banks, cke_low):
+        counts = dict.fromkeys(energydram.COUNTERS, 0)
+        open_banks = set(open_banks)
+        prev = start
+        for cycle, cmd, bank in zip(cycles, commands, banks):
+            counts['cycles_bank{}_cke{}'.format(
+                'act' if open_banks else 'pre',
+                'lo' if cke_low else 'hi')] += cycle - prev
+            prev = cycle
+            cmd = energydram.COMMANDS[cmd]
+            if cmd == 'ACT':
+                open_banks.add(bank)
+                counts['num_act'] += 1
+            elif cmd == 'PRE':
+                open_banks.discard(bank)
+            elif cmd in ('RD', 'WR', 'REF'):
+                counts['num_' + cmd.lower()] += 1
+            else:
+                cke_low = cmd == 'PDE'
+        counts['cycles_bank{}_cke{}'.format(
+            'act' if open_banks else 'pre',
+            'lo' if cke_low else 'hi')] += end - prev
+        return counts, (end, open_banks, cke_low)
+
+    def _random_trace(self, seed, cnt):
+        rng = np.random.RandomState(seed)
+        cycles = np.cumsum(rng.randint(0, 20, size=cnt))
+        commands = rng.randint(0, len(energydram.COMMANDS), size=cnt)
+        banks = rng.randint(0, 8, size=cnt)
+        return cycles, commands, banks
+
+    def test_random(self):
+        ''' Compare with a per-command state machine. '''
+        for seed in range(5):
+            cycles, commands, banks = self._random_trace(seed, 500)
+            for open_banks, cke_low in [((), False), ((1, 3), True)]:
+                start = cycles[0] - 5
+                end = cycles[-1] + 7
+                self.assertEqual(
+                    energydram.count_commands(cycles, commands, banks,
+                                              start=start, end=end,
+                                              open_banks=open_banks,
+                                              cke_low=cke_low),
+                    self._reference(cycles, commands, banks, start, end,
+                                    open_banks, cke_low))
+
+    def test_chunks(self):
+        ''' Counting in chunks is the same as at once. '''
+        cycles, commands, banks = self._random_trace(10, 1000)
+        counter = energydram.TraceCounter()
+        for idx in range(0, 1000, 64):
+            counter.update_arrays(cycles[idx:idx + 64],
+                                  commands[idx:idx + 64],
+                                  banks[idx:idx + 64])
+        counts, _ = energydram.count_commands(cycles, commands, banks)
+        self.assertEqual(counter.counters(), counts)
+
+    def test_empty(self):
+        ''' Count no commands. '''
+        counts, state = energydram.count_commands([], [], [], start=10,
+                                                  end=30, open_banks=[2])
+        self.assertEqual(counts['cycles_bankact_ckehi'], 20)
+        self.assertEqual(state, (30, {2}, False))
+
+    def test_invalid(self):
+        ''' Count invalid commands. '''
+        with self.assertRaisesRegexp(ValueError, 'count_commands: .*order.*'):
+            energydram.count_commands([10, 5], [2, 2], [0, 0])
+        with self.assertRaisesRegexp(ValueError,
+                                     'count_commands: .*command.*'):
+            energydram.count_commands([10, 15], [2, 9], [0, 0])
@@ -16,6 +16,8 @@ program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
 
 import unittest
 
+import numpy as np
+
 import energydram
 
 
@@ -83,6 +85,71 @@ class TestIDDs(unittest.TestCase):
                             idd3n=75, idd4r=220, idd4w=240, idd5=70)
 
 
+class TestIDDsTable(unittest.TestCase):
+    ''' IDDsTable class unit tests. '''
+
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.idd3n = rng.uniform(40, 80, size=100)
+        self.idd2n = self.idd3n - rng.uniform(-2, 10, size=100)
+        self.kwargs = dict(idd0=self.idd3n + 40, idd2p=25, idd2n=self.idd2n,
+                           idd3p=30, idd3n=self.idd3n, idd4r=220, idd4w=240,
+                           idd5=255)
+
+    def test_validate(self):
+        ''' Validate all rows at once. '''
+        invalid = np.flatnonzero(self.idd3n < self.idd2n)
+        self.assertTrue(invalid.size)
+        with self.assertRaisesRegexp(ValueError,
+                                     r'IDDsTable: IDD3N < IDD2N at rows \[{},'
+                                     .format(invalid[0])):
+            energydram.IDDsTable(**self.kwargs)
+
+        table = energydram.IDDsTable(validate=False, **self.kwargs)
+        self.assertEqual(table.shape, (100,))
+        failures = table.violations()
+        self.assertEqual(list(failures), ['IDD3N < IDD2N'])
+        np.testing.assert_array_equal(failures['IDD3N < IDD2N'], invalid)
+        np.testing.assert_array_equal(np.flatnonzero(~table.valid()), invalid)
+
+        # Same as validating each row.
+        for idx in range(100):
+            try:
+                table.row(idx)
+            except ValueError:
+                self.assertIn(idx, invalid)
+            else:
+                self.assertNotIn(idx, invalid)
+
+        valid = table.select(table.valid())
+        valid.check()
+        self.assertEqual(valid.shape, (100 - invalid.size,))
+        self.assertEqual(valid.idd5.shape, valid.shape)
+
+    def test_not_finite(self):
+        ''' Reject non-finite values. '''
+        kwargs = dict(self.kwargs, idd3n=np.nan, idd2n=34)
+        table = energydram.IDDsTable(validate=False, **kwargs)
+        self.assertEqual(list(table.violations()), ['IDD3N not finite'])
+        self.assertFalse(table.valid().any())
+        with self.assertRaisesRegexp(ValueError,
+                                     r'IDDsTable: IDD3N not finite at rows'):
+            energydram.IDDsTable(**kwargs)
+
+    def test_energy(self):
+        ''' Energy of a table. '''
+        table = energydram.IDDsTable(validate=False, **self.kwargs)
+        table = table.select(table.valid())
+        timing = energydram.Timing(RRD=6, RAS=35, RP=12, RFC=160, REFI=7800)
+        vdom = energydram.VoltageDomain(1.25, 1.5, table, 8, 4)
+        energy = vdom.activate_energy(timing, np.arange(1, 4)[:, None])
+        self.assertEqual(energy.shape, (3,) + table.shape)
+        self.assertAlmostEqual(
+            energy[2, 5],
+            energydram.VoltageDomain(1.25, 1.5, table.row(5), 8, 4)
+            .activate_energy(timing, 3))
+
+
 class TestVoltageDomain(unittest.TestCase):
     '''
     VoltageDomain class unit tests.
@@ -109,6 +176,14 @@ class TestVoltageDomain(unittest.TestCase):
         self.assertEqual(vdom.chipcnt, self.chipcnt, 'chipcnt')
         self.assertEqual(vdom.burstcycles, 4, 'burstcycles')
 
+    def test_slots(self):
+        ''' No per-instance dict. '''
+        vdom = energydram.VoltageDomain(self.tck, self.vdd, self.idds,
+                                        self.chipcnt, 4)
+        self.assertFalse(hasattr(vdom, '__dict__'))
+        with self.assertRaises(AttributeError):
+            vdom.vpp = 2.5
+
     def test_init_invalid_tck(self):
         ''' Initialize with invalid tck. '''
         with self.assertRaisesRegexp(ValueError, 'VoltageDomain: .*tck.*'):
@@ -190,3 +265,55 @@ class TestVoltageDomain(unittest.TestCase):
         pds_ref = eref / self.timing.REFI / vdom.tck
         self.assertAlmostEqual(pds_ref, 5.5, delta=0.1)
 
+    def test_energy_array(self):
+        ''' Calculate energy with array counters. '''
+        vdom = energydram.VoltageDomain(self.tck, self.vdd, self.idds,
+                                        self.chipcnt, 4)
+
+        cycles = np.array([0, 10, 200, 3000])
+        ebg = vdom.background_energy(cycles, 2 * cycles, 1, cycles[::-1])
+        self.assertEqual(ebg.shape, (4,))
+        for idx in range(4):
+            self.assertAlmostEqual(
+                ebg[idx],
+                vdom.background_energy(cycles[idx], 2 * cycles[idx], 1,
+                                       cycles[::-1][idx]))
+
+        nums = np.arange(6).reshape(2, 3)
+        eact = vdom.activate_energy(self.timing, nums)
+        erw = vdom.readwrite_energy(num_rd=nums, num_wr=nums.T[:, :, None])
+        eref = vdom.refresh_energy(self.timing, nums)
+        self.assertEqual(eact.shape, (2, 3))
+        self.assertEqual(erw.shape, (3, 2, 3))
+        self.assertEqual(eref.shape, (2, 3))
+        self.assertAlmostEqual(eact[1, 2],
+                               vdom.activate_energy(self.timing, 5))
+        self.assertAlmostEqual(erw[2, 1, 0],
+                               vdom.readwrite_energy(num_rd=3, num_wr=5))
+        self.assertAlmostEqual(eref[0, 1],
+                               vdom.refresh_energy(self.timing, 1))
+
+    def test_energy_tck_array(self):
+        ''' Calculate energy with array tck. '''
+        tcks = np.array([1000./800, 1000./667, 1000./533])[:, None]
+        # Timing in cycles, from the same timing in ns.
+        timing = energydram.Timing(
+            *[np.ceil(val * self.tck / tcks)
+              for val in self.timing])
+        vdom = energydram.VoltageDomain(tcks, self.vdd, self.idds,
+                                        self.chipcnt, 4)
+        nums = np.array([1, 10, 100, 1000])
+        eact = vdom.activate_energy(timing, nums)
+        self.assertEqual(eact.shape, (3, 4))
+        vdom1 = energydram.VoltageDomain(tcks[1, 0], self.vdd, self.idds,
+                                         self.chipcnt, 4)
+        timing1 = energydram.Timing(*[val[1, 0] for val in timing])
+        np.testing.assert_allclose(eact[1], vdom1.activate_energy(timing1,
+                                                                  nums))
+        erw = vdom.readwrite_energy(num_rd=nums)
+        np.testing.assert_allclose(erw[2], vdom1.readwrite_energy(num_rd=nums)
+                                   * tcks[2, 0] / tcks[1, 0])
+
+        with self.assertRaisesRegexp(ValueError, 'VoltageDomain: .*tck.*'):
+            energydram.VoltageDomain(np.array([1., -1.]), self.vdd, self.idds,
+                                     self.chipcnt, 4)
@@ -16,6 +16,8 @@ program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
 
 from collections import namedtuple
 
+from .cache import LRUCache
+
 # Alphabetical order.
 _TIMING_PARAM_LIST = [
     'RAS',
@@ -30,3 +32,60 @@ Define timing parameters in unit of cycles.
 '''
 Timing = namedtuple('Timing', _TIMING_PARAM_LIST)
 
+'''
+Define timing parameters in unit of ns, e.g., of a datasheet speed bin.
+'''
+TimingNS = namedtuple('TimingNS', _TIMING_PARAM_LIST)
+
+# Converted timing of scalar tck, by (TimingNS, tck).
+_TIMING_CACHE = LRUCache(maxsize=1024)
+
+
+def _ns_to_cycles(name, t_ps, tck_ps):
+    '''
+    JEDEC rounding of a time to cycles, both in integer ps. Minimum timing is
+    rounded up with a 2.5% guard band; REFI, a maximum, is rounded down.
+    '''
+    if name == 'REFI':
+        return t_ps // tck_ps
+    return (t_ps * 1000 // tck_ps + 974) // 1000
+
+
+def _convert(timing_ns, tck):
+    tck_ps = int(round(tck * 1000))
+    return Timing(*[_ns_to_cycles(name, int(round(val * 1000)), tck_ps)
+                    for name, val in zip(_TIMING_PARAM_LIST, timing_ns)])
+
+
+def timing_from_ns(timing_ns, tck):
+    '''
+    Convert `TimingNS` in ns to `Timing` in cycles of `tck` ns, with the JEDEC
+    rounding rules.
+
+    For scalar `tck`, the converted `Timing` is cached and shared by the calls
+    with the same arguments. `tck` can also be a NumPy array, e.g., over the
+    frequencies, and then each value of the `Timing` is an array of the same
+    shape.
+    '''
+    if not isinstance(timing_ns, TimingNS):
+        raise TypeError('timing_from_ns: given timing_ns has invalid type.')
+    if any(val < 0 for val in timing_ns):
+        raise ValueError('timing_from_ns: given timing_ns is invalid.')
+
+    if hasattr(tck, 'shape'):
+        import numpy as np
+        tck_ps = np.rint(np.asarray(tck, dtype=float) * 1000).astype(np.int64)
+        if tck_ps.size and tck_ps.min() <= 0:
+            raise ValueError('timing_from_ns: given tck is invalid.')
+        return Timing(*[_ns_to_cycles(name, int(round(val * 1000)), tck_ps)
+                        for name, val in zip(_TIMING_PARAM_LIST, timing_ns)])
+
+    if not round(tck * 1000) > 0:
+        raise ValueError('timing_from_ns: given tck is invalid.')
+    return _TIMING_CACHE.get((timing_ns, tck),
+                             lambda: _convert(timing_ns, tck))
+
+
+def timing_cache_info():
+    ''' Get the statistics of the converted timing cache. '''
+    return _TIMING_CACHE.info()
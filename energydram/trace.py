@@ -0,0 +1,348 @@
+""" $lic$
+Copyright (c) 2016-2021, Mingyu Gao
+All rights reserved.
+
+This program is free software: you can redistribute it and/or modify it under
+the terms of the Modified BSD-3 License as published by the Open Source
+Initiative.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY
+WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+PARTICULAR PURPOSE. See the BSD-3 License for more details.
+
+You should have received a copy of the Modified BSD-3 License along with this
+program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
+"""
+
+import numpy as np
+
+from .compiled_energy import COUNTERS
+
+'''
+DRAM commands in a trace.
+
+PDE and PDX are power-down entry and exit, i.e., CKE goes low and high.
+'''
+COMMANDS = ['ACT', 'PRE', 'RD', 'WR', 'REF', 'PDE', 'PDX']
+
+# Command codes, i.e., indices in COMMANDS.
+_CMD_CODES = {cmd: code for code, cmd in enumerate(COMMANDS)}
+_ACT, _PRE, _RD, _WR, _REF, _PDE, _PDX = range(len(COMMANDS))
+
+
+def parse_trace(lines):
+    '''
+    Parse trace lines into (cycle, command, bank) tuples.
+
+    Each line is `<cycle> <command> [<bank>]`, separated by whitespaces. The
+    bank is required for ACT and PRE, and is -1 if absent. Empty lines and
+    lines starting with '#' are skipped.
+    '''
+    for line in lines:
+        fields = line.split()
+        if not fields or fields[0].startswith('#'):
+            continue
+        cmd = fields[1].upper() if len(fields) > 1 else None
+        if cmd not in COMMANDS or len(fields) > 3:
+            raise ValueError('parse_trace: invalid trace line: {}'
+                             .format(line.rstrip()))
+        if len(fields) == 3:
+            bank = int(fields[2])
+        elif cmd in ('ACT', 'PRE'):
+            raise ValueError('parse_trace: missing bank in trace line: {}'
+                             .format(line.rstrip()))
+        else:
+            bank = -1
+        yield int(fields[0]), cmd, bank
+
+
+def read_trace(source, chunksize=65536):
+    '''
+    Read a trace file, given as a path or a file object, and yield chunks of
+    at most `chunksize` parsed commands, see `parse_trace`.
+    '''
+    if not isinstance(chunksize, int) or chunksize <= 0:
+        raise ValueError('read_trace: given chunksize is invalid.')
+    if isinstance(source, str):
+        with open(source, 'r') as fh:
+            for chunk in read_trace(fh, chunksize=chunksize):
+                yield chunk
+        return
+    chunk = []
+    for cmd in parse_trace(source):
+        chunk.append(cmd)
+        if len(chunk) == chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _check_commands(func, cycles, commands, banks, start, end):
+    '''
+    Check and normalize the command arrays, and the start and end cycles,
+    which default to the first and last command cycles.
+    '''
+    cycles = np.asarray(cycles, dtype=np.int64)
+    commands = np.asarray(commands)
+    banks = np.asarray(banks)
+    if commands.dtype.kind not in 'iu':
+        commands = commands.astype(np.int64)
+    if banks.dtype.kind not in 'iu':
+        banks = banks.astype(np.int64)
+    if not cycles.shape == commands.shape == banks.shape or cycles.ndim != 1:
+        raise ValueError('{}: given arrays have invalid shapes.'.format(func))
+    if np.any((commands < 0) | (commands >= len(COMMANDS))):
+        raise ValueError('{}: given commands are invalid.'.format(func))
+    cnt = len(cycles)
+    if start is None:
+        start = cycles[0] if cnt else end
+    if end is None:
+        end = cycles[-1] if cnt else start
+    if start is not None:
+        if cnt and (cycles[0] < start or cycles[-1] > end
+                    or np.any(cycles[1:] < cycles[:-1])):
+            raise ValueError('{}: commands are not in order of cycles.'
+                             .format(func))
+        if start > end:
+            raise ValueError('{}: given end is before start.'.format(func))
+    return cycles, commands, banks, start, end
+
+
+def _track_states(commands, banks, open_banks, cke_low):
+    '''
+    Track the background states, as indices in `COUNTERS`, of the intervals
+    before the first command and after each command.
+
+    The bank and CKE states are derived with sorting and cumulative sums
+    instead of a per-command state machine.
+
+    Return the array of states, and the final set of open banks and whether
+    CKE is low.
+    '''
+    cnt = len(commands)
+    open_banks = set(open_banks)
+
+    # Bank state changes. Sort ACT/PRE by bank, stable in time. The change of
+    # each command is its new state minus the previous state of the bank.
+    bank_idx = np.flatnonzero((commands == _ACT) | (commands == _PRE))
+    bank_ids = banks[bank_idx]
+    if bank_ids.size and bank_ids.min() >= 0:
+        # Small unsigned types use the faster radix sort.
+        bank_ids = bank_ids.astype(np.min_scalar_type(bank_ids.max()))
+    order = np.argsort(bank_ids, kind='stable')
+    bank_idx = bank_idx[order]
+    bank_ids = bank_ids[order]
+    bank_states = (commands[bank_idx] == _ACT).astype(np.int64)
+    first = np.ones(len(bank_ids), dtype=bool)
+    first[1:] = bank_ids[1:] != bank_ids[:-1]
+    prev_states = np.empty_like(bank_states)
+    prev_states[1:] = bank_states[:-1]
+    prev_states[first] = np.isin(bank_ids[first], list(open_banks))
+    deltas = np.zeros(cnt + 1, dtype=np.int64)
+    deltas[0] = len(open_banks)
+    deltas[bank_idx + 1] = bank_states - prev_states
+    any_open = np.cumsum(deltas) > 0
+
+    # CKE state. Forward fill the last PDE/PDX.
+    last_cke = np.where((commands == _PDE) | (commands == _PDX),
+                        np.arange(cnt), -1)
+    last_cke = np.maximum.accumulate(last_cke) if cnt else last_cke
+    cke_lows = np.empty(cnt + 1, dtype=bool)
+    cke_lows[0] = cke_low
+    cke_lows[1:] = np.where(last_cke >= 0,
+                            commands[np.maximum(last_cke, 0)] == _PDE,
+                            cke_low)
+
+    # Order of COUNTERS: bankpre_ckelo, bankpre_ckehi, bankact_ckelo,
+    # bankact_ckehi.
+    states = 2 * any_open.astype(np.int8) + (~cke_lows)
+
+    # Final state.
+    last = np.ones(len(bank_ids), dtype=bool)
+    last[:-1] = bank_ids[1:] != bank_ids[:-1]
+    for bank, state in zip(bank_ids[last].tolist(), bank_states[last]):
+        if state:
+            open_banks.add(bank)
+        else:
+            open_banks.discard(bank)
+    return states, open_banks, bool(cke_lows[-1])
+
+
+def count_commands(cycles, commands, banks, start=None, end=None,
+                   open_banks=(), cke_low=False):
+    '''
+    Reduce arrays of DRAM commands of a rank to the counters of the energy
+    models, see `TraceCounter` for the semantics.
+
+    `cycles` are the command cycles in non-decreasing order, `commands` are the
+    command codes, i.e., indices in `COMMANDS`, and `banks` are the bank IDs.
+    `open_banks` and `cke_low` give the initial state.
+
+    Return the dict of counters, and the final state as a tuple of (cycle, set
+    of open banks, whether CKE is low).
+    '''
+    cycles, commands, banks, start, end = _check_commands(
+        'count_commands', cycles, commands, banks, start, end)
+    if start is None:
+        return dict.fromkeys(COUNTERS, 0), (None, set(open_banks), cke_low)
+
+    states, open_banks, cke_low = _track_states(commands, banks, open_banks,
+                                                cke_low)
+    durations = np.diff(np.concatenate([[start], cycles, [end]]))
+
+    counts = {}
+    for state, name in enumerate(COUNTERS[:4]):
+        counts[name] = int(durations[states == state].sum())
+    cmd_counts = np.bincount(commands, minlength=len(COMMANDS))
+    counts['num_act'] = int(cmd_counts[_ACT])
+    counts['num_rd'] = int(cmd_counts[_RD])
+    counts['num_wr'] = int(cmd_counts[_WR])
+    counts['num_ref'] = int(cmd_counts[_REF])
+
+    return counts, (int(end), open_banks, cke_low)
+
+
+def window_counters(cycles, commands, banks, window, start=None, end=None,
+                    open_banks=(), cke_low=False):
+    '''
+    Reduce arrays of DRAM commands of a rank to the counters of the energy
+    models in each window of `window` cycles from `start`, see
+    `count_commands` for the arguments. The last window may be partial.
+
+    Return the dict of counters, each as an array over the windows.
+    '''
+    if not window > 0:
+        raise ValueError('window_counters: given window is invalid.')
+    cycles, commands, banks, start, end = _check_commands(
+        'window_counters', cycles, commands, banks, start, end)
+    if start is None or start == end:
+        return {name: np.zeros(0, dtype=np.int64) for name in COUNTERS}
+
+    states, _, _ = _track_states(commands, banks, open_banks, cke_low)
+    winidx = np.arange(-(-(end - start) // window) + 1)
+    bounds = np.minimum(start + winidx * window, end)
+
+    # Cumulative cycles of each state at the interval starts, interpolated at
+    # the window bounds.
+    starts = np.concatenate([[start], cycles])
+    durations = np.diff(np.concatenate([starts, [end]]))
+    intervals = np.searchsorted(starts, bounds, side='right') - 1
+    counts = {}
+    for state, name in enumerate(COUNTERS[:4]):
+        in_state = states == state
+        cum = np.concatenate([[0], np.cumsum(durations * in_state)])
+        at_bounds = cum[intervals] \
+                + (bounds - starts[intervals]) * in_state[intervals]
+        counts[name] = np.diff(at_bounds)
+
+    wins = np.minimum((cycles - start) // window, len(bounds) - 2)
+    for name, cmd in [('num_act', _ACT), ('num_rd', _RD), ('num_wr', _WR),
+                      ('num_ref', _REF)]:
+        counts[name] = np.bincount(wins[commands == cmd],
+                                   minlength=len(bounds) - 1)
+    return counts
+
+
+def _counters_energy(model, cnts):
+    '''
+    Total energy of the dict of counters `cnts`, with the model `EnergyDDR` or
+    `EnergyLPDDR`.
+    '''
+    return model.background_energy(
+        cycles_bankpre_ckelo=cnts['cycles_bankpre_ckelo'],
+        cycles_bankpre_ckehi=cnts['cycles_bankpre_ckehi'],
+        cycles_bankact_ckelo=cnts['cycles_bankact_ckelo'],
+        cycles_bankact_ckehi=cnts['cycles_bankact_ckehi']) \
+            + model.activate_energy(num_act=cnts['num_act']) \
+            + model.readwrite_energy(num_rd=cnts['num_rd'],
+                                     num_wr=cnts['num_wr']) \
+            + model.refresh_energy(num_ref=cnts['num_ref'])
+
+
+class TraceCounter(object):
+    '''
+    Reduce a stream of DRAM commands of a rank to the counters of the energy
+    models, see `compiled_energy.COUNTERS`.
+
+    Between two commands, the rank is in one of the background states, by
+    whether any bank is open, and whether CKE is low. Commands are given in
+    order of cycles, and the background starts from the first command, or
+    `start` if given. All banks are initially precharged, and CKE is initially
+    high.
+    '''
+
+    def __init__(self, start=None):
+        self.cycle = start
+        self.open_banks = set()
+        self.cke_low = False
+        self.counts = dict.fromkeys(COUNTERS, 0)
+
+    def update(self, commands):
+        ''' Consume an iterable of (cycle, command, bank) tuples. '''
+        commands = list(commands)
+        try:
+            codes = [_CMD_CODES[cmd] for _, cmd, _ in commands]
+        except KeyError as err:
+            raise ValueError('{}: invalid command {}.'
+                             .format(self.__class__.__name__, err.args[0]))
+        return self.update_arrays([cmd[0] for cmd in commands], codes,
+                                  [cmd[2] for cmd in commands])
+
+    def update_arrays(self, cycles, commands, banks):
+        '''
+        Consume arrays of command cycles, command codes, and bank IDs, see
+        `count_commands`.
+        '''
+        cycles = np.asarray(cycles, dtype=np.int64)
+        if not cycles.size:
+            return self
+        if (self.cycle is not None and cycles[0] < self.cycle) \
+                or np.any(cycles[1:] < cycles[:-1]):
+            raise ValueError('{}: commands are not in order of cycles.'
+                             .format(self.__class__.__name__))
+        counts, state = count_commands(
+            cycles, commands, banks, start=self.cycle,
+            open_banks=self.open_banks, cke_low=self.cke_low)
+        self._merge(counts, state)
+        return self
+
+    def finish(self, end):
+        ''' Account the background until cycle `end`. '''
+        if self.cycle is not None and end < self.cycle:
+            raise ValueError('{}: given end is before the last command.'
+                             .format(self.__class__.__name__))
+        counts, state = count_commands(
+            [], [], [], start=self.cycle if self.cycle is not None else end,
+            end=end, open_banks=self.open_banks, cke_low=self.cke_low)
+        self._merge(counts, state)
+        return self
+
+    def _merge(self, counts, state):
+        for name in COUNTERS:
+            self.counts[name] += counts[name]
+        self.cycle, self.open_banks, self.cke_low = state
+
+    def counters(self):
+        ''' Get the counters as a dict. '''
+        return dict(self.counts)
+
+    def energy(self, model):
+        '''
+        Total energy of the counters, with the model `EnergyDDR` or
+        `EnergyLPDDR`.
+        '''
+        return _counters_energy(model, self.counts)
+
+
+def count_trace(source, chunksize=65536, start=None, end=None):
+    '''
+    Stream a trace file, see `read_trace`, into a `TraceCounter`. If `end` is
+    given, account the background until cycle `end`.
+    '''
+    counter = TraceCounter(start=start)
+    for chunk in read_trace(source, chunksize=chunksize):
+        counter.update(chunk)
+    if end is not None:
+        counter.finish(end)
+    return counter
@@ -16,9 +16,28 @@ program. If not, see <https://opensource.org/licenses/BSD-3-Clause>.
 
 from collections import namedtuple
 
+from .table import ValueTable
+
 _IDDsBase = namedtuple('_IDDsBase', ['idd0', 'idd2n', 'idd2p', 'idd3n',
                                      'idd3p', 'idd4r', 'idd4w', 'idd5'])
 
+# Validation rules of IDD values, as (larger, smaller) pairs of fields.
+_IDDS_RULES = [
+    ('idd2n', 'idd2p'),
+    ('idd3n', 'idd3p'),
+    ('idd3n', 'idd2n'),
+    ('idd3p', 'idd2p'),
+    ('idd0', 'idd3n'),
+    ('idd4r', 'idd3n'),
+    ('idd4w', 'idd3n'),
+    ('idd5', 'idd3n'),
+    ]
+
+
+def _rule_name(rule):
+    return '{} < {}'.format(rule[0].upper(), rule[1].upper())
+
+
 class IDDs(_IDDsBase):
     '''
     Define the set of IDD values.
@@ -32,45 +51,61 @@ class IDDs(_IDDsBase):
 
     def check(self):
         ''' Check validation of IDD values. '''
-        if self.idd2n < self.idd2p:
-            raise ValueError('{}: IDD2N < IDD2P!'
-                             .format(self.__class__.__name__))
-        if self.idd3n < self.idd3p:
-            raise ValueError('{}: IDD3N < IDD3P!'
-                             .format(self.__class__.__name__))
-        if self.idd3n < self.idd2n:
-            raise ValueError('{}: IDD3N < IDD2N!'
-                             .format(self.__class__.__name__))
-        if self.idd3p < self.idd2p:
-            raise ValueError('{}: IDD3P < IDD2P!'
-                             .format(self.__class__.__name__))
-        if self.idd0 < self.idd3n:
-            raise ValueError('{}: IDD0 < IDD3N!'
-                             .format(self.__class__.__name__))
-        if self.idd4r < self.idd3n:
-            raise ValueError('{}: IDD4R < IDD3N!'
-                             .format(self.__class__.__name__))
-        if self.idd4w < self.idd3n:
-            raise ValueError('{}: IDD4W < IDD3N!'
-                             .format(self.__class__.__name__))
-        if self.idd5 < self.idd3n:
-            raise ValueError('{}: IDD5 < IDD3N!'
-                             .format(self.__class__.__name__))
+        for rule in _IDDS_RULES:
+            if getattr(self, rule[0]) < getattr(self, rule[1]):
+                raise ValueError('{}: {}!'.format(self.__class__.__name__,
+                                                  _rule_name(rule)))
+
+
+class IDDsTable(ValueTable, _IDDsBase):
+    '''
+    Define a table of sets of IDD values, with each value as a NumPy array
+    over the rows, see `table.ValueTable`.
+
+    The table can be given to `VoltageDomain` in place of `IDDs`, and the
+    energies are then broadcast over the rows.
+    '''
+
+    __slots__ = ()
+
+    _RULES = [(_rule_name(rule),) + rule for rule in _IDDS_RULES]
+    _row_type = IDDs
+
+    @staticmethod
+    def _label(name):
+        return name.upper()
+
+
+def _any(cond):
+    ''' Whether a scalar or array condition holds for any element. '''
+    return cond.any() if hasattr(cond, 'any') else cond
 
 
 class VoltageDomain(object):
     '''
     Define a voltage domain including VDD and IDD values.
+
+    The counters given to the energy methods can be either scalars or NumPy
+    arrays, e.g., one element per simulation epoch. Arrays are broadcast
+    against each other, and the energies are returned as an array of the
+    broadcast shape.
+
+    `tck` can also be a NumPy array, e.g., one element per frequency, with
+    the `Timing` values in cycles as arrays of the matching shape. It is
+    broadcast against the counters, e.g., `tck` of shape (F, 1) and counters
+    of shape (W,) give energies of shape (F, W).
     '''
 
+    __slots__ = ('tck', 'vdd', 'idds', 'chipcnt', 'burstcycles')
+
     def __init__(self, tck, vdd, idds, chipcnt, burstcycles):
-        if tck < 0:
+        if _any(tck < 0):
             raise ValueError('{}: given tck is invalid.'
                              .format(self.__class__.__name__))
         if vdd < 0:
             raise ValueError('{}: given vdd is invalid.'
                              .format(self.__class__.__name__))
-        if not isinstance(idds, IDDs):
+        if not isinstance(idds, (IDDs, IDDsTable)):
             raise TypeError('{}: given idds has invalid type.'
                             .format(self.__class__.__name__))
         if not isinstance(chipcnt, int):
@@ -120,3 +155,16 @@ class VoltageDomain(object):
         chipicyc = timing.RFC * (self.idds.idd5 - self.idds.idd3n) * num_ref
         return chipicyc * self.vdd * self.tck * self.chipcnt
 
+    def energy_coefficients(self, timing):
+        '''
+        Energy per unit of each counter, in the order of
+        `compiled_energy.COUNTERS`.
+        '''
+        return [self.background_energy(cycles_bankpre_ckelo=1),
+                self.background_energy(cycles_bankpre_ckehi=1),
+                self.background_energy(cycles_bankact_ckelo=1),
+                self.background_energy(cycles_bankact_ckehi=1),
+                self.activate_energy(timing, num_act=1),
+                self.readwrite_energy(num_rd=1, num_wr=0),
+                self.readwrite_energy(num_rd=0, num_wr=1),
+                self.refresh_energy(timing, num_ref=1)]
@@ -47,9 +47,10 @@ setuptools.setup(
     license='BSD 3-clause',
 
     packages=setuptools.find_packages(),
+    package_data={PACKAGE: ['data/*.json']},
 
     install_requires=[
-        'numpy>=1.8',
+        'numpy>=1.15',
         'coverage>=4',
         'pytest>=3',
         'pytest-cov>=2',